@@ -33,6 +33,14 @@ const CONFIG = {
         }
     },
 
+    // Raster products served by eo_processing.tile_server
+    RASTER_TILE_SERVER: 'http://127.0.0.1:8000',
+    RASTER_LAYERS: {
+        mined: { label: 'Mined Mask', opacity: 0.8 },
+        ndvi: { label: 'NDVI', opacity: 0.7 },
+        bsi: { label: 'Bare Soil Index', opacity: 0.7 }
+    },
+
     // Status colors
     COLORS: {
         active: {
@@ -144,6 +144,21 @@ const LayerControl = {
         }
     },
 
+    // Toggle a raster layer from the local XYZ tile server
+    toggleRasterLayer(name, show) {
+        this.removeOverlay(`raster:${name}`);
+        if (!show) return;
+
+        const config = window.APP_CONFIG;
+        const layerConfig = config.RASTER_LAYERS[name] || {};
+        const layer = L.tileLayer(`${config.RASTER_TILE_SERVER}/tiles/${name}/{z}/{x}/{y}.png`, {
+            opacity: layerConfig.opacity ?? config.OPACITY.DEFAULT,
+            maxNativeZoom: config.MAP.MAX_ZOOM,
+            attribution: 'OreNexus EO'
+        });
+        this.addOverlay(`raster:${name}`, layer);
+    },
+
     // Change base layer
     changeBaseLayer(layerType) {
         window.MapManager.changeBaseLayer(layerType);
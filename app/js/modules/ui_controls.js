@@ -199,6 +199,13 @@ const UIControls = {
             });
         }
 
+        // Raster overlay checkboxes (served by the local tile server)
+        document.querySelectorAll('.raster-overlay').forEach(checkbox => {
+            checkbox.addEventListener('change', (e) => {
+                window.LayerControl.toggleRasterLayer(e.target.dataset.layer, e.target.checked);
+            });
+        });
+
         // Opacity slider
         const opacitySlider = document.getElementById('opacitySlider');
         if (opacitySlider) {
@@ -0,0 +1,88 @@
+/* ==========================================
+   FILE: js/utils/terrain_loader.js
+   Loads simplified terrain meshes written by
+   eo_processing.terrain_mesh (header .json + .bin)
+   ========================================== */
+
+const TerrainLoader = {
+    // Fetch a mesh header and its binary buffers as typed arrays
+    async loadMesh(headerUrl) {
+        const header = await (await fetch(headerUrl)).json();
+        const binUrl = new URL(header.binary, new URL(headerUrl, window.location.href));
+        const buffer = await (await fetch(binUrl)).arrayBuffer();
+
+        const view = (name, Type) => {
+            const spec = header.buffers[name];
+            return new Type(buffer, spec.offset, spec.count);
+        };
+
+        return {
+            header,
+            positions: view('positions', Float32Array),  // x, y, z per vertex (local metres)
+            indices: view('indices', Uint32Array),       // 3 per triangle, CCW from above
+            mined: view('mined', Uint8Array)             // 1 per vertex
+        };
+    },
+
+    // Fetch the manifest of a tile set written by eo_processing.terrain_tiles
+    async loadTileManifest(baseUrl) {
+        return (await fetch(`${baseUrl}/tiles.json`)).json();
+    },
+
+    // Decode one heightmap tile into heights (NaN = nodata) and mined flags
+    async loadHeightTile(baseUrl, manifest, z, x, y) {
+        const url = `${baseUrl}/${manifest.tiles}`
+            .replace('{z}', z).replace('{x}', x).replace('{y}', y);
+        const bitmap = await createImageBitmap(await (await fetch(url)).blob());
+        const canvas = new OffscreenCanvas(bitmap.width, bitmap.height);
+        const context = canvas.getContext('2d', { colorSpaceConversion: 'none' });
+        context.drawImage(bitmap, 0, 0);
+        const rgba = context.getImageData(0, 0, bitmap.width, bitmap.height).data;
+
+        const count = bitmap.width * bitmap.height;
+        const heights = new Float32Array(count);
+        const mined = new Uint8Array(count);
+        for (let p = 0; p < count; p++) {
+            const o = 4 * p;
+            heights[p] = rgba[o + 3] > 0
+                ? manifest.height_offset + (rgba[o] * 256 + rgba[o + 1]) * manifest.height_scale
+                : NaN;
+            mined[p] = rgba[o + 2] > 0 ? 1 : 0;
+        }
+        return { width: bitmap.width, height: bitmap.height, heights, mined };
+    },
+
+    // Convert a loaded mesh into a Plotly Mesh3d trace
+    toPlotlyMesh3d(mesh, options = {}) {
+        const count = mesh.header.vertex_count;
+        const x = new Float32Array(count);
+        const y = new Float32Array(count);
+        const z = new Float32Array(count);
+        for (let v = 0; v < count; v++) {
+            x[v] = mesh.positions[3 * v];
+            y[v] = mesh.positions[3 * v + 1];
+            z[v] = mesh.positions[3 * v + 2];
+        }
+
+        const triangles = mesh.header.triangle_count;
+        const i = new Uint32Array(triangles);
+        const j = new Uint32Array(triangles);
+        const k = new Uint32Array(triangles);
+        for (let t = 0; t < triangles; t++) {
+            i[t] = mesh.indices[3 * t];
+            j[t] = mesh.indices[3 * t + 1];
+            k[t] = mesh.indices[3 * t + 2];
+        }
+
+        return Object.assign({
+            type: 'mesh3d',
+            x, y, z, i, j, k,
+            intensity: z,
+            colorscale: 'Earth',
+            flatshading: false
+        }, options);
+    }
+};
+
+// Make TerrainLoader globally available
+window.TerrainLoader = TerrainLoader;
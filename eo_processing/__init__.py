@@ -0,0 +1,47 @@
+"""
+OreNexus EO processing pipeline
+Reusable raster building blocks for the Sentinel-2 / DEM workflows that
+started life in the EDTA notebooks.
+"""
+
+from .band_reader import (
+    L2A_SCALE,
+    BandReader,
+    iter_windows,
+    pad_window,
+    read_band,
+)
+from .indices import (
+    IndexEngine,
+    SpectralIndex,
+    available_indices,
+    calculate_bsi_approx,
+    calculate_ndvi,
+    get_index,
+    normalized_difference,
+    register_index,
+)
+from .morphology import (
+    clean_mask,
+    clean_mask_tiled,
+    compute_change_mask,
+    morphology_halo,
+    remove_small_objects,
+    threshold_change,
+)
+from .labeling import PIT_COLUMNS, analyze_mask, label_pits, pit_statistics
+from .volume import VOLUME_COLUMNS, fit_reference_planes, pit_volumes, simpson_coefficients
+from .lease import LeaseMaskCache, illegal_area_summary, lease_area_breakdown, load_leases
+from .timeseries import RasterCube
+from .tile_cache import IncrementalChangeDetector, TileCache
+from .stretch import BandHistogram, approximate_percentiles, normalize, rgb_composite, stretch_to_uint8
+from .cog import overview_factors, read_overview, select_overview, write_cog, write_mask_cog, write_products
+from .terrain_mesh import TerrainMesh, build_terrain_mesh
+from .terrain_tiles import build_terrain_tiles, decode_tile, encode_tile, tile_bounds, tiles_covering
+from .proximity import DistanceCache, pit_min_distances, pit_proximity, scene_distance_layers, water_mask, water_mask_from_paths
+from .sar import lee_filter, log_ratio, polarization_ratio, read_backscatter, sar_change_mask, to_db, write_sar_products
+from .align import WarpCache, WarpMap, align_array, align_raster
+from .terrain import STABILITY_CLASSES, hillshade, horn_gradient, terrain_derivatives, terrain_from_array, write_terrain_products
+from .profiles import PROFILE_COLUMNS, densify_lines, pit_transects, sample_dem, sample_profiles
+from .catalog import SceneCatalog, parse_scene_name
+from .batch import LEASE_BATCH_COLUMNS, LeaseBatch, lease_zones
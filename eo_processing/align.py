@@ -0,0 +1,336 @@
+"""
+Grid alignment with cached warp maps
+Replaces the notebooks' scipy.ndimage.zoom resampling with georeferenced
+alignment: target pixel centres are projected into the source grid once
+per (source grid, target grid, resampling) and stored as gather indices and
+bilinear weights. Aligning the 2nd..Nth band or date onto the same grid is
+then a pure NumPy gather, done block by block over target rows.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import rasterio
+from pyproj import Transformer
+from rasterio.crs import CRS
+
+from .cog import write_cog
+
+RESAMPLING_METHODS = ('nearest', 'bilinear')
+
+# Target rows per block when building or applying a warp map
+DEFAULT_BLOCK_ROWS = 256
+
+
+def grid_key(transform, crs, shape):
+    """Hashable description of a raster grid"""
+    wkt = CRS.from_user_input(crs).to_wkt() if crs is not None else ''
+    return (tuple(round(v, 12) for v in tuple(transform)[:6]), wkt, tuple(int(s) for s in shape))
+
+
+class WarpMap:
+    """
+    Source-to-target resampling map between two grids
+
+    nearest: one flat source index per target pixel (-1 = outside).
+    bilinear: the flat index of the upper-left neighbour plus the fractional
+    column / row offsets (float32); the other three neighbours are +1, +W
+    and +W+1. A target pixel is valid when its centre falls inside the
+    source raster's footprint.
+
+    Example:
+        warp = WarpMap.build(src.transform, src.crs, src.shape,
+                             dem_transform, dem_crs, dem.shape, 'nearest')
+        mask_on_dem = warp.apply(mask)
+    """
+
+    def __init__(self, src_shape, dst_shape, resampling, index, fx=None, fy=None):
+        self.src_shape = tuple(src_shape)
+        self.dst_shape = tuple(dst_shape)
+        self.resampling = resampling
+        self.index = index
+        self.fx = fx
+        self.fy = fy
+
+    @classmethod
+    def build(cls, src_transform, src_crs, src_shape, dst_transform, dst_crs, dst_shape,
+              resampling='bilinear', block_rows=DEFAULT_BLOCK_ROWS):
+        """
+        Project every target pixel centre into the source grid
+
+        Target rows are processed in blocks of block_rows so the coordinate
+        temporaries stay small for large grids.
+        """
+        if resampling not in RESAMPLING_METHODS:
+            raise ValueError(f"resampling must be one of {RESAMPLING_METHODS}, got {resampling!r}")
+        src_h, src_w = src_shape
+        dst_h, dst_w = dst_shape
+        if resampling == 'bilinear' and (src_h < 2 or src_w < 2):
+            resampling = 'nearest'
+
+        same_crs = (src_crs is None or dst_crs is None
+                    or CRS.from_user_input(src_crs) == CRS.from_user_input(dst_crs))
+        transformer = None if same_crs else Transformer.from_crs(
+            CRS.from_user_input(dst_crs), CRS.from_user_input(src_crs), always_xy=True)
+        inverse = ~src_transform
+
+        index_dtype = np.int32 if src_h * src_w < np.iinfo(np.int32).max else np.int64
+        index = np.empty(dst_shape, dtype=index_dtype)
+        fx = fy = None
+        if resampling == 'bilinear':
+            fx = np.empty(dst_shape, dtype=np.float32)
+            fy = np.empty(dst_shape, dtype=np.float32)
+
+        cols = np.arange(dst_w) + 0.5
+        for row0 in range(0, dst_h, block_rows):
+            rows = np.arange(row0, min(dst_h, row0 + block_rows)) + 0.5
+            cc, rr = np.meshgrid(cols, rows)
+            x = dst_transform.c + dst_transform.a * cc + dst_transform.b * rr
+            y = dst_transform.f + dst_transform.d * cc + dst_transform.e * rr
+            if transformer is not None:
+                x, y = transformer.transform(x, y)
+            # Fractional source pixel coordinates; integers are pixel centres
+            c = inverse.a * x + inverse.b * y + inverse.c - 0.5
+            r = inverse.d * x + inverse.e * y + inverse.f - 0.5
+            valid = ((c >= -0.5) & (c < src_w - 0.5) & (r >= -0.5) & (r < src_h - 0.5)
+                     & np.isfinite(c) & np.isfinite(r))
+
+            block = slice(row0, row0 + len(rows))
+            if resampling == 'nearest':
+                ci = np.clip(np.floor(c + 0.5), 0, src_w - 1).astype(np.int64)
+                ri = np.clip(np.floor(r + 0.5), 0, src_h - 1).astype(np.int64)
+                flat = ri * src_w + ci
+                flat[~valid] = -1
+                index[block] = flat
+            else:
+                c = np.clip(np.nan_to_num(c), 0, src_w - 1)
+                r = np.clip(np.nan_to_num(r), 0, src_h - 1)
+                c0 = np.minimum(np.floor(c), src_w - 2).astype(np.int64)
+                r0 = np.minimum(np.floor(r), src_h - 2).astype(np.int64)
+                flat = r0 * src_w + c0
+                flat[~valid] = -1
+                index[block] = flat
+                fx[block] = c - c0
+                fy[block] = r - r0
+        return cls(src_shape, dst_shape, resampling, index, fx, fy)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.index, self.fx, self.fy) if a is not None)
+
+    def apply(self, source, out=None, fill=np.nan, block_rows=DEFAULT_BLOCK_ROWS):
+        """
+        Resample a source array (or (bands, rows, cols) stack) onto the target grid
+
+        Bilinear weights skip NaN neighbours and renormalise, so nodata does
+        not bleed into valid pixels. Integer sources keep their dtype with
+        nearest resampling; bilinear output is float32.
+
+        Args:
+            source: 2D or 3D array on the source grid
+            out: Optional preallocated output of the target shape
+            fill: Value for target pixels outside the source (and, for
+                  bilinear, pixels whose four neighbours are all NaN)
+            block_rows: Target rows gathered per step
+
+        Returns:
+            Array on the target grid
+        """
+        source = np.asarray(source)
+        if source.ndim == 3:
+            if out is None:
+                out = [None] * source.shape[0]
+            return np.stack([self.apply(band, o, fill, block_rows) for band, o in zip(source, out)])
+        if source.shape != self.src_shape:
+            raise ValueError(f"Source shape {source.shape} does not match the warp map {self.src_shape}")
+
+        if self.resampling == 'nearest' and not np.issubdtype(source.dtype, np.floating) and np.isnan(fill):
+            fill = 0
+        if out is None:
+            dtype = source.dtype if self.resampling == 'nearest' else np.float32
+            out = np.empty(self.dst_shape, dtype=dtype)
+
+        flat = source.ravel()
+        for row0 in range(0, self.dst_shape[0], block_rows):
+            block = (slice(row0, row0 + block_rows), slice(None))
+            out[block[0]] = self._gather(flat, block, fill)
+        return out
+
+    def apply_window(self, source, window, fill=np.nan):
+        """
+        Resample only one window of the target grid
+
+        Args:
+            source: 2D array on the source grid
+            window: rasterio Window on the target grid
+            fill: As for apply
+
+        Returns:
+            Array of the window's shape
+        """
+        source = np.asarray(source)
+        if source.shape != self.src_shape:
+            raise ValueError(f"Source shape {source.shape} does not match the warp map {self.src_shape}")
+        if self.resampling == 'nearest' and not np.issubdtype(source.dtype, np.floating) and np.isnan(fill):
+            fill = 0
+        return self._gather(source.ravel(), window.toslices(), fill)
+
+    def _gather(self, flat, block, fill):
+        """Gather (and for bilinear, weight) the target pixels in block"""
+        index = self.index[block]
+        valid = index >= 0
+        safe = np.where(valid, index, 0)
+        if self.resampling == 'nearest':
+            values = flat[safe]
+            values[~valid] = fill
+            return values
+
+        width = self.src_shape[1]
+        fx, fy = self.fx[block], self.fy[block]
+        total = np.zeros(index.shape, dtype=np.float32)
+        weight = np.zeros(index.shape, dtype=np.float32)
+        for offset, w in ((0, (1 - fx) * (1 - fy)), (1, fx * (1 - fy)),
+                          (width, (1 - fx) * fy), (width + 1, fx * fy)):
+            values = flat[safe + offset].astype(np.float32)
+            ok = ~np.isnan(values)
+            total += np.where(ok, values, 0) * w
+            weight += np.where(ok, w, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = total / weight
+        result[~valid | (weight <= 0)] = fill
+        return result
+
+
+class WarpCache:
+    """
+    Warp maps keyed by (source grid, target grid, resampling)
+
+    Maps live in an in-memory LRU and, when cache_dir is set, as .npz files
+    that later runs load instead of re-projecting coordinates.
+    """
+
+    def __init__(self, cache_dir=None, max_items=8):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(src_grid, dst_grid, resampling):
+        return hashlib.sha1(repr((src_grid, dst_grid, resampling)).encode()).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def get(self, src_transform, src_crs, src_shape, dst_transform, dst_crs, dst_shape,
+            resampling='bilinear'):
+        """Warp map between two grids, built only on a cache miss"""
+        key = self.make_key(grid_key(src_transform, src_crs, src_shape),
+                            grid_key(dst_transform, dst_crs, dst_shape), resampling)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if self.cache_dir and os.path.exists(self._disk_path(key)):
+            with np.load(self._disk_path(key)) as data:
+                warp = WarpMap(tuple(data['src_shape']), tuple(data['dst_shape']),
+                               str(data['resampling']), data['index'],
+                               data['fx'] if 'fx' in data else None,
+                               data['fy'] if 'fy' in data else None)
+            self.hits += 1
+        else:
+            self.misses += 1
+            warp = WarpMap.build(src_transform, src_crs, src_shape,
+                                 dst_transform, dst_crs, dst_shape, resampling)
+            if self.cache_dir:
+                arrays = {'src_shape': np.array(warp.src_shape), 'dst_shape': np.array(warp.dst_shape),
+                          'resampling': np.array(warp.resampling), 'index': warp.index}
+                if warp.fx is not None:
+                    arrays.update(fx=warp.fx, fy=warp.fy)
+                tmp = self._disk_path(key) + '.tmp.npz'
+                np.savez(tmp, **arrays)
+                os.replace(tmp, self._disk_path(key))
+
+        self._memory[key] = warp
+        if len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+        return warp
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Shared cache for callers that do not manage their own
+_default_cache = WarpCache()
+
+
+def align_array(array, src_profile, dst_profile, resampling='bilinear', cache=None, fill=np.nan):
+    """
+    Resample an array from one grid onto another
+
+    Args:
+        array: 2D (or bands-first 3D) array on the source grid
+        src_profile, dst_profile: Mappings with 'transform', 'crs', 'height'
+            and 'width' (rasterio profiles work as-is)
+        resampling: 'nearest' for masks and classes, 'bilinear' for
+            continuous values
+        cache: WarpCache (module-wide cache by default)
+        fill: Value outside the source footprint
+
+    Returns:
+        Array on the target grid
+    """
+    cache = _default_cache if cache is None else cache
+    warp = cache.get(src_profile['transform'], src_profile['crs'],
+                     (src_profile['height'], src_profile['width']),
+                     dst_profile['transform'], dst_profile['crs'],
+                     (dst_profile['height'], dst_profile['width']), resampling)
+    return warp.apply(array, fill=fill)
+
+
+def align_raster(path, dst_profile, band=1, resampling='bilinear', cache=None, fill=np.nan,
+                 scale=None, nodata=None, out_path=None):
+    """
+    Read one band of a GeoTIFF and align it onto dst_profile's grid
+
+    Args:
+        path: Source GeoTIFF
+        dst_profile: Target grid (rasterio profile or equivalent mapping)
+        band: Band index to read
+        resampling, cache, fill: As for align_array
+        scale: Optional divisor (e.g. L2A_SCALE); the band is read as float32
+        nodata: Raw values to treat as NaN (default: the dataset's nodata)
+        out_path: Optional COG path for the aligned band (mode overviews for
+                  nearest resampling, averaged ones for bilinear)
+
+    Returns:
+        Array on the target grid
+    """
+    with rasterio.open(path) as src:
+        data = src.read(band)
+        src_profile = {'transform': src.transform, 'crs': src.crs,
+                       'height': src.height, 'width': src.width}
+        nodata = ([] if src.nodata is None else [src.nodata]) if nodata is None else list(nodata)
+
+    if scale is not None or nodata or resampling == 'bilinear':
+        invalid = np.isin(data, nodata) if nodata else None
+        data = data.astype(np.float32)
+        if scale not in (None, 1):
+            data /= scale
+        if invalid is not None:
+            data[invalid] = np.nan
+    aligned = align_array(data, src_profile, dst_profile, resampling, cache, fill)
+    if out_path is not None:
+        write_cog(out_path, aligned, dst_profile,
+                  kind='categorical' if resampling == 'nearest' else 'continuous',
+                  nodata=np.nan if aligned.dtype.kind == 'f' else None)
+    return aligned
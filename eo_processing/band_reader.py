@@ -0,0 +1,263 @@
+"""
+Windowed band reader for Sentinel-2 and DEM GeoTIFFs
+Streams a set of co-registered bands block by block so that peak memory
+depends on the block size, not on the scene size.
+"""
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+# Sentinel-2 L2A digital numbers are reflectance scaled by 10000
+L2A_SCALE = 10000.0
+
+
+def iter_windows(height, width, block_shape):
+    """
+    Yield a regular grid of windows covering a raster
+
+    Args:
+        height: Raster height in pixels
+        width: Raster width in pixels
+        block_shape: (rows, cols) of each block; edge blocks are clipped
+    """
+    block_rows, block_cols = block_shape
+    for row_off in range(0, height, block_rows):
+        for col_off in range(0, width, block_cols):
+            yield Window(col_off, row_off,
+                         min(block_cols, width - col_off),
+                         min(block_rows, height - row_off))
+
+
+def pad_window(window, halo, height, width):
+    """
+    Grow a window by a halo, clipped to the raster extent
+
+    Args:
+        window: Core window
+        halo: Number of pixels to add on every side
+        height: Raster height in pixels
+        width: Raster width in pixels
+
+    Returns:
+        (padded_window, core_slices) where core_slices index the core
+        window inside an array read with padded_window
+    """
+    row_start = max(0, int(window.row_off) - halo)
+    col_start = max(0, int(window.col_off) - halo)
+    row_stop = min(height, int(window.row_off + window.height) + halo)
+    col_stop = min(width, int(window.col_off + window.width) + halo)
+
+    padded = Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+    top = int(window.row_off) - row_start
+    left = int(window.col_off) - col_start
+    core = (slice(top, top + int(window.height)), slice(left, left + int(window.width)))
+    return padded, core
+
+
+def _aligned_block_shape(internal_shape, block_shape, raster_shape):
+    """Round a requested block shape up to whole internal GeoTIFF blocks"""
+    aligned = []
+    for internal, requested, limit in zip(internal_shape, block_shape, raster_shape):
+        blocks = max(1, -(-requested // internal))
+        aligned.append(min(blocks * internal, limit))
+    return tuple(aligned)
+
+
+class BandReader:
+    """
+    Read several co-registered bands window by window
+
+    Every band must share the same grid (shape, transform and CRS). Reads go
+    straight into reusable float32 buffers, scaling and nodata masking are
+    applied in place per block.
+
+    Example:
+        with BandReader({'B04': b4_path, 'B08': b8_path}, scale=L2A_SCALE) as reader:
+            for window, bands in reader.iter_blocks(block_shape=(512, 512)):
+                ndvi = (bands['B08'] - bands['B04']) / (bands['B08'] + bands['B04'])
+    """
+
+    def __init__(self, paths, scale=None, nodata=None, dtype=np.float32):
+        """
+        Args:
+            paths: Mapping of band name -> GeoTIFF path (a single path is
+                   accepted and exposed under the name 'band')
+            scale: Divisor applied to every value (e.g. L2A_SCALE), or None
+            nodata: Iterable of raw values to turn into NaN. Defaults to the
+                    dataset's declared nodata value, if any
+            dtype: Floating point dtype of the returned arrays
+        """
+        if isinstance(paths, (str, bytes)) or hasattr(paths, '__fspath__'):
+            paths = {'band': paths}
+        if not paths:
+            raise ValueError("BandReader needs at least one band path")
+
+        self.paths = dict(paths)
+        self.dtype = np.dtype(dtype)
+        self.scale = scale
+        self._datasets = {}
+        try:
+            for name, path in self.paths.items():
+                self._datasets[name] = rasterio.open(path)
+        except Exception:
+            self.close()
+            raise
+
+        first = self._datasets[self.band_names[0]]
+        for name, src in self._datasets.items():
+            if (src.shape != first.shape or src.transform != first.transform
+                    or src.crs != first.crs):
+                self.close()
+                raise ValueError(
+                    f"Band '{name}' is not aligned with '{self.band_names[0]}': "
+                    f"{src.shape} {src.transform} vs {first.shape} {first.transform}")
+
+        if nodata is None:
+            nodata = [] if first.nodata is None else [first.nodata]
+        self.nodata = list(nodata)
+
+        self.profile = first.profile.copy()
+        self.transform = first.transform
+        self.crs = first.crs
+        self.height, self.width = first.shape
+        self.internal_block_shape = first.block_shapes[0]
+        self._buffers = {}
+
+    @property
+    def band_names(self):
+        return list(self.paths)
+
+    @property
+    def shape(self):
+        return (self.height, self.width)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for src in self._datasets.values():
+            src.close()
+        self._datasets = {}
+
+    def block_windows(self, block_shape=None):
+        """
+        Yield the windows to iterate over
+
+        Args:
+            block_shape: None to follow the GeoTIFF's internal tiling exactly,
+                         or a (rows, cols) target that is rounded up to whole
+                         internal blocks so reads never split a block
+        """
+        if block_shape is None:
+            src = self._datasets[self.band_names[0]]
+            for _, window in src.block_windows(1):
+                yield window
+            return
+
+        shape = _aligned_block_shape(self.internal_block_shape, block_shape, self.shape)
+        yield from iter_windows(self.height, self.width, shape)
+
+    def _buffer(self, name, rows, cols):
+        """Return a C-contiguous (rows, cols) view into a reusable buffer"""
+        size = rows * cols
+        buf = self._buffers.get(name)
+        if buf is None or buf.size < size:
+            buf = np.empty(size, dtype=self.dtype)
+            self._buffers[name] = buf
+        return buf[:size].reshape(rows, cols)
+
+    def read(self, window=None, bands=None, out=None, boundless=False):
+        """
+        Read one window of each band as scaled floating point arrays
+
+        Args:
+            window: rasterio Window, or None for the full raster
+            bands: Subset of band names to read (default: all)
+            out: Optional mapping of band name -> preallocated array to
+                 fill. Without it, fresh arrays are allocated
+            boundless: Allow windows that extend past the raster edge;
+                       outside pixels are filled with NaN
+
+        Returns:
+            Dict of band name -> 2D array
+        """
+        bands = self.band_names if bands is None else list(bands)
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        rows, cols = int(window.height), int(window.width)
+
+        result = {}
+        for name in bands:
+            src = self._datasets[name]
+            if out is not None and name in out:
+                arr = out[name]
+            else:
+                arr = np.empty((rows, cols), dtype=self.dtype)
+            self._read_into(src, window, arr, boundless)
+            result[name] = arr
+        return result
+
+    def iter_blocks(self, block_shape=None, bands=None):
+        """
+        Stream (window, bands) pairs over the whole raster
+
+        The yielded arrays are views into buffers that are reused for the next
+        block; copy them if they must outlive the iteration step.
+        """
+        bands = self.band_names if bands is None else list(bands)
+        for window in self.block_windows(block_shape):
+            rows, cols = int(window.height), int(window.width)
+            out = {name: self._buffer(name, rows, cols) for name in bands}
+            yield window, self.read(window, bands=bands, out=out)
+
+    def _read_into(self, src, window, arr, boundless):
+        if boundless:
+            arr.fill(np.nan)
+            clipped = window.intersection(Window(0, 0, self.width, self.height))
+            row0 = int(clipped.row_off - window.row_off)
+            col0 = int(clipped.col_off - window.col_off)
+            inner = arr[row0:row0 + int(clipped.height), col0:col0 + int(clipped.width)]
+            staging = np.empty(inner.shape, dtype=self.dtype)
+            src.read(1, window=clipped, out=staging)
+            self._postprocess(staging)
+            inner[...] = staging
+            return
+
+        # GDAL converts straight into the float buffer, no integer temporary
+        src.read(1, window=window, out=arr)
+        self._postprocess(arr)
+
+    def _postprocess(self, arr):
+        if self.nodata:
+            invalid = np.isin(arr, self.nodata)
+        if self.scale not in (None, 1):
+            arr /= self.scale
+        if self.nodata:
+            arr[invalid] = np.nan
+
+
+def read_band(path, window=None, scale=None, nodata=None, dtype=np.float32):
+    """
+    Read a single band (or one window of it) as a scaled float array
+
+    Drop-in replacement for the notebooks' read_band / read_and_scale_band /
+    load_band helpers, without the whole-scene float64 copy.
+
+    Args:
+        path: GeoTIFF path
+        window: Optional rasterio Window
+        scale: Divisor such as L2A_SCALE, or None
+        nodata: Raw values to turn into NaN (default: dataset nodata)
+        dtype: Floating point dtype of the result
+
+    Returns:
+        (array, profile)
+    """
+    with BandReader({'band': path}, scale=scale, nodata=nodata, dtype=dtype) as reader:
+        arr = reader.read(window)['band']
+        profile = reader.profile
+    return arr, profile
@@ -0,0 +1,330 @@
+"""
+Multi-lease batch processing: one scene read serving every lease on it
+Each scene block is read once (with the morphology halo), turned into NDVI
+and a cleaned change mask, and dispatched to the leases whose monitoring
+zone intersects it, found with the zones' STRtree. Per-lease mined area,
+illegal area (mined ground in the zone but outside every lease) and cut
+volume are accumulated block by block, so I/O scales with the number of
+scenes, not leases. Blocks that no lease touches are never read.
+
+Example:
+    leases = load_leases('leases.geojson', id_column='lease_id')
+    batch = LeaseBatch(leases, buffer_m=500, mask_cache=LeaseMaskCache('cache/leases'))
+    scene, report = batch.process_scene(jan10_paths, jan30_paths,
+                                        pre_dem=dem_2022, post_dem=dem_2023)
+    totals = batch.summary()
+"""
+
+import contextlib
+import math
+
+import numpy as np
+import pandas as pd
+import rasterio
+from rasterio.crs import CRS
+from rasterio.warp import transform_bounds
+from rasterio.windows import Window
+from shapely.geometry import box
+
+from .align import WarpCache, grid_key
+from .band_reader import L2A_SCALE, BandReader, pad_window
+from .grid import pixel_area_m2
+from .indices import IndexEngine
+from .lease import LeaseMaskCache
+from .morphology import DEFAULT_STRUCTURE, DEFAULT_TILE_SHAPE, _clean_tile, morphology_halo, threshold_change
+
+LEASE_BATCH_COLUMNS = [
+    'lease_id', 'lease_area_ha', 'mined_area_ha', 'illegal_area_ha',
+    'mined_volume_m3', 'illegal_volume_m3', 'scenes',
+]
+
+CHANGE_BANDS = ('B04', 'B08', 'B11')
+
+# Extra DEM pixels read around each block for the bilinear neighbours
+DEM_PAD = 2
+
+
+def lease_zones(leases, buffer_m):
+    """
+    Monitoring zone of every lease: its polygon grown by buffer_m metres
+
+    Geographic leases are buffered in their local UTM zone.
+    """
+    if not buffer_m:
+        return leases.geometry
+    if leases.crs is not None and leases.crs.is_geographic:
+        utm = leases.estimate_utm_crs()
+        return leases.geometry.to_crs(utm).buffer(buffer_m).to_crs(leases.crs)
+    return leases.geometry.buffer(buffer_m)
+
+
+def _pixel_windows(bounds, transform, height, width):
+    """Pixel windows (row0, row1, col0, col1) covering map bounds, clipped to the grid"""
+    inverse = ~transform
+    xs = np.stack([bounds[:, 0], bounds[:, 2], bounds[:, 0], bounds[:, 2]], axis=1)
+    ys = np.stack([bounds[:, 1], bounds[:, 1], bounds[:, 3], bounds[:, 3]], axis=1)
+    cols = inverse.a * xs + inverse.b * ys + inverse.c
+    rows = inverse.d * xs + inverse.e * ys + inverse.f
+    row0 = np.clip(np.floor(rows.min(axis=1)), 0, height).astype(np.int64)
+    row1 = np.clip(np.ceil(rows.max(axis=1)), 0, height).astype(np.int64)
+    col0 = np.clip(np.floor(cols.min(axis=1)), 0, width).astype(np.int64)
+    col1 = np.clip(np.ceil(cols.max(axis=1)), 0, width).astype(np.int64)
+    return np.stack([row0, row1, col0, col1], axis=1)
+
+
+class _SceneLeases:
+    """Lease and zone masks of every lease, each on its own window of one scene grid"""
+
+    def __init__(self, lease_geoms, zone_geoms, transform, shape, mask_cache):
+        height, width = shape
+        self.windows = _pixel_windows(zone_geoms.bounds.to_numpy(), transform, height, width)
+        self.sindex = zone_geoms.sindex
+        self.lease_geoms = lease_geoms.values
+        self.zone_geoms = zone_geoms.values
+        self.transform = transform
+        self.mask_cache = mask_cache
+        self._masks = {}
+
+    def masks(self, i):
+        """(lease mask, zone mask) on window i, rasterized once per grid"""
+        if i not in self._masks:
+            row0, row1, col0, col1 = self.windows[i]
+            shape = (int(row1 - row0), int(col1 - col0))
+            window_transform = rasterio.windows.transform(
+                Window(int(col0), int(row0), shape[1], shape[0]), self.transform)
+            self._masks[i] = (
+                self.mask_cache.get([self.lease_geoms[i]], window_transform, shape),
+                self.mask_cache.get([self.zone_geoms[i]], window_transform, shape),
+            )
+        return self._masks[i]
+
+    def candidates(self, bounds):
+        """Leases whose zone intersects a block, via the STRtree"""
+        hits = self.sindex.query(box(*bounds), predicate='intersects')
+        row_ok = self.windows[hits, 1] > self.windows[hits, 0]
+        col_ok = self.windows[hits, 3] > self.windows[hits, 2]
+        return np.sort(hits[row_ok & col_ok])
+
+
+class LeaseBatch:
+    """
+    Accumulates per-lease mining statistics over any number of scenes
+
+    Mined area counts change pixels inside the lease polygon; illegal area
+    counts change pixels inside the lease's monitoring zone that fall
+    outside every lease. Volumes integrate (pre_dem - post_dem), clipped at
+    zero, over the same pixels.
+    """
+
+    def __init__(self, leases, buffer_m=500.0, id_column='lease_id', mask_cache=None,
+                 warp_cache=None):
+        """
+        Args:
+            leases: GeoDataFrame of lease polygons (e.g. from load_leases)
+            buffer_m: Width of the monitoring zone around each lease
+            id_column: Lease identifier column (the index when missing)
+            mask_cache: LeaseMaskCache for the per-lease rasterization
+            warp_cache: WarpCache for aligning DEM windows onto scene blocks
+        """
+        self.leases = leases.reset_index(drop=True)
+        self.lease_ids = (self.leases[id_column].to_numpy(dtype=object) if id_column in self.leases
+                          else self.leases.index.astype(str).to_numpy(dtype=object))
+        self.zones = lease_zones(self.leases, buffer_m)
+        self.buffer_m = buffer_m
+        self.mask_cache = mask_cache or LeaseMaskCache()
+        self.warp_cache = warp_cache or WarpCache()
+        self._grids = {}
+
+        n = len(self.leases)
+        self.mined_m2 = np.zeros(n)
+        self.illegal_m2 = np.zeros(n)
+        self.mined_m3 = np.zeros(n)
+        self.illegal_m3 = np.zeros(n)
+        self.scenes = np.zeros(n, dtype=np.int64)
+        self.volume_scenes = 0
+
+        areas = self.leases.geometry
+        if areas.crs is not None and areas.crs.is_geographic:
+            areas = areas.to_crs(self.leases.estimate_utm_crs())
+        self.lease_area_ha = areas.area.to_numpy() / 10000.0
+
+    def _scene_leases(self, crs, transform, shape):
+        # Later dates on the same grid reuse the windows, STRtree and masks
+        key = grid_key(transform, crs, shape)
+        if key not in self._grids:
+            leases, zones = self.leases.geometry, self.zones
+            if crs is not None and leases.crs is not None and CRS.from_user_input(crs) != leases.crs:
+                leases, zones = leases.to_crs(crs), zones.to_crs(crs)
+            self._grids[key] = _SceneLeases(leases, zones, transform, shape, self.mask_cache)
+        return self._grids[key]
+
+    def _dem_block(self, dem, window, profile):
+        """
+        DEM on one scene block: a slice of an array already on the scene
+        grid, or a BandReader window covering the block (plus a DEM_PAD
+        pixel rim for the bilinear neighbours) warped onto it
+        """
+        if isinstance(dem, np.ndarray):
+            return dem[window.toslices()].astype(np.float32, copy=False)
+
+        bounds = rasterio.windows.bounds(window, profile['transform'])
+        if profile['crs'] is not None and dem.crs is not None and CRS.from_user_input(profile['crs']) != dem.crs:
+            bounds = transform_bounds(profile['crs'], dem.crs, *bounds)
+        area = rasterio.windows.from_bounds(*bounds, transform=dem.transform)
+        row0 = max(0, math.floor(area.row_off) - DEM_PAD)
+        col0 = max(0, math.floor(area.col_off) - DEM_PAD)
+        row1 = min(dem.height, math.ceil(area.row_off + area.height) + DEM_PAD)
+        col1 = min(dem.width, math.ceil(area.col_off + area.width) + DEM_PAD)
+        shape = (int(window.height), int(window.width))
+        if row0 >= row1 or col0 >= col1:
+            return np.full(shape, np.nan, dtype=np.float32)
+
+        dem_window = Window(col0, row0, col1 - col0, row1 - row0)
+        warp = self.warp_cache.get(rasterio.windows.transform(dem_window, dem.transform), dem.crs,
+                                   (row1 - row0, col1 - col0),
+                                   rasterio.windows.transform(window, profile['transform']),
+                                   profile['crs'], shape, 'bilinear')
+        return warp.apply(dem.read(dem_window)['dem'])
+
+    def process_scene(self, before_paths, after_paths, pre_dem=None, post_dem=None,
+                      ndvi_thresh=0.2, swir_thresh=0.05, min_area_pixels=100,
+                      structure=DEFAULT_STRUCTURE, connectivity=1,
+                      block_shape=DEFAULT_TILE_SHAPE, scale=L2A_SCALE, dem_nodata=None):
+        """
+        Stream one before/after scene pair and update every lease it covers
+
+        The change mask of each block equals compute_change_mask on the
+        whole scene: blocks are read with the morphology halo and cleaned
+        with the tiled cleaner's exact rim handling.
+
+        Args:
+            before_paths, after_paths: Mappings with 'B04', 'B08' and 'B11'
+            pre_dem, post_dem: Optional DEM paths or arrays on the scene
+                grid for volumes (paths are read and aligned block by block)
+            ndvi_thresh, swir_thresh, min_area_pixels, structure,
+            connectivity: As for compute_change_mask
+            block_shape: Core block size (rounded to the files' tiling)
+            scale: Divisor for the raw digital numbers
+            dem_nodata: DEM nodata values (paths only)
+
+        Returns:
+            (scene table with LEASE_BATCH_COLUMNS for this scene only,
+             report dict of blocks read / skipped and leases touched)
+        """
+        structure = np.asarray(structure, dtype=bool)
+        morph_halo, object_halo = morphology_halo(structure, min_area_pixels)
+        halo = morph_halo + object_halo
+        engine = IndexEngine(['NDVI'])
+
+        n = len(self.leases)
+        mined_m2, illegal_m2 = np.zeros(n), np.zeros(n)
+        mined_m3, illegal_m3 = np.zeros(n), np.zeros(n)
+        touched = np.zeros(n, dtype=bool)
+        report = {'blocks_read': 0, 'blocks_skipped': 0, 'pixels_read': 0}
+
+        bands = list(CHANGE_BANDS)
+        with contextlib.ExitStack() as stack:
+            before = stack.enter_context(BandReader({b: before_paths[b] for b in bands}, scale=scale))
+            after = stack.enter_context(BandReader({b: after_paths[b] for b in bands}, scale=scale))
+            height, width = before.shape
+            transform, crs = before.transform, before.crs
+            profile = {'transform': transform, 'crs': crs, 'height': height, 'width': width}
+            scene = self._scene_leases(crs, transform, before.shape)
+            # DEM paths stay open and are read one block window at a time
+            dems = [dem if dem is None or isinstance(dem, np.ndarray)
+                    else stack.enter_context(BandReader({'dem': dem}, nodata=dem_nodata))
+                    for dem in (pre_dem, post_dem)]
+            with_volume = all(dem is not None for dem in dems)
+
+            for window in before.block_windows(block_shape):
+                row0, col0 = int(window.row_off), int(window.col_off)
+                rows, cols = int(window.height), int(window.width)
+                bounds = rasterio.windows.bounds(window, transform)
+                candidates = scene.candidates(bounds)
+                if not len(candidates):
+                    report['blocks_skipped'] += 1
+                    continue
+
+                padded, core = pad_window(window, halo, height, width)
+                b = before.read(padded)
+                a = after.read(padded)
+                report['blocks_read'] += 1
+                report['pixels_read'] += int(padded.height) * int(padded.width)
+
+                raw = threshold_change(engine.compute(b)['NDVI'], engine.compute(a)['NDVI'],
+                                       b['B11'], a['B11'], ndvi_thresh, swir_thresh)
+                p_row0, p_col0 = int(padded.row_off), int(padded.col_off)
+                interior = (p_row0 > 0, p_row0 + int(padded.height) < height,
+                            p_col0 > 0, p_col0 + int(padded.width) < width)
+                mined = _clean_tile((raw, interior, structure, min_area_pixels,
+                                     connectivity, morph_halo, core))
+                if not mined.any():
+                    touched[candidates] = True
+                    continue
+
+                area = np.broadcast_to(pixel_area_m2(transform, crs, rows, row_off=row0)[:, None],
+                                       (rows, cols))
+                depth = None
+                if with_volume:
+                    pre, post = (self._dem_block(dem, window, profile) for dem in dems)
+                    depth = pre - post
+                    depth = np.nan_to_num(np.clip(depth, 0.0, None), nan=0.0) * area
+
+                # Block-wide union of leases: a lease touching the block is
+                # always a candidate, since its zone contains it
+                in_any_lease = np.zeros((rows, cols), dtype=bool)
+                views = []
+                for i in candidates:
+                    lease_mask, zone_mask = scene.masks(i)
+                    w_row0, w_row1, w_col0, w_col1 = scene.windows[i]
+                    r0, r1 = max(row0, w_row0), min(row0 + rows, w_row1)
+                    c0, c1 = max(col0, w_col0), min(col0 + cols, w_col1)
+                    touched[i] = True
+                    if r0 >= r1 or c0 >= c1:
+                        continue
+                    block = (slice(r0 - row0, r1 - row0), slice(c0 - col0, c1 - col0))
+                    own = (slice(r0 - w_row0, r1 - w_row0), slice(c0 - w_col0, c1 - w_col0))
+                    in_any_lease[block] |= lease_mask[own]
+                    views.append((i, block, lease_mask[own], zone_mask[own]))
+
+                illegal_pixels = mined & ~in_any_lease
+                for i, block, lease_mask, zone_mask in views:
+                    inside = mined[block] & lease_mask
+                    outside = illegal_pixels[block] & zone_mask
+                    mined_m2[i] += area[block][inside].sum()
+                    illegal_m2[i] += area[block][outside].sum()
+                    if depth is not None:
+                        mined_m3[i] += depth[block][inside].sum()
+                        illegal_m3[i] += depth[block][outside].sum()
+
+        self.mined_m2 += mined_m2
+        self.illegal_m2 += illegal_m2
+        self.mined_m3 += mined_m3
+        self.illegal_m3 += illegal_m3
+        self.scenes += touched
+        self.volume_scenes += with_volume
+        report['leases_touched'] = int(touched.sum())
+
+        if not with_volume:
+            mined_m3 = illegal_m3 = np.full(n, np.nan)
+        table = self._table(mined_m2, illegal_m2, mined_m3, illegal_m3, touched.astype(np.int64))
+        return table[touched].reset_index(drop=True), report
+
+    def _table(self, mined_m2, illegal_m2, mined_m3, illegal_m3, scenes):
+        return pd.DataFrame({
+            'lease_id': self.lease_ids,
+            'lease_area_ha': self.lease_area_ha,
+            'mined_area_ha': mined_m2 / 10000.0,
+            'illegal_area_ha': illegal_m2 / 10000.0,
+            'mined_volume_m3': mined_m3,
+            'illegal_volume_m3': illegal_m3,
+            'scenes': scenes,
+        }, columns=LEASE_BATCH_COLUMNS)
+
+    def summary(self):
+        """Per-lease totals over every scene processed so far"""
+        if not self.volume_scenes:
+            return self._table(self.mined_m2, self.illegal_m2, np.full(len(self.leases), np.nan),
+                               np.full(len(self.leases), np.nan), self.scenes.copy())
+        return self._table(self.mined_m2, self.illegal_m2, self.mined_m3, self.illegal_m3,
+                           self.scenes.copy())
@@ -0,0 +1,371 @@
+"""
+Local scene catalog with a spatio-temporal index
+Scans the data/ tree (Sentinel-2, Sentinel-1, DEM), parses sensor, date and
+band from the EO Browser filenames and the GeoTIFF headers, and keeps one
+row per raster in SQLite with its WGS84 footprint in an R-tree. Queries such
+as "B04/B08/B11 over this lease between two dates" are an R-tree lookup plus
+an indexed (band, date) filter; rescans only re-read files whose mtime or
+size changed.
+
+Usage:
+    python -m eo_processing.catalog --db data/catalog.sqlite
+    python -m eo_processing.catalog --db data/catalog.sqlite --bands B04 B08 \\
+        --start 2023-01-01 --end 2023-01-31 --lease data/GoogleEarth/Korba_Coal_AOI_1.kml
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+
+import pandas as pd
+import rasterio
+from rasterio.warp import transform_bounds
+
+from .lease import _as_geoseries
+
+DEFAULT_ROOTS = (
+    os.path.join('data', 'Sentinel2-Hyperspectral'),
+    os.path.join('data', 'Sentinel1-SAR'),
+    os.path.join('data', 'SRTM-DEM'),
+)
+
+RASTER_EXTENSIONS = ('.tif', '.tiff')
+
+# Sensor assumed for files whose name carries none, by top-level data folder
+ROOT_SENSORS = {
+    'Sentinel2-Hyperspectral': 'Sentinel-2',
+    'Sentinel1-SAR': 'Sentinel-1',
+    'SRTM-DEM': 'DEM',
+}
+
+# EO Browser exports: <start>_<end>_<layer>.tiff, with ':' or '_' in the times,
+# e.g. 2023-01-10-00:00_2023-01-10-23:59_Sentinel-2_L2A_B04_(Raw).tiff
+EO_BROWSER_NAME = re.compile(
+    r'^(?P<start>\d{4}-\d{2}-\d{2})-\d{2}[:_]\d{2}_(?P<end>\d{4}-\d{2}-\d{2})-\d{2}[:_]\d{2}_'
+    r'(?P<layer>.+?)\.tiff?$', re.IGNORECASE)
+SENTINEL2_LAYER = re.compile(r'^Sentinel-2_(?P<product>L[12][AC])_(?P<band>B\d{2}|B8A|SCL)(?:_(?P<style>.+))?$')
+SENTINEL1_LAYER = re.compile(r'^Sentinel-1_(?P<product>[^_]+)_(?P<band>VV|VH|HH|HV)(?:_(?P<style>.+))?$')
+DEM_LAYER = re.compile(r'^DEM_(?P<product>.+?)_DEM(?:_(?P<style>.+))?$')
+
+SCENE_COLUMNS = [
+    'id', 'path', 'sensor', 'product', 'band', 'style', 'date', 'end_date', 'collection',
+    'crs', 'width', 'height', 'count', 'dtype', 'nodata', 'res_x', 'res_y',
+    'min_x', 'min_y', 'max_x', 'max_y', 'mtime', 'size',
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    sensor TEXT,
+    product TEXT,
+    band TEXT,
+    style TEXT,
+    date TEXT,
+    end_date TEXT,
+    collection TEXT,
+    crs TEXT,
+    width INTEGER,
+    height INTEGER,
+    count INTEGER,
+    dtype TEXT,
+    nodata REAL,
+    res_x REAL,
+    res_y REAL,
+    min_x REAL,
+    min_y REAL,
+    max_x REAL,
+    max_y REAL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenes_band_date ON scenes (band, date);
+CREATE INDEX IF NOT EXISTS scenes_sensor_date ON scenes (sensor, date);
+CREATE VIRTUAL TABLE IF NOT EXISTS scene_footprints USING rtree (
+    id, min_x, max_x, min_y, max_y
+);
+"""
+
+
+def _style(raw):
+    """'(Raw)' -> 'Raw', '-_decibel_gamma0_-_...' -> 'decibel gamma0 - ...'"""
+    if not raw:
+        return None
+    return raw.strip('()').replace('_', ' ').strip(' -') or None
+
+
+def parse_scene_name(path, root_sensor=None):
+    """
+    Sensor / product / band / dates encoded in an EO Browser file name
+
+    Args:
+        path: Raster path
+        root_sensor: Sensor to assume when the name does not say
+
+    Returns:
+        Dict with sensor, product, band, style, date and end_date (None
+        where the name carries no information)
+    """
+    info = dict(sensor=root_sensor, product=None, band=None, style=None, date=None, end_date=None)
+    match = EO_BROWSER_NAME.match(os.path.basename(path))
+    if not match:
+        return info
+    info['date'], info['end_date'] = match['start'], match['end']
+
+    layer = match['layer']
+    for sensor, pattern in (('Sentinel-2', SENTINEL2_LAYER), ('Sentinel-1', SENTINEL1_LAYER),
+                            ('DEM', DEM_LAYER)):
+        parsed = pattern.match(layer)
+        if parsed:
+            info.update(sensor=sensor, product=parsed['product'], style=_style(parsed['style']),
+                        band=parsed['band'] if 'band' in pattern.groupindex else 'DEM')
+            break
+    else:
+        info['style'] = _style(layer)
+    return info
+
+
+def read_header(path):
+    """Grid, dtype and WGS84 footprint from a raster header (no pixels read)"""
+    with rasterio.open(path) as src:
+        header = dict(
+            crs=src.crs.to_string() if src.crs else None,
+            width=src.width, height=src.height, count=src.count,
+            dtype=src.dtypes[0], nodata=src.nodata,
+            res_x=src.res[0], res_y=src.res[1],
+            band_description=src.descriptions[0] if src.descriptions else None,
+        )
+        bounds = src.bounds
+        if src.crs is not None and not src.crs.is_geographic:
+            bounds = transform_bounds(src.crs, 'EPSG:4326', *bounds, densify_pts=21)
+    header.update(min_x=bounds[0], min_y=bounds[1], max_x=bounds[2], max_y=bounds[3])
+    return header
+
+
+def iter_rasters(root):
+    """Yield (path, stat) for every GeoTIFF below root, via os.scandir"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(RASTER_EXTENSIONS):
+                    yield entry.path, entry.stat()
+
+
+def _bbox(area, crs=None):
+    """(min_x, min_y, max_x, max_y) in WGS84 from a bbox tuple or vector data"""
+    if area is None:
+        return None
+    if isinstance(area, (tuple, list)) and len(area) == 4 and all(
+            isinstance(v, (int, float)) for v in area):
+        return tuple(float(v) for v in area)
+    series = _as_geoseries(area, crs)
+    if series.crs is not None:
+        series = series.to_crs('EPSG:4326')
+    return tuple(float(v) for v in series.total_bounds)
+
+
+class SceneCatalog:
+    """
+    SQLite scene catalog with an R-tree over scene footprints
+
+    Paths are stored as given to scan() (relative paths stay relative).
+    Footprints are WGS84 bounding boxes.
+
+    Example:
+        with SceneCatalog('data/catalog.sqlite') as catalog:
+            catalog.scan()
+            scenes = catalog.query(bands=['B04', 'B08', 'B11'], area=leases,
+                                   start='2023-01-01', end='2023-01-31')
+    """
+
+    def __init__(self, db_path=':memory:'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM scenes').fetchone()[0]
+
+    def scan(self, roots=DEFAULT_ROOTS, prune=True):
+        """
+        Add new rasters, refresh changed ones and drop vanished ones
+
+        A file is re-read only when its mtime or size differs from the
+        catalog, so a rescan of an unchanged tree is one directory walk.
+
+        Args:
+            roots: Directories to walk
+            prune: Remove catalog rows below the roots whose file is gone
+
+        Returns:
+            Dict of counts: added, updated, removed, unchanged, failed
+        """
+        counts = dict(added=0, updated=0, removed=0, unchanged=0, failed=0)
+        roots = [roots] if isinstance(roots, str) else list(roots)
+        roots = [os.path.normpath(root) for root in roots]
+        with self.conn:
+            for root in roots:
+                known = {row['path']: (row['id'], row['mtime'], row['size']) for row in
+                         self.conn.execute('SELECT id, path, mtime, size FROM scenes '
+                                           'WHERE path >= ? AND path < ?',
+                                           (root + os.sep, root + chr(ord(os.sep) + 1)))}
+                sensor = ROOT_SENSORS.get(os.path.basename(os.path.normpath(root)))
+                seen = set()
+                for path, stat in iter_rasters(root):
+                    seen.add(path)
+                    previous = known.get(path)
+                    if previous and previous[1] == stat.st_mtime and previous[2] == stat.st_size:
+                        counts['unchanged'] += 1
+                        continue
+                    try:
+                        self._upsert(path, stat, sensor, previous[0] if previous else None)
+                    except rasterio.errors.RasterioError:
+                        counts['failed'] += 1
+                        continue
+                    counts['updated' if previous else 'added'] += 1
+
+                if prune:
+                    gone = [(scene_id,) for path, (scene_id, _, _) in known.items() if path not in seen]
+                    self.conn.executemany('DELETE FROM scenes WHERE id = ?', gone)
+                    self.conn.executemany('DELETE FROM scene_footprints WHERE id = ?', gone)
+                    counts['removed'] += len(gone)
+        return counts
+
+    def _upsert(self, path, stat, root_sensor, scene_id):
+        info = parse_scene_name(path, root_sensor)
+        header = read_header(path)
+        description = header.pop('band_description')
+        if info['band'] is None and description:
+            info['band'] = description
+        row = dict(info, **header, path=path, mtime=stat.st_mtime, size=stat.st_size,
+                   collection=os.path.basename(os.path.dirname(path)))
+        columns = [c for c in SCENE_COLUMNS if c != 'id']
+        if scene_id is None:
+            cursor = self.conn.execute(
+                f"INSERT INTO scenes ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [row[c] for c in columns])
+            scene_id = cursor.lastrowid
+        else:
+            self.conn.execute(
+                f"UPDATE scenes SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                [row[c] for c in columns] + [scene_id])
+            self.conn.execute('DELETE FROM scene_footprints WHERE id = ?', (scene_id,))
+        self.conn.execute('INSERT INTO scene_footprints VALUES (?, ?, ?, ?, ?)',
+                          (scene_id, row['min_x'], row['max_x'], row['min_y'], row['max_y']))
+
+    def query(self, bands=None, sensor=None, start=None, end=None, area=None, crs=None,
+              collection=None, style=None):
+        """
+        Scenes matching every given filter
+
+        Args:
+            bands: Band name or list (e.g. ['B04', 'B08', 'B11'], 'VV', 'DEM')
+            sensor: 'Sentinel-2', 'Sentinel-1' or 'DEM'
+            start, end: Inclusive ISO dates (strings, dates or Timestamps)
+            area: (min_x, min_y, max_x, max_y) in WGS84, or lease polygons
+                  (GeoDataFrame / GeoSeries / shapely geometries)
+            crs: CRS of shapely geometries passed as area
+            collection: Parent folder name, e.g. 'Korba_Coal_AOI1_Jan10'
+            style: EO Browser layer style, e.g. 'Raw'
+
+        Returns:
+            DataFrame with SCENE_COLUMNS, ordered by date, sensor and band
+        """
+        clauses, params = [], []
+        if isinstance(bands, str):
+            bands = [bands]
+        if bands:
+            clauses.append(f"s.band IN ({', '.join('?' * len(bands))})")
+            params.extend(bands)
+        for column, value in (('sensor', sensor), ('collection', collection), ('style', style)):
+            if value is not None:
+                clauses.append(f's.{column} = ?')
+                params.append(value)
+        if start is not None:
+            clauses.append('s.date >= ?')
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            clauses.append('s.date <= ?')
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+
+        bbox = _bbox(area, crs)
+        if bbox is not None:
+            # The R-tree lookup runs first; band / date filters then only
+            # touch the scenes whose footprint intersects the area
+            clauses.append('s.id IN (SELECT id FROM scene_footprints WHERE '
+                           'min_x <= ? AND max_x >= ? AND min_y <= ? AND max_y >= ?)')
+            params.extend([bbox[2], bbox[0], bbox[3], bbox[1]])
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        sql = (f"SELECT {', '.join('s.' + c for c in SCENE_COLUMNS)} FROM scenes s{where} "
+               "ORDER BY s.date, s.sensor, s.band, s.path")
+        rows = self.conn.execute(sql, params).fetchall()
+        return pd.DataFrame([tuple(r) for r in rows], columns=SCENE_COLUMNS)
+
+    def band_paths(self, bands, **filters):
+        """
+        {date: {band: path}} for the given bands, e.g. to feed BandReader
+
+        Dates missing any of the bands are left out.
+        """
+        scenes = self.query(bands=bands, **filters)
+        grouped = {}
+        for date, band, path in scenes[['date', 'band', 'path']].itertuples(index=False):
+            grouped.setdefault(date, {}).setdefault(band, path)
+        bands = [bands] if isinstance(bands, str) else list(bands)
+        return {date: paths for date, paths in grouped.items() if all(b in paths for b in bands)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the local scene catalog')
+    parser.add_argument('roots', nargs='*', default=list(DEFAULT_ROOTS),
+                        help='Directories to scan (default: the data/ sensor folders)')
+    parser.add_argument('--db', default=os.path.join('data', 'catalog.sqlite'))
+    parser.add_argument('--no-scan', action='store_true', help='Query without rescanning')
+    parser.add_argument('--bands', nargs='+')
+    parser.add_argument('--sensor')
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    parser.add_argument('--lease', help='Vector file whose extent limits the query')
+    args = parser.parse_args()
+
+    with SceneCatalog(args.db) as catalog:
+        if not args.no_scan:
+            t0 = time.perf_counter()
+            counts = catalog.scan(args.roots)
+            print(f"Scanned in {time.perf_counter() - t0:.2f}s: "
+                  + ', '.join(f'{k} {v}' for k, v in counts.items()))
+
+        area = None
+        if args.lease:
+            from .lease import load_leases
+            area = load_leases(args.lease)
+        t0 = time.perf_counter()
+        scenes = catalog.query(bands=args.bands, sensor=args.sensor, start=args.start,
+                               end=args.end, area=area)
+        print(f"{len(scenes)} scenes in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        if len(scenes):
+            print(scenes[['date', 'sensor', 'band', 'style', 'path']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
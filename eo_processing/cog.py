@@ -0,0 +1,191 @@
+"""
+Cloud-Optimized GeoTIFF writer and overview-aware reader
+Products (mined masks, indices, DEM derivatives) are written tiled,
+compressed and with an overview pyramid, so visualizations read the level
+they need instead of decimating a full-resolution array with [::factor] or
+ndimage.zoom.
+"""
+
+import os
+
+import numpy as np
+import rasterio
+import rasterio.shutil
+
+from .band_reader import iter_windows
+
+DEFAULT_BLOCKSIZE = 512
+
+# Overview resampling per product kind: masks and classes must keep their
+# values (mode), continuous rasters are averaged
+RESAMPLING = {
+    'mask': 'mode',
+    'categorical': 'mode',
+    'continuous': 'average',
+}
+
+
+def write_cog(path, array, profile, kind='continuous', nodata=None,
+              blocksize=DEFAULT_BLOCKSIZE, compress='deflate', overview_count=None):
+    """
+    Write a 2D (or bands, rows, cols) array as a Cloud-Optimized GeoTIFF
+
+    The array is first written block by block into a tiled scratch GeoTIFF
+    next to path (np.memmap inputs are never loaded whole), then GDAL's COG
+    driver builds the overviews and lays the file out.
+
+    Args:
+        path: Output path
+        array: 2D array, or 3D with bands first
+        profile: Source profile supplying crs and transform
+        kind: 'mask', 'categorical' or 'continuous'; picks the overview
+              resampling and predictor
+        nodata: Nodata value (default: profile's, if any)
+        blocksize: Internal tile size
+        compress: GDAL compression (deflate, lzw, zstd, ...)
+        overview_count: Number of overview levels (default: halve until
+                        the level fits in one tile)
+
+    Returns:
+        path
+    """
+    if kind not in RESAMPLING:
+        raise ValueError(f"Unknown product kind '{kind}', expected one of {sorted(RESAMPLING)}")
+    array = np.asarray(array)
+    if array.dtype == bool:
+        array = array.view(np.uint8)
+    bands = array[np.newaxis] if array.ndim == 2 else array
+    count, height, width = bands.shape
+    if nodata is None:
+        nodata = profile.get('nodata')
+
+    scratch_profile = {
+        'driver': 'GTiff',
+        'height': height,
+        'width': width,
+        'count': count,
+        'dtype': bands.dtype.name,
+        'crs': profile.get('crs'),
+        'transform': profile.get('transform'),
+        'nodata': nodata,
+        'tiled': True,
+        'blockxsize': blocksize,
+        'blockysize': blocksize,
+    }
+    scratch = f'{path}.tmp.tif'
+    try:
+        with rasterio.open(scratch, 'w', **scratch_profile) as dst:
+            for window in iter_windows(height, width, (blocksize, blocksize)):
+                dst.write(bands[(slice(None),) + window.toslices()], window=window)
+
+        options = {
+            'BLOCKSIZE': blocksize,
+            'COMPRESS': compress.upper(),
+            'OVERVIEW_RESAMPLING': RESAMPLING[kind].upper(),
+            'RESAMPLING': 'NEAREST' if RESAMPLING[kind] == 'mode' else 'BILINEAR',
+            'BIGTIFF': 'IF_SAFER',
+        }
+        if kind == 'continuous' and compress.lower() in ('deflate', 'lzw', 'zstd'):
+            options['PREDICTOR'] = 'YES'
+        if overview_count is not None:
+            options['OVERVIEW_COUNT'] = int(overview_count)
+        rasterio.shutil.copy(scratch, path, driver='COG', **options)
+    finally:
+        if os.path.exists(scratch):
+            os.remove(scratch)
+    return path
+
+
+def write_mask_cog(path, mask, profile, **kwargs):
+    """uint8 mined-mask COG with mode overviews (0 = background)"""
+    return write_cog(path, np.asarray(mask).astype(np.uint8, copy=False), profile,
+                     kind='mask', **kwargs)
+
+
+def write_products(products, profile, out_dir, prefix, kinds=None):
+    """
+    Write named product rasters as COGs named <prefix>_<name>.tif
+
+    Args:
+        products: Dict of name -> 2D array on profile's grid
+        profile: Source profile supplying crs and transform
+        out_dir: Output directory (created if missing)
+        prefix: File name prefix
+        kinds: Optional dict of name -> product kind (default 'continuous');
+               'mask' products go through write_mask_cog, float products get
+               NaN nodata and other integer products 0
+
+    Returns:
+        Dict of name -> path
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    kinds = {} if kinds is None else kinds
+    paths = {}
+    for name, array in products.items():
+        path = os.path.join(out_dir, f'{prefix}_{name}.tif')
+        kind = kinds.get(name, 'continuous')
+        if kind == 'mask':
+            paths[name] = write_mask_cog(path, array, profile)
+        else:
+            nodata = np.nan if np.asarray(array).dtype.kind == 'f' else 0
+            paths[name] = write_cog(path, array, profile, kind=kind, nodata=nodata)
+    return paths
+
+
+def overview_factors(path):
+    """Decimation factor of each overview level, finest first"""
+    with rasterio.open(path) as src:
+        return src.overviews(1)
+
+
+def select_overview(path, resolution=None, max_size=None):
+    """
+    Pick the overview level for a target resolution or output size
+
+    Args:
+        resolution: Wanted pixel size in CRS units; the coarsest level that
+                    is still at least this fine is chosen
+        max_size: Wanted maximum number of pixels along the longer side;
+                  the finest level that fits is chosen
+
+    Returns:
+        Overview level index (None = full resolution)
+    """
+    with rasterio.open(path) as src:
+        factors = src.overviews(1)
+        pixel = max(abs(src.res[0]), abs(src.res[1]))
+        longest = max(src.height, src.width)
+
+    if resolution is None and max_size is None:
+        return None
+
+    chosen = None
+    for level, factor in [(None, 1)] + list(enumerate(factors)):
+        if resolution is not None and pixel * factor > resolution:
+            break
+        chosen = level
+        if max_size is not None and -(-longest // factor) <= max_size:
+            break
+    return chosen
+
+
+def read_overview(path, level=None, resolution=None, max_size=None, band=1, masked=False):
+    """
+    Read one band at an overview level
+
+    Only the blocks of that level are decoded. Give level directly, or let
+    select_overview pick it from resolution / max_size.
+
+    Returns:
+        (array, profile) with the profile's transform, width and height
+        describing the level that was read
+    """
+    if level is None and (resolution is not None or max_size is not None):
+        level = select_overview(path, resolution=resolution, max_size=max_size)
+
+    kwargs = {} if level is None else {'overview_level': level}
+    with rasterio.open(path, **kwargs) as src:
+        arr = src.read(band, masked=masked)
+        profile = src.profile.copy()
+        profile.update(transform=src.transform, width=src.width, height=src.height)
+    return arr, profile
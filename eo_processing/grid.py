@@ -0,0 +1,59 @@
+"""
+Raster grid helpers
+Pixel sizes, pixel areas and pixel-centre coordinates in metres for both
+projected and geographic (EPSG:4326, as shipped by EO Browser) rasters.
+"""
+
+import numpy as np
+
+# Mean Earth radius (IUGG), used for the spherical degree -> metre conversion
+EARTH_RADIUS_M = 6371008.8
+
+
+def is_geographic(crs):
+    return crs is not None and getattr(crs, 'is_geographic', False)
+
+
+def row_centers_y(transform, row_off, rows):
+    """Map y coordinate of the centre of each row"""
+    return transform.f + transform.e * (np.arange(row_off, row_off + rows) + 0.5)
+
+
+def col_centers_x(transform, col_off, cols):
+    """Map x coordinate of the centre of each column"""
+    return transform.c + transform.a * (np.arange(col_off, col_off + cols) + 0.5)
+
+
+def pixel_sizes_m(transform, crs, rows, row_off=0):
+    """
+    Ground pixel size per row
+
+    Args:
+        transform: Affine transform of the raster (north-up)
+        crs: rasterio CRS; geographic rasters are converted with a
+             spherical Earth, projected ones are assumed to be in metres
+        rows: Number of rows
+        row_off: Index of the first row
+
+    Returns:
+        (dx_m, dy_m) float64 arrays of length rows
+    """
+    if is_geographic(crs):
+        lat = np.radians(row_centers_y(transform, row_off, rows))
+        metres_per_degree = np.pi / 180.0 * EARTH_RADIUS_M
+        dx = abs(transform.a) * metres_per_degree * np.cos(lat)
+        dy = np.full(rows, abs(transform.e) * metres_per_degree)
+        return dx, dy
+    return np.full(rows, abs(transform.a)), np.full(rows, abs(transform.e))
+
+
+def pixel_area_m2(transform, crs, rows, row_off=0):
+    """Ground area of one pixel in each row, in square metres"""
+    dx, dy = pixel_sizes_m(transform, crs, rows, row_off)
+    return dx * dy
+
+
+def mean_pixel_size_m(transform, crs, height):
+    """Scene-average (dy_m, dx_m), e.g. for distance transforms"""
+    dx, dy = pixel_sizes_m(transform, crs, height)
+    return float(dy.mean()), float(dx.mean())
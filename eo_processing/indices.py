@@ -0,0 +1,280 @@
+"""
+Spectral index engine for NDVI / BSI / BAI and friends
+Computes any number of registered indices from one read of the input bands.
+Work is done in cache-sized row chunks with preallocated float32 scratch, so
+each input band is streamed from memory once and each output written once.
+"""
+
+import numpy as np
+
+from .cog import write_products
+
+# Small constant that keeps the ratio indices finite on all-zero pixels
+EPSILON = 1e-9
+
+# Target number of pixels per fused chunk (~256 KB per float32 buffer)
+DEFAULT_CHUNK_PIXELS = 65536
+
+# Names usable inside index expressions
+_EXPRESSION_FUNCTIONS = {
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'log': np.log,
+    'exp': np.exp,
+    'where': np.where,
+    'minimum': np.minimum,
+    'maximum': np.maximum,
+}
+
+_REGISTRY = {}
+
+
+class SpectralIndex:
+    """
+    A named index and the kernel that computes it
+
+    The kernel is called as kernel(bands, out, scratch) on matching 2D chunk
+    views, must write its result into `out` and may use the float32 arrays in
+    `scratch` as temporaries.
+    """
+
+    def __init__(self, name, bands, kernel, description=''):
+        self.name = name
+        self.bands = tuple(bands)
+        self.kernel = kernel
+        self.description = description
+
+    def __repr__(self):
+        return f"SpectralIndex({self.name!r}, bands={self.bands})"
+
+
+def _band_sum(bands, names, buf):
+    if len(names) == 1:
+        return bands[names[0]]
+    np.add(bands[names[0]], bands[names[1]], out=buf)
+    for name in names[2:]:
+        buf += bands[name]
+    return buf
+
+
+def normalized_difference(positive, negative):
+    """
+    Build an in-place kernel for (sum(positive) - sum(negative)) / (sum(all) + eps)
+
+    Args:
+        positive: Band name or list of band names on the positive side
+        negative: Band name or list of band names on the negative side
+    """
+    positive = [positive] if isinstance(positive, str) else list(positive)
+    negative = [negative] if isinstance(negative, str) else list(negative)
+
+    def kernel(bands, out, scratch):
+        pos = _band_sum(bands, positive, scratch[0])
+        neg = _band_sum(bands, negative, scratch[1])
+        np.subtract(pos, neg, out=out)
+        np.add(pos, neg, out=scratch[2])
+        scratch[2] += EPSILON
+        np.divide(out, scratch[2], out=out)
+
+    return kernel
+
+
+def _bai_kernel(bands, out, scratch):
+    # BAI = 1 / ((0.1 - RED)^2 + (0.06 - NIR)^2)
+    red, nir = bands['B04'], bands['B08']
+    np.subtract(0.1, red, out=scratch[0])
+    np.multiply(scratch[0], scratch[0], out=scratch[0])
+    np.subtract(0.06, nir, out=scratch[1])
+    np.multiply(scratch[1], scratch[1], out=scratch[1])
+    scratch[0] += scratch[1]
+    scratch[0] += 1e-6
+    np.divide(1.0, scratch[0], out=out)
+
+
+def _expression_kernel(expression):
+    code = compile(expression, f'<index {expression}>', 'eval')
+
+    def kernel(bands, out, scratch):
+        namespace = dict(_EXPRESSION_FUNCTIONS)
+        namespace.update(bands)
+        out[...] = eval(code, {'__builtins__': {}}, namespace)
+
+    return kernel
+
+
+def register_index(name, bands, kernel=None, expression=None, description='', replace=False):
+    """
+    Register a new spectral index
+
+    Either pass a ready-made in-place `kernel`, or an `expression` over the
+    band names, e.g. register_index('NBR', ['B08', 'B12'],
+    expression='(B08 - B12) / (B08 + B12 + 1e-9)'). Expressions are evaluated
+    with NumPy on one cache-sized chunk at a time, so their temporaries stay
+    small even for whole Sentinel-2 tiles.
+
+    Args:
+        name: Index name (case-insensitive lookups use the upper-case form)
+        bands: Band names the index reads
+        kernel: Optional kernel(bands, out, scratch) callable
+        expression: Optional Python/NumPy expression over the band names
+        description: Human-readable formula or note
+        replace: Allow overwriting an existing registration
+
+    Returns:
+        The registered SpectralIndex
+    """
+    key = name.upper()
+    if key in _REGISTRY and not replace:
+        raise ValueError(f"Index '{name}' is already registered")
+    if (kernel is None) == (expression is None):
+        raise ValueError("Pass exactly one of kernel= or expression=")
+    if expression is not None:
+        kernel = _expression_kernel(expression)
+        description = description or expression
+
+    index = SpectralIndex(key, bands, kernel, description)
+    _REGISTRY[key] = index
+    return index
+
+
+def get_index(name):
+    try:
+        return _REGISTRY[name.upper()]
+    except KeyError:
+        raise KeyError(f"Unknown index '{name}'. Registered: {sorted(_REGISTRY)}") from None
+
+
+def available_indices():
+    return sorted(_REGISTRY)
+
+
+register_index('NDVI', ['B08', 'B04'], normalized_difference('B08', 'B04'),
+               description='(B08 - B04) / (B08 + B04)')
+register_index('BSI', ['B11', 'B04', 'B08'], normalized_difference(['B11', 'B04'], 'B08'),
+               description='(B11 + B04 - B08) / (B11 + B04 + B08), approximated without B02')
+register_index('NDBI', ['B11', 'B08'], normalized_difference('B11', 'B08'),
+               description='(B11 - B08) / (B11 + B08)')
+register_index('NDWI', ['B03', 'B08'], normalized_difference('B03', 'B08'),
+               description='(B03 - B08) / (B03 + B08), McFeeters')
+register_index('MNDWI', ['B03', 'B11'], normalized_difference('B03', 'B11'),
+               description='(B03 - B11) / (B03 + B11)')
+register_index('BAI', ['B04', 'B08'], _bai_kernel,
+               description='1 / ((0.1 - B04)^2 + (0.06 - B08)^2)')
+
+
+class IndexEngine:
+    """
+    Compute several indices in one fused pass over the input bands
+
+    Example:
+        engine = IndexEngine(['NDVI', 'BSI', 'BAI'])
+        with BandReader(paths, scale=L2A_SCALE) as reader:
+            results = engine.compute_raster(reader)
+    """
+
+    N_SCRATCH = 3
+
+    def __init__(self, names, chunk_pixels=DEFAULT_CHUNK_PIXELS):
+        self.indices = [get_index(name) for name in names]
+        self.chunk_pixels = chunk_pixels
+        self._scratch = None
+
+    @property
+    def names(self):
+        return [index.name for index in self.indices]
+
+    @property
+    def bands(self):
+        """Band names needed by at least one of the indices"""
+        needed = []
+        for index in self.indices:
+            for band in index.bands:
+                if band not in needed:
+                    needed.append(band)
+        return needed
+
+    def _scratch_views(self, rows, cols):
+        size = rows * cols
+        if self._scratch is None or self._scratch.shape[1] < size:
+            self._scratch = np.empty((self.N_SCRATCH, size), dtype=np.float32)
+        return [buf[:size].reshape(rows, cols) for buf in self._scratch]
+
+    def compute(self, bands, out=None):
+        """
+        Compute every index for one block of bands
+
+        Args:
+            bands: Mapping of band name -> 2D float array (all the same shape)
+            out: Optional mapping of index name -> preallocated float32 array
+                 (views into a larger raster are fine). Missing entries are
+                 allocated
+
+        Returns:
+            Dict of index name -> float32 array
+        """
+        missing = [band for band in self.bands if band not in bands]
+        if missing:
+            raise KeyError(f"Missing bands for {self.names}: {missing}")
+
+        shape = bands[self.bands[0]].shape
+        out = {} if out is None else dict(out)
+        for name in self.names:
+            if name not in out:
+                out[name] = np.empty(shape, dtype=np.float32)
+            elif out[name].shape != shape:
+                raise ValueError(f"out['{name}'] has shape {out[name].shape}, expected {shape}")
+
+        rows, cols = shape
+        step = max(1, self.chunk_pixels // max(cols, 1))
+        for row in range(0, rows, step):
+            stop = min(rows, row + step)
+            chunk = {band: bands[band][row:stop] for band in self.bands}
+            scratch = self._scratch_views(stop - row, cols)
+            # All indices run while this chunk of every band is cache-resident
+            for index in self.indices:
+                index.kernel(chunk, out[index.name][row:stop], scratch)
+        return out
+
+    def compute_raster(self, reader, out=None, block_shape=None):
+        """
+        Stream a BandReader block by block and assemble full-size index rasters
+
+        Args:
+            reader: BandReader exposing at least self.bands
+            out: Optional mapping of index name -> preallocated float32
+                 array of the reader's shape (e.g. a np.memmap)
+            block_shape: Passed through to reader.iter_blocks
+
+        Returns:
+            Dict of index name -> float32 array of the reader's shape
+        """
+        out = {} if out is None else dict(out)
+        for name in self.names:
+            if name not in out:
+                out[name] = np.empty(reader.shape, dtype=np.float32)
+
+        for window, bands in reader.iter_blocks(block_shape, bands=self.bands):
+            rows = slice(int(window.row_off), int(window.row_off + window.height))
+            cols = slice(int(window.col_off), int(window.col_off + window.width))
+            self.compute(bands, out={name: out[name][rows, cols] for name in self.names})
+        return out
+
+    def write_raster(self, reader, out_dir, prefix='index', block_shape=None):
+        """
+        Stream a BandReader and write each index as a COG <prefix>_<NAME>.tif
+
+        Returns:
+            Dict of index name -> path
+        """
+        results = self.compute_raster(reader, block_shape=block_shape)
+        return write_products(results, reader.profile, out_dir, prefix)
+
+
+def calculate_ndvi(b8, b4):
+    """NDVI from NIR (B08) and red (B04) arrays"""
+    return IndexEngine(['NDVI']).compute({'B08': b8, 'B04': b4})['NDVI']
+
+
+def calculate_bsi_approx(b11, b8, b4):
+    """Approximated bare soil index from SWIR (B11), NIR (B08) and red (B04)"""
+    return IndexEngine(['BSI']).compute({'B11': b11, 'B08': b8, 'B04': b4})['BSI']
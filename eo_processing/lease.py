@@ -0,0 +1,200 @@
+"""
+Lease boundaries: cached rasterization and illegal-area accounting
+Lease polygons (KML / Shapefile / GeoJSON) are burned onto a scene grid once
+and cached by (polygon hash, transform, shape), so re-running the same
+leases against every new acquisition never rasterizes them again.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from rasterio.features import rasterize
+from shapely import force_2d
+
+from .grid import pixel_area_m2
+
+
+def load_leases(path, id_column=None):
+    """
+    Read lease polygons from any vector format geopandas understands
+
+    Args:
+        path: KML / Shapefile / GeoJSON path
+        id_column: Optional column used as the lease identifier; defaults to
+                   the row index
+
+    Returns:
+        GeoDataFrame with a 'lease_id' column and 2D polygon geometries
+    """
+    leases = gpd.read_file(path)
+    leases['geometry'] = force_2d(leases.geometry.values)
+    leases['lease_id'] = leases[id_column] if id_column else leases.index.astype(str)
+    return leases
+
+
+def _as_geoseries(geometries, crs):
+    if isinstance(geometries, (gpd.GeoDataFrame, gpd.GeoSeries)):
+        series = geometries.geometry if isinstance(geometries, gpd.GeoDataFrame) else geometries
+        if crs is not None and series.crs is not None and series.crs != crs:
+            series = series.to_crs(crs)
+        return series
+    if not isinstance(geometries, (list, tuple)):
+        geometries = [geometries]
+    return gpd.GeoSeries(list(geometries), crs=crs)
+
+
+def geometry_hash(geometries):
+    """Stable digest of a set of 2D geometries (order-sensitive)"""
+    digest = hashlib.sha1()
+    for geom in force_2d(np.asarray(geometries)):
+        digest.update(geom.wkb)
+    return digest.hexdigest()
+
+
+class LeaseMaskCache:
+    """
+    Rasterized lease masks keyed by (polygon hash, transform, shape)
+
+    Masks live in an in-memory LRU and, when cache_dir is set, as .npy files
+    that later runs memory-map instead of rasterizing again.
+
+    Example:
+        cache = LeaseMaskCache(cache_dir='cache/leases')
+        inside = cache.get(leases, profile['transform'], (h, w), crs=profile['crs'])
+    """
+
+    def __init__(self, cache_dir=None, max_items=64):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(geometries, transform, shape, all_touched=False, burn_ids=False):
+        parts = [geometry_hash(geometries), repr(tuple(transform)[:6]), repr(tuple(shape)),
+                 str(bool(all_touched)), str(bool(burn_ids))]
+        return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npy')
+
+    def get(self, geometries, transform, shape, crs=None, all_touched=False, burn_ids=False):
+        """
+        Lease mask on a grid, rasterizing only on a cache miss
+
+        Args:
+            geometries: GeoDataFrame / GeoSeries (reprojected to crs if
+                        needed) or a list of shapely geometries in the grid CRS
+            transform: Grid affine transform
+            shape: Grid (rows, cols)
+            crs: Grid CRS
+            all_touched: Burn every pixel the polygons touch
+            burn_ids: Burn 1-based polygon positions (int32) instead of a
+                      boolean union; where leases overlap the later one wins
+
+        Returns:
+            Read-only bool array (or int32 ids when burn_ids=True)
+        """
+        series = _as_geoseries(geometries, crs)
+        key = self.make_key(series.values, transform, shape, all_touched, burn_ids)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if self.cache_dir and os.path.exists(self._disk_path(key)):
+            mask = np.load(self._disk_path(key), mmap_mode='r')
+            self.hits += 1
+        else:
+            self.misses += 1
+            mask = self._rasterize(series.values, transform, shape, all_touched, burn_ids)
+            mask.flags.writeable = False
+            if self.cache_dir:
+                np.save(self._disk_path(key), mask)
+
+        self._memory[key] = mask
+        if len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+        return mask
+
+    @staticmethod
+    def _rasterize(geometries, transform, shape, all_touched, burn_ids):
+        geometries = [geom for geom in force_2d(np.asarray(geometries))]
+        if burn_ids:
+            shapes = [(geom, i + 1) for i, geom in enumerate(geometries) if not geom.is_empty]
+            if not shapes:
+                return np.zeros(shape, dtype=np.int32)
+            return rasterize(shapes, out_shape=shape, transform=transform, fill=0,
+                             all_touched=all_touched, dtype='int32')
+
+        shapes = [(geom, 1) for geom in geometries if not geom.is_empty]
+        if not shapes:
+            return np.zeros(shape, dtype=bool)
+        burned = rasterize(shapes, out_shape=shape, transform=transform, fill=0,
+                           all_touched=all_touched, dtype='uint8')
+        return burned.view(bool)
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def lease_area_breakdown(labels, n_pits, lease_mask, transform, crs):
+    """
+    Inside- vs outside-lease mined area per pit
+
+    One boolean AND with the cached lease mask and two weighted bincounts;
+    pixel areas follow the grid (per row for geographic rasters).
+
+    Args:
+        labels: Pit label image (0 = background)
+        n_pits: Number of labels
+        lease_mask: Boolean lease mask on the same grid
+        transform, crs: Grid georeferencing
+
+    Returns:
+        DataFrame: pit_id, area_ha, inside_lease_ha, outside_lease_ha,
+        outside_fraction
+    """
+    if lease_mask.shape != labels.shape:
+        raise ValueError(f"Lease mask shape {lease_mask.shape} does not match labels {labels.shape}")
+
+    height, width = labels.shape
+    flat = labels.ravel()
+    area = np.repeat(pixel_area_m2(transform, crs, height), width)
+    inside = np.asarray(lease_mask, dtype=bool).ravel() & (flat > 0)
+
+    total_m2 = np.bincount(flat, weights=area, minlength=n_pits + 1)[1:]
+    inside_m2 = np.bincount(flat[inside], weights=area[inside], minlength=n_pits + 1)[1:]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        outside_fraction = 1.0 - inside_m2 / total_m2
+    return pd.DataFrame({
+        'pit_id': np.arange(1, n_pits + 1, dtype=np.int32),
+        'area_ha': total_m2 / 10000.0,
+        'inside_lease_ha': inside_m2 / 10000.0,
+        'outside_lease_ha': (total_m2 - inside_m2) / 10000.0,
+        'outside_fraction': outside_fraction,
+    })
+
+
+def illegal_area_summary(breakdown):
+    """Scene totals from lease_area_breakdown, in hectares"""
+    mined = float(breakdown['area_ha'].sum())
+    outside = float(breakdown['outside_lease_ha'].sum())
+    return {
+        'mined_area_ha': mined,
+        'inside_lease_ha': float(breakdown['inside_lease_ha'].sum()),
+        'outside_lease_ha': outside,
+        'outside_lease_pct': 100.0 * outside / mined if mined else 0.0,
+        'pits_outside_lease': int((breakdown['outside_lease_ha'] > 0).sum()),
+    }
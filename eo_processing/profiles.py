@@ -0,0 +1,328 @@
+"""
+Elevation profiles sampled from baseline and current DEMs
+Thousands of cross-section polylines (e.g. transects through every detected
+pit) are densified together into one flat array of sample points. Each DEM
+is then read once over the points' bounding window and bilinearly
+interpolated with a single four-neighbour gather. The result has the
+columnar layout of mining_elevation_profiles.csv.
+"""
+
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+from rasterio.crs import CRS
+from rasterio.windows import Window
+
+from .band_reader import BandReader
+from .grid import EARTH_RADIUS_M, is_geographic
+from .terrain import STABILITY_CLASSES, stability_classes
+
+PROFILE_COLUMNS = [
+    'mine_id', 'profile_id', 'point_number', 'distance_from_start_m',
+    'baseline_elevation_m', 'current_elevation_m', 'elevation_difference_m',
+    'slope_degree', 'slope_stability', 'water_accumulation_potential',
+]
+
+METRES_PER_DEGREE = np.pi / 180.0 * EARTH_RADIUS_M
+
+
+def _metric_scale(xs, ys, crs):
+    """Metres per CRS unit along x and y at each coordinate"""
+    if is_geographic(crs):
+        return METRES_PER_DEGREE * np.cos(np.radians(ys)), np.full(np.shape(ys), METRES_PER_DEGREE)
+    return np.ones(np.shape(xs)), np.ones(np.shape(ys))
+
+
+def _as_polylines(lines):
+    """Concatenated (V, 2) vertices plus the first vertex and count of each line"""
+    if isinstance(lines, np.ndarray) and lines.ndim == 3:
+        n, k, _ = lines.shape
+        return (lines.reshape(-1, 2).astype(np.float64),
+                np.arange(n) * k, np.full(n, k))
+    lines = [np.asarray(getattr(line, 'coords', line), dtype=np.float64)[:, :2] for line in lines]
+    counts = np.array([len(line) for line in lines], dtype=np.int64)
+    if (counts < 2).any():
+        raise ValueError("Every profile line needs at least two vertices")
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    vertices = np.concatenate(lines) if lines else np.empty((0, 2))
+    return vertices, starts, counts
+
+
+def densify_lines(lines, crs=None, points=100, spacing_m=None):
+    """
+    Sample points along many polylines at once
+
+    Args:
+        lines: (n, k, 2) array, or a sequence of (k_i, 2) arrays / shapely
+               LineStrings, in map coordinates
+        crs: CRS of the coordinates; geographic lines are measured in metres
+             with a spherical Earth
+        points: Samples per line, from the first to the last vertex
+        spacing_m: Sample spacing in metres instead of a fixed count
+
+    Returns:
+        (line_index, distance_m, x, y) flat arrays, grouped by line
+    """
+    vertices, starts, counts = _as_polylines(lines)
+    n_lines = len(starts)
+    if n_lines == 0:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.int64), empty, empty, empty
+
+    # Segment lengths in metres; the joins between consecutive lines get zero
+    # length so one global cumulative distance serves every line
+    x, y = vertices[:, 0], vertices[:, 1]
+    mid_y = 0.5 * (y[1:] + y[:-1])
+    sx, sy = _metric_scale(x[1:], mid_y, crs)
+    seg = np.hypot(np.diff(x) * sx, np.diff(y) * sy)
+    last = starts + counts - 1
+    seg[last[:-1]] = 0.0
+    cumulative = np.r_[0.0, np.cumsum(seg)]
+    lengths = cumulative[last] - cumulative[starts]
+
+    if spacing_m is not None:
+        per_line = np.floor(lengths / spacing_m).astype(np.int64) + 1
+    else:
+        per_line = np.full(n_lines, int(points), dtype=np.int64)
+    line_index = np.repeat(np.arange(n_lines), per_line)
+    first = np.r_[0, np.cumsum(per_line)[:-1]]
+    k = np.arange(line_index.size) - np.repeat(first, per_line)
+    if spacing_m is not None:
+        distance = k * float(spacing_m)
+    else:
+        distance = k * np.repeat(lengths / np.maximum(per_line - 1, 1), per_line)
+
+    # Locate each sample's segment, kept inside its own line
+    target = cumulative[starts][line_index] + distance
+    segment = np.searchsorted(cumulative, target, side='right') - 1
+    segment = np.clip(segment, starts[line_index], last[line_index] - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.where(seg[segment] > 0, (target - cumulative[segment]) / seg[segment], 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    xs = x[segment] + t * (x[segment + 1] - x[segment])
+    ys = y[segment] + t * (y[segment + 1] - y[segment])
+    return line_index, distance, xs, ys
+
+
+def _pixel_coordinates(transform, xs, ys):
+    """Fractional (row, col), integers at pixel centres"""
+    inverse = ~transform
+    cols = inverse.a * xs + inverse.b * ys + inverse.c - 0.5
+    rows = inverse.d * xs + inverse.e * ys + inverse.f - 0.5
+    return rows, cols
+
+
+def bilinear_gather(values, rows, cols, row_off=0, col_off=0, height=None, width=None):
+    """
+    Bilinear interpolation of values at fractional pixel positions
+
+    values may be a window of a larger raster starting at (row_off,
+    col_off); height / width give the full raster size so points outside it
+    are NaN. NaN neighbours propagate.
+    """
+    height = values.shape[0] + row_off if height is None else height
+    width = values.shape[1] + col_off if width is None else width
+    inside = (rows >= -0.5) & (rows <= height - 0.5) & (cols >= -0.5) & (cols <= width - 0.5)
+
+    r = np.clip(rows, 0, height - 1)
+    c = np.clip(cols, 0, width - 1)
+    r0 = np.minimum(np.floor(r), max(height - 2, 0)).astype(np.int64)
+    c0 = np.minimum(np.floor(c), max(width - 2, 0)).astype(np.int64)
+    fy, fx = r - r0, c - c0
+    r1 = np.minimum(r0 + 1, height - 1) - row_off
+    c1 = np.minimum(c0 + 1, width - 1) - col_off
+    r0 -= row_off
+    c0 -= col_off
+
+    result = ((values[r0, c0] * (1 - fx) + values[r0, c1] * fx) * (1 - fy)
+              + (values[r1, c0] * (1 - fx) + values[r1, c1] * fx) * fy)
+    return np.where(inside, result, np.nan)
+
+
+def sample_dem(dem, xs, ys, crs=None, transform=None, dem_crs=None, nodata=None):
+    """
+    Bilinear DEM elevations at map coordinates
+
+    A GeoTIFF is read once, over the bounding window of all the points; an
+    in-memory array needs its transform (and CRS if it differs from crs).
+
+    Args:
+        dem: GeoTIFF path or 2D array
+        xs, ys: Point coordinates in crs
+        crs: CRS of the points (default: the DEM's)
+        transform, dem_crs: Georeferencing of an array DEM
+        nodata: Raw values treated as nodata (paths only)
+
+    Returns:
+        float64 elevations, NaN outside the DEM or on nodata
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    reader = None
+    if not isinstance(dem, np.ndarray):
+        reader = BandReader({'dem': dem}, nodata=nodata, dtype=np.float64)
+        transform, dem_crs = reader.transform, reader.crs
+        height, width = reader.shape
+    else:
+        height, width = dem.shape
+    try:
+        if crs is not None and dem_crs is not None and CRS.from_user_input(crs) != CRS.from_user_input(dem_crs):
+            xs, ys = Transformer.from_crs(CRS.from_user_input(crs), CRS.from_user_input(dem_crs),
+                                          always_xy=True).transform(xs, ys)
+        rows, cols = _pixel_coordinates(transform, xs, ys)
+        rows = np.where(np.isfinite(rows), rows, -1.0)
+        cols = np.where(np.isfinite(cols), cols, -1.0)
+        if not len(rows):
+            return np.empty(0)
+
+        # Bounding window of every sample's four (edge-clamped) neighbours
+        r = np.clip(rows, 0, height - 1)
+        c = np.clip(cols, 0, width - 1)
+        row0 = int(min(np.floor(r.min()), max(height - 2, 0)))
+        col0 = int(min(np.floor(c.min()), max(width - 2, 0)))
+        row1 = int(min(np.floor(r.max()) + 2, height))
+        col1 = int(min(np.floor(c.max()) + 2, width))
+        if reader is not None:
+            values = reader.read(Window(col0, row0, col1 - col0, row1 - row0))['dem']
+        else:
+            values = np.asarray(dem[row0:row1, col0:col1], dtype=np.float64)
+        return bilinear_gather(values, rows, cols, row0, col0, height, width)
+    finally:
+        if reader is not None:
+            reader.close()
+
+
+def profile_table(line_index, distance, baseline, current, mine_ids, profile_ids,
+                  water_margin_m=5.0):
+    """
+    Assemble sampled elevations into the mining_elevation_profiles.csv layout
+
+    Slope is the signed along-profile gradient of the current surface (0 at
+    the first point); stability classes use the terrain thresholds on its
+    magnitude. Water accumulation is 'High' within water_margin_m of the
+    lowest current elevation on the profile.
+    """
+    n_points = len(line_index)
+    starts = np.flatnonzero(np.r_[True, line_index[1:] != line_index[:-1]]) if n_points else np.empty(0, int)
+    first = np.zeros(n_points, dtype=bool)
+    first[starts] = True
+
+    slope = np.zeros(n_points)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        step = np.degrees(np.arctan(np.diff(current) / np.diff(distance)))
+    slope[1:] = np.where(first[1:], 0.0, step)
+
+    codes = stability_classes(np.abs(slope))
+    stability = np.array([None, *STABILITY_CLASSES], dtype=object)[codes]
+
+    low = np.zeros(n_points, dtype=bool)
+    if n_points:
+        # fmin ignores NaN (nodata) samples when finding each profile's floor
+        floor = np.fmin.reduceat(current, starts)
+        with np.errstate(invalid='ignore'):
+            low = current < np.repeat(floor, np.diff(np.r_[starts, n_points])) + water_margin_m
+
+    mine_ids = np.asarray(mine_ids, dtype=object)
+    profile_ids = np.asarray(profile_ids, dtype=object)
+    return pd.DataFrame({
+        'mine_id': mine_ids[line_index],
+        'profile_id': profile_ids[line_index],
+        'point_number': np.arange(n_points) - np.repeat(starts, np.diff(np.r_[starts, n_points])),
+        'distance_from_start_m': distance,
+        'baseline_elevation_m': baseline,
+        'current_elevation_m': current,
+        'elevation_difference_m': baseline - current,
+        'slope_degree': slope,
+        'slope_stability': stability,
+        'water_accumulation_potential': np.where(low, 'High', 'Low'),
+    }, columns=PROFILE_COLUMNS)
+
+
+def sample_profiles(lines, baseline_dem, current_dem, mine_ids=None, profile_ids=None,
+                    crs=None, points=100, spacing_m=None, transform=None, dem_crs=None,
+                    nodata=None, water_margin_m=5.0):
+    """
+    Baseline / current elevation profiles along many lines
+
+    Args:
+        lines: Polylines, as for densify_lines
+        baseline_dem, current_dem: GeoTIFF paths or arrays (arrays share
+            transform and dem_crs); the two DEMs may be on different grids
+        mine_ids, profile_ids: One per line (default: LINE-00001, ...)
+        crs: CRS of the line coordinates (default: the current DEM's)
+        points, spacing_m: Sampling along each line (see densify_lines)
+        nodata: DEM nodata values (paths only), e.g. (0, 65535)
+        water_margin_m: Height above the profile floor still counted as
+            ponding ground
+
+    Returns:
+        DataFrame with PROFILE_COLUMNS
+    """
+    if crs is None:
+        if isinstance(current_dem, np.ndarray):
+            crs = dem_crs
+        else:
+            with BandReader({'dem': current_dem}) as reader:
+                crs = reader.crs
+
+    line_index, distance, xs, ys = densify_lines(lines, crs, points=points, spacing_m=spacing_m)
+    n_lines = int(line_index.max()) + 1 if len(line_index) else 0
+    if profile_ids is None:
+        profile_ids = [f'LINE-{i + 1:05d}' for i in range(n_lines)]
+    if mine_ids is None:
+        mine_ids = profile_ids
+
+    baseline = sample_dem(baseline_dem, xs, ys, crs, transform, dem_crs, nodata)
+    current = sample_dem(current_dem, xs, ys, crs, transform, dem_crs, nodata)
+    return profile_table(line_index, distance, baseline, current, mine_ids, profile_ids,
+                         water_margin_m=water_margin_m)
+
+
+def pit_transects(stats, crs, bearings=(90.0, 0.0), length_m=None, min_length_m=200.0,
+                  extent_factor=2.0, mine_ids=None):
+    """
+    Straight transects through the centroid of every pit
+
+    Args:
+        stats: pit_statistics output (centroid_x/y and min/max_x/y)
+        crs: CRS of the pit coordinates
+        bearings: Line directions in degrees clockwise from north; one
+                  profile per bearing and pit (default: east-west, north-south)
+        length_m: Fixed transect length, or None for extent_factor times the
+                  pit's larger bounding-box side (at least min_length_m), so
+                  the line reaches undisturbed ground on both rims
+        mine_ids: Per-pit ids (default: stats['mine_id'] or PIT-00001, ...)
+
+    Returns:
+        (lines, mine_ids, profile_ids) with lines an (n_pits * n_bearings, 2, 2)
+        array, ready for sample_profiles
+    """
+    cx = stats['centroid_x'].to_numpy(dtype=np.float64)
+    cy = stats['centroid_y'].to_numpy(dtype=np.float64)
+    sx, sy = _metric_scale(cx, cy, crs)
+    if length_m is None:
+        width_m = (stats['max_x'].to_numpy() - stats['min_x'].to_numpy()) * sx
+        height_m = (stats['max_y'].to_numpy() - stats['min_y'].to_numpy()) * sy
+        length = np.maximum(extent_factor * np.maximum(width_m, height_m), min_length_m)
+    else:
+        length = np.full(len(cx), float(length_m))
+
+    if mine_ids is None:
+        mine_ids = (stats['mine_id'].to_numpy(dtype=object) if 'mine_id' in stats
+                    else np.array([f'PIT-{p:05d}' for p in stats['pit_id']], dtype=object))
+    mine_ids = np.asarray(mine_ids, dtype=object)
+
+    bearing = np.radians(np.asarray(bearings, dtype=np.float64))
+    # Half-line offsets in CRS units, shape (pits, bearings)
+    half_x = 0.5 * length[:, None] * np.sin(bearing)[None, :] / sx[:, None]
+    half_y = 0.5 * length[:, None] * np.cos(bearing)[None, :] / sy[:, None]
+    lines = np.stack([
+        np.stack([cx[:, None] - half_x, cy[:, None] - half_y], axis=-1),
+        np.stack([cx[:, None] + half_x, cy[:, None] + half_y], axis=-1),
+    ], axis=2).reshape(-1, 2, 2)
+
+    n_bearings = len(bearing)
+    line_mines = np.repeat(mine_ids, n_bearings)
+    suffix = np.tile([f'_PROFILE_{b + 1:03d}' for b in range(n_bearings)], len(mine_ids))
+    profile_ids = np.array([m + s for m, s in zip(line_mines.astype(str), suffix)], dtype=object)
+    return lines, line_mines, profile_ids
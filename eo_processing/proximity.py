@@ -0,0 +1,230 @@
+"""
+Proximity of mined pits to water, forest and habitation
+Water comes from an NDWI threshold on the scene's own Sentinel-2 bands;
+forest and habitation are rasterized from vector layers. Each feature mask
+gets one exact Euclidean distance transform per scene, cached by mask
+content, and every pit's minimum distance to every layer is a single
+sorted reduceat over the labeled pixels.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import ndimage
+
+from .band_reader import L2A_SCALE, BandReader
+from .grid import mean_pixel_size_m
+from .indices import IndexEngine
+from .lease import LeaseMaskCache
+
+# Column names shared with mining_entities.csv
+PROXIMITY_COLUMNS = {
+    'water': 'distance_water_body_km',
+    'forest': 'distance_forest_km',
+    'habitation': 'distance_habitation_km',
+}
+
+
+def water_mask(b03, b08, threshold=0.0):
+    """
+    Open water from NDWI = (B03 - B08) / (B03 + B08)
+
+    Args:
+        b03, b08: Green and NIR reflectance on the same grid
+        threshold: NDWI above which a pixel is water
+
+    Returns:
+        Boolean mask (NaN pixels are not water)
+    """
+    ndwi = IndexEngine(['NDWI']).compute({'B03': b03, 'B08': b08})['NDWI']
+    return ndwi > threshold
+
+
+def water_mask_from_paths(b03_path, b08_path, threshold=0.0, scale=L2A_SCALE, block_shape=None):
+    """
+    NDWI water mask streamed block by block from the band files
+
+    Returns:
+        (mask, transform, crs)
+    """
+    with BandReader({'B03': b03_path, 'B08': b08_path}, scale=scale) as reader:
+        ndwi = IndexEngine(['NDWI']).compute_raster(reader, block_shape=block_shape)['NDWI']
+        return ndwi > threshold, reader.transform, reader.crs
+
+
+def mask_digest(mask):
+    """Content digest of a boolean mask (shape included)"""
+    packed = np.packbits(np.ascontiguousarray(mask, dtype=bool))
+    digest = hashlib.sha1(packed.tobytes())
+    digest.update(repr(np.shape(mask)).encode())
+    return digest.hexdigest()
+
+
+class DistanceCache:
+    """
+    Euclidean distance-to-feature rasters keyed by (mask content, pixel size)
+
+    Distances are float32 metres. They live in an in-memory LRU and, when
+    cache_dir is set, as .npy files memory-mapped by later runs, so each
+    scene's water / forest / habitation transform is computed once.
+
+    Example:
+        cache = DistanceCache(cache_dir='cache/distance')
+        to_water = cache.get(water, profile['transform'], profile['crs'])
+    """
+
+    def __init__(self, cache_dir=None, max_items=16):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(mask, sampling):
+        parts = [mask_digest(mask), repr(tuple(round(s, 6) for s in sampling))]
+        return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npy')
+
+    def get(self, mask, transform, crs):
+        """
+        Distance in metres from every pixel to the nearest True pixel of mask
+
+        Pixel spacing is the scene-average ground size; on geographic grids
+        the east-west spacing changes by well under 1% across an AOI. An
+        empty mask gives +inf everywhere.
+
+        Returns:
+            Read-only float32 array
+        """
+        mask = np.asarray(mask, dtype=bool)
+        sampling = mean_pixel_size_m(transform, crs, mask.shape[0])
+        key = self.make_key(mask, sampling)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if self.cache_dir and os.path.exists(self._disk_path(key)):
+            distance = np.load(self._disk_path(key), mmap_mode='r')
+            self.hits += 1
+        else:
+            self.misses += 1
+            distance = distance_to_feature(mask, sampling)
+            distance.flags.writeable = False
+            if self.cache_dir:
+                tmp = self._disk_path(key) + '.tmp.npy'
+                np.save(tmp, distance)
+                os.replace(tmp, self._disk_path(key))
+
+        self._memory[key] = distance
+        if len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+        return distance
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def distance_to_feature(mask, sampling):
+    """Exact EDT (metres, float32) from every pixel to the nearest feature pixel"""
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return np.full(mask.shape, np.inf, dtype=np.float32)
+    distance = ndimage.distance_transform_edt(~mask, sampling=sampling)
+    return distance.astype(np.float32)
+
+
+def pit_min_distances(labels, n_pits, distances):
+    """
+    Minimum of each distance raster over each pit
+
+    The labeled pixels are sorted once; all layers are then reduced with a
+    single np.minimum.reduceat over the stacked, gathered values.
+
+    Args:
+        labels: Pit label image (0 = background)
+        n_pits: Number of labels
+        distances: Mapping of name -> distance raster on the labels' grid
+
+    Returns:
+        Dict of name -> float64 array of length n_pits (NaN for empty labels)
+    """
+    names = list(distances)
+    flat = np.asarray(labels).ravel()
+    pixels = np.flatnonzero(flat)
+    order = pixels[np.argsort(flat[pixels], kind='stable')]
+    sorted_labels = flat[order]
+
+    result = {name: np.full(n_pits, np.nan) for name in names}
+    if not len(order) or not names:
+        return result
+
+    stacked = np.stack([np.asarray(distances[name]).ravel()[order] for name in names])
+    starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+    minima = np.minimum.reduceat(stacked, starts, axis=1)
+    present = sorted_labels[starts] - 1
+    for i, name in enumerate(names):
+        result[name][present] = minima[i]
+    return result
+
+
+def scene_distance_layers(transform, crs, shape, water=None, forest=None, habitation=None,
+                          distance_cache=None, feature_cache=None):
+    """
+    Distance rasters for the proximity layers available for a scene
+
+    Args:
+        transform, crs, shape: Scene grid
+        water: Boolean water mask on the grid (e.g. from water_mask)
+        forest, habitation: Boolean masks, or vector layers (GeoDataFrame /
+            GeoSeries / shapely list) rasterized with all_touched so thin
+            roads, villages and point settlements are kept
+        distance_cache: DistanceCache (a private one when None)
+        feature_cache: LeaseMaskCache used for the vector rasterization
+
+    Returns:
+        Dict of layer name ('water', 'forest', 'habitation') -> metres
+    """
+    distance_cache = distance_cache or DistanceCache()
+    feature_cache = feature_cache or LeaseMaskCache()
+    layers = {}
+    for name, source in (('water', water), ('forest', forest), ('habitation', habitation)):
+        if source is None:
+            continue
+        if isinstance(source, np.ndarray):
+            mask = source
+        else:
+            mask = feature_cache.get(source, transform, shape, crs=crs, all_touched=True)
+        if mask.shape != tuple(shape):
+            raise ValueError(f"{name} mask shape {mask.shape} does not match the scene {tuple(shape)}")
+        layers[name] = distance_cache.get(mask, transform, crs)
+    return layers
+
+
+def pit_proximity(labels, n_pits, distance_layers):
+    """
+    Per-pit minimum distance to every proximity layer, in kilometres
+
+    Args:
+        labels, n_pits: From label_pits
+        distance_layers: Output of scene_distance_layers
+
+    Returns:
+        DataFrame: pit_id plus one PROXIMITY_COLUMNS column per layer
+    """
+    minima = pit_min_distances(labels, n_pits, distance_layers)
+    table = pd.DataFrame({'pit_id': np.arange(1, n_pits + 1, dtype=np.int32)})
+    for name, metres in minima.items():
+        table[PROXIMITY_COLUMNS.get(name, f'distance_{name}_km')] = metres / 1000.0
+    return table
@@ -0,0 +1,187 @@
+"""
+Sentinel-1 SAR processing: dB conversion, Lee speckle filtering, change maps
+VV / VH backscatter is streamed block by block, despeckled with a Lee
+filter whose local statistics come from uniform_filter (O(1) per pixel for
+any window), converted to dB in place, and turned into a VV-VH ratio and
+log-ratio change masks in the same uint8 format as the optical change mask.
+"""
+
+import numpy as np
+from scipy import ndimage
+
+from .band_reader import BandReader, pad_window
+from .cog import write_products
+from .morphology import DEFAULT_TILE_SHAPE, clean_mask, clean_mask_tiled
+
+# EO Browser "Raw" Sentinel-1 exports store linear gamma0 scaled to uint16
+S1_RAW_SCALE = 65535.0
+
+# Equivalent number of looks of Sentinel-1 IW GRD high-resolution products
+S1_IW_GRD_ENL = 4.4
+
+# COG overview resampling per product; anything else is continuous (dB)
+SAR_PRODUCT_KINDS = {'change': 'mask'}
+
+# Floor applied before taking the log so zero backscatter stays finite (-60 dB)
+DB_FLOOR = 1e-6
+
+
+def to_db(linear, out=None):
+    """
+    10 * log10(linear), in place when out is linear
+
+    NaN (nodata) stays NaN; zeros and negatives are floored at DB_FLOOR.
+    """
+    out = np.empty_like(linear, dtype=np.result_type(linear, np.float32)) if out is None else out
+    np.fmax(linear, DB_FLOOR, out=out)
+    np.log10(out, out=out)
+    out *= 10.0
+    return out
+
+
+def from_db(db, out=None):
+    """Inverse of to_db: 10 ** (db / 10)"""
+    out = np.empty_like(db, dtype=np.result_type(db, np.float32)) if out is None else out
+    np.divide(db, 10.0, out=out)
+    np.power(10.0, out, out=out)
+    return out
+
+
+def lee_filter(intensity, size=7, looks=S1_IW_GRD_ENL):
+    """
+    Lee speckle filter on linear intensity
+
+    out = mean + w * (x - mean), w = clip(1 - Cu^2 / Ci^2, 0, 1), where Ci is
+    the local coefficient of variation and Cu = 1 / sqrt(looks) that of pure
+    speckle. Local means come from uniform_filter, so the cost per pixel
+    does not depend on the window size. NaN pixels are excluded from the
+    statistics and stay NaN.
+
+    Args:
+        intensity: 2D linear backscatter (not dB)
+        size: Odd window size in pixels
+        looks: Equivalent number of looks of the product
+
+    Returns:
+        float32 array
+    """
+    x = np.asarray(intensity, dtype=np.float32)
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x, 0.0).astype(np.float32)
+
+    weight = ndimage.uniform_filter(valid.astype(np.float32), size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = ndimage.uniform_filter(filled, size) / weight
+        mean_sq = ndimage.uniform_filter(filled * filled, size) / weight
+        variance = np.maximum(mean_sq - mean * mean, 0.0)
+        ci2 = variance / (mean * mean)
+        w = np.clip(1.0 - (1.0 / looks) / ci2, 0.0, 1.0)
+    w[~np.isfinite(w)] = 0.0
+
+    out = mean + w * (filled - mean)
+    out[~valid] = np.nan
+    return out.astype(np.float32, copy=False)
+
+
+def filter_halo(size):
+    """Pixels of context a size x size window needs around a block"""
+    return size // 2
+
+
+def read_backscatter(vv_path, vh_path, scale=S1_RAW_SCALE, nodata=(0,), size=7,
+                     looks=S1_IW_GRD_ENL, block_shape=(512, 512), db=True):
+    """
+    Stream VV / VH, despeckle each block with its halo and convert to dB
+
+    Blocks are read with a filter_halo(size) margin, filtered, and only their
+    core is kept, so the result equals filtering the whole scene at once.
+
+    Args:
+        vv_path, vh_path: Co-registered VV and VH GeoTIFFs (linear)
+        scale: Divisor from stored values to linear backscatter
+        nodata: Raw values treated as nodata (NaN)
+        size: Lee window size, or None to skip filtering
+        looks: Equivalent number of looks
+        block_shape: Target block size (aligned to the files' internal blocks)
+        db: Convert to dB (in place) after filtering
+
+    Returns:
+        (bands, profile) where bands maps 'VV', 'VH' -> float32 arrays
+    """
+    with BandReader({'VV': vv_path, 'VH': vh_path}, scale=scale, nodata=nodata) as reader:
+        out = {name: np.empty(reader.shape, dtype=np.float32) for name in ('VV', 'VH')}
+        halo = filter_halo(size) if size else 0
+        for window in reader.block_windows(block_shape):
+            padded, core = pad_window(window, halo, reader.height, reader.width)
+            bands = reader.read(padded)
+            rows = slice(int(window.row_off), int(window.row_off + window.height))
+            cols = slice(int(window.col_off), int(window.col_off + window.width))
+            for name, block in bands.items():
+                if size:
+                    block = lee_filter(block, size, looks)
+                target = out[name][rows, cols]
+                target[...] = block[core]
+                if db:
+                    to_db(target, out=target)
+        profile = reader.profile.copy()
+    profile.update(count=1, dtype='float32', nodata=np.nan)
+    return out, profile
+
+
+def polarization_ratio(vv_db, vh_db, out=None):
+    """VV/VH ratio in dB (VV_dB - VH_dB); high over bare soil and spoil"""
+    return np.subtract(vv_db, vh_db, out=out)
+
+
+def log_ratio(before_db, after_db, out=None):
+    """Log-ratio change 10 * log10(after / before), i.e. the dB difference"""
+    return np.subtract(after_db, before_db, out=out)
+
+
+def sar_change_mask(before_db, after_db, threshold_db=3.0, direction='both',
+                    min_area_pixels=100, tile_shape=DEFAULT_TILE_SHAPE, workers=None):
+    """
+    Backscatter change mask between two dates
+
+    Thresholds the log-ratio and cleans it with the same closing, opening
+    and small-object removal as compute_change_mask, so the two masks can
+    be OR-ed or compared pixel for pixel.
+
+    Args:
+        before_db, after_db: Despeckled backscatter in dB (same grid)
+        threshold_db: Minimum absolute change
+        direction: 'increase', 'decrease' or 'both'
+        min_area_pixels, tile_shape, workers: As for compute_change_mask
+
+    Returns:
+        uint8 mask (1 = change)
+    """
+    change = log_ratio(before_db, after_db)
+    with np.errstate(invalid='ignore'):
+        if direction == 'increase':
+            mask = change > threshold_db
+        elif direction == 'decrease':
+            mask = change < -threshold_db
+        elif direction == 'both':
+            mask = np.abs(change) > threshold_db
+        else:
+            raise ValueError(f"direction must be 'increase', 'decrease' or 'both', got {direction!r}")
+
+    if tile_shape is None or (mask.shape[0] <= tile_shape[0] and mask.shape[1] <= tile_shape[1]):
+        cleaned = clean_mask(mask, min_area_pixels=min_area_pixels)
+    else:
+        cleaned = clean_mask_tiled(mask, min_area_pixels=min_area_pixels,
+                                   tile_shape=tile_shape, workers=workers)
+    return cleaned.astype(np.uint8)
+
+
+def write_sar_products(products, profile, out_dir, prefix='s1'):
+    """
+    Write SAR products (e.g. VV, VH, ratio, change) as COGs <prefix>_<name>.tif
+
+    'change' masks get mode overviews, backscatter layers averaged ones.
+
+    Returns:
+        Dict of product name -> path
+    """
+    return write_products(products, profile, out_dir, prefix, kinds=SAR_PRODUCT_KINDS)
@@ -0,0 +1,194 @@
+"""
+Histogram-based contrast stretch for quick-look rendering
+Replaces the notebooks' normalize() (np.percentile on a float64 copy of every
+band) with fixed-bin histograms built in one streaming pass, and writes the
+stretched, gamma-corrected result straight into a uint8 RGB buffer.
+"""
+
+import numpy as np
+
+from .indices import DEFAULT_CHUNK_PIXELS
+
+# 4096 bins resolve the 2/98 cut points to 1/4096 of the band's range
+DEFAULT_BINS = 4096
+
+# Entries in the stretch + gamma lookup table
+LUT_SIZE = 4096
+
+
+def _row_chunks(rows, cols, chunk_pixels=DEFAULT_CHUNK_PIXELS):
+    step = max(1, chunk_pixels // max(cols, 1))
+    for row in range(0, rows, step):
+        yield row, min(row + step, rows)
+
+
+class BandHistogram:
+    """
+    Fixed-bin histogram that accumulates block by block
+
+    Example:
+        hist = BandHistogram(value_range=(0.0, 1.0))
+        for window, bands in reader.iter_blocks(bands=['B04']):
+            hist.update(bands['B04'])
+        p2, p98 = hist.percentiles((2, 98))
+    """
+
+    def __init__(self, value_range, bins=DEFAULT_BINS):
+        self.low, self.high = float(value_range[0]), float(value_range[1])
+        if not self.high > self.low:
+            self.high = self.low + 1.0
+        self.bins = int(bins)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+
+    def update(self, values):
+        """Add every finite value (NaNs are ignored, outliers clip to the end bins)"""
+        values = np.asarray(values)
+        if values.ndim == 1:
+            values = values[np.newaxis, :]
+        rows, cols = values.shape
+        scale = np.float32(self.bins / (self.high - self.low))
+        scratch = np.empty(min(rows, max(1, DEFAULT_CHUNK_PIXELS // max(cols, 1))) * cols,
+                           dtype=np.float32)
+
+        for row, stop in _row_chunks(rows, cols):
+            chunk = values[row:stop]
+            buf = scratch[:chunk.size].reshape(chunk.shape)
+            np.subtract(chunk, np.float32(self.low), out=buf, casting='unsafe')
+            buf *= scale
+            finite = buf[np.isfinite(buf)]
+            np.clip(finite, 0, self.bins - 1, out=finite)
+            self.counts += np.bincount(finite.astype(np.intp), minlength=self.bins)
+        return self
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def percentiles(self, q):
+        """
+        Approximate np.percentile(values, q)
+
+        Linear interpolation inside the bin holding each rank, so the error
+        is bounded by one bin width.
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        total = self.total
+        if total == 0:
+            return np.full(q.shape, np.nan)
+
+        cumulative = np.cumsum(self.counts)
+        target = q / 100.0 * (total - 1)
+        b = np.searchsorted(cumulative, target, side='right')
+        b = np.clip(b, 0, self.bins - 1)
+        before = np.where(b > 0, cumulative[b - 1], 0)
+        in_bin = np.maximum(self.counts[b], 1)
+        width = (self.high - self.low) / self.bins
+        return self.low + (b + (target - before + 0.5) / in_bin) * width
+
+
+def approximate_percentiles(band, percentiles=(2, 98), bins=DEFAULT_BINS, stride=1):
+    """
+    Percentiles of a band from a histogram over an optional strided subsample
+
+    Args:
+        band: 2D array (NaNs ignored)
+        percentiles: Percentiles to return
+        bins: Histogram bins between the subsample's min and max
+        stride: Use every stride-th row and column (a view, no copy);
+                4 is plenty for a quick look at a full tile
+
+    Returns:
+        float64 array of cut points
+    """
+    sample = np.asarray(band)[::stride, ::stride]
+    low, high = np.nanmin(sample), np.nanmax(sample)
+    if not np.isfinite(low):
+        return np.full(len(percentiles), np.nan)
+    return BandHistogram((low, high), bins=bins).update(sample).percentiles(percentiles)
+
+
+def stretch_lut(gamma=1.0, size=LUT_SIZE):
+    """uint8 lookup table for a linear 0-1 stretch followed by x ** (1 / gamma)"""
+    ramp = np.linspace(0.0, 1.0, size)
+    return np.round(255.0 * ramp ** (1.0 / gamma)).astype(np.uint8)
+
+
+def stretch_to_uint8(band, low, high, gamma=1.0, out=None, lut=None):
+    """
+    Stretch [low, high] to 0-255 with gamma, chunk by chunk
+
+    Args:
+        band: 2D array
+        low, high: Cut points (values outside are clipped)
+        gamma: Display gamma, as in the notebooks' rgb ** (1 / gamma)
+        out: Optional uint8 2D array or view (e.g. rgb[..., 0]) to fill
+        lut: Optional precomputed stretch_lut(gamma)
+
+    Returns:
+        uint8 array; NaN pixels are 0
+    """
+    band = np.asarray(band)
+    rows, cols = band.shape
+    if out is None:
+        out = np.empty((rows, cols), dtype=np.uint8)
+    if lut is None:
+        lut = stretch_lut(gamma)
+
+    span = float(high) - float(low)
+    scale = np.float32((lut.size - 1) / span) if span > 0 else np.float32(0)
+    scratch = np.empty(min(rows, max(1, DEFAULT_CHUNK_PIXELS // max(cols, 1))) * cols,
+                       dtype=np.float32)
+
+    for row, stop in _row_chunks(rows, cols):
+        chunk = band[row:stop]
+        buf = scratch[:chunk.size].reshape(chunk.shape)
+        np.subtract(chunk, np.float32(low), out=buf, casting='unsafe')
+        buf *= scale
+        buf += np.float32(0.5)
+        np.clip(buf, 0, lut.size - 1, out=buf)
+        buf[np.isnan(buf)] = 0
+        out[row:stop] = lut[buf.astype(np.intp)]
+    return out
+
+
+def rgb_composite(red, green, blue, p_low=2, p_high=98, gamma=1.0, stride=1,
+                  bins=DEFAULT_BINS, out=None):
+    """
+    Percentile-stretched RGB (or false-colour) composite as uint8
+
+    Each channel is stretched independently between its own p_low / p_high
+    cut points, like np.dstack((normalize(r), normalize(g), normalize(b))).
+
+    Args:
+        red, green, blue: 2D bands on the same grid
+        p_low, p_high: Stretch percentiles
+        gamma: Display gamma
+        stride: Histogram subsample step
+        bins: Histogram bins
+        out: Optional (rows, cols, 3) uint8 buffer to reuse between renders
+
+    Returns:
+        (rows, cols, 3) uint8 array
+    """
+    rows, cols = np.shape(red)
+    if out is None:
+        out = np.empty((rows, cols, 3), dtype=np.uint8)
+    lut = stretch_lut(gamma)
+    for channel, band in enumerate((red, green, blue)):
+        low, high = approximate_percentiles(band, (p_low, p_high), bins=bins, stride=stride)
+        stretch_to_uint8(band, low, high, out=out[..., channel], lut=lut)
+    return out
+
+
+def normalize(band, p_low=2, p_high=98, stride=1, bins=DEFAULT_BINS):
+    """
+    Drop-in for the notebooks' normalize(): float32 in [0, 1]
+
+    Prefer rgb_composite / stretch_to_uint8 for display, which skip the
+    float output entirely.
+    """
+    low, high = approximate_percentiles(band, (p_low, p_high), bins=bins, stride=stride)
+    span = high - low if high > low else 1.0
+    out = np.subtract(band, low, dtype=np.float32)
+    out /= np.float32(span)
+    return np.clip(out, 0.0, 1.0, out=out)
@@ -0,0 +1,234 @@
+"""
+Terrain derivatives: slope, aspect, hillshade and slope-stability classes
+Horn's 3x3 finite differences are evaluated as whole-array slice arithmetic
+on DEM blocks read with a 1-pixel halo, so every product is computed in the
+same streaming pass that reads the DEM and the result does not depend on
+the block size. Products are written as tiled COGs.
+"""
+
+import numpy as np
+
+from .band_reader import BandReader, pad_window
+from .cog import write_products
+from .grid import pixel_sizes_m
+
+TERRAIN_PRODUCTS = ('slope', 'aspect', 'hillshade', 'stability')
+
+# Slope-stability classes shared with mining_elevation_profiles.csv; the
+# raster stores 1 + the class index (0 = nodata)
+STABILITY_CLASSES = ('Safe', 'Moderate', 'Critical')
+STABILITY_THRESHOLDS_DEG = (15.0, 30.0)
+
+# COG overview resampling per product
+PRODUCT_KINDS = {
+    'slope': 'continuous',
+    'aspect': 'continuous',
+    'hillshade': 'continuous',
+    'stability': 'categorical',
+}
+
+# Horn's method needs one pixel of context on every side
+TERRAIN_HALO = 1
+
+
+def horn_gradient(padded, dx, dy, z_factor=1.0):
+    """
+    Horn (1981) surface gradient of the core of a padded block
+
+    Args:
+        padded: 2D elevations with one extra pixel on every side
+        dx, dy: Ground pixel size in metres, scalars or per-row arrays
+                (one value per core row, for geographic grids)
+        z_factor: Vertical exaggeration / unit conversion
+
+    Returns:
+        (dz_dx, dz_dy) float32 arrays of the core shape; x grows east and
+        y grows down the rows (south), NaN wherever the 3x3 window has NaN
+    """
+    z = np.asarray(padded, dtype=np.float32)
+    dx = np.asarray(dx, dtype=np.float32).reshape(-1, 1) if np.ndim(dx) else np.float32(dx)
+    dy = np.asarray(dy, dtype=np.float32).reshape(-1, 1) if np.ndim(dy) else np.float32(dy)
+    # Horn's kernels are separable: a [-1, 0, 1] difference along one axis
+    # smoothed with [1, 2, 1] along the other
+    diff = z[:, 2:] - z[:, :-2]
+    dz_dx = diff[1:-1] * 2
+    dz_dx += diff[:-2]
+    dz_dx += diff[2:]
+    dz_dx *= np.float32(z_factor) / (8 * dx)
+
+    smooth = z[:, 1:-1] * 2
+    smooth += z[:, :-2]
+    smooth += z[:, 2:]
+    dz_dy = np.subtract(smooth[2:], smooth[:-2])
+    dz_dy *= np.float32(z_factor) / (8 * dy)
+    return dz_dx, dz_dy
+
+
+def slope_degrees(dz_dx, dz_dy):
+    """Slope angle in degrees from the gradient"""
+    slope = np.multiply(dz_dx, dz_dx)
+    slope += dz_dy * dz_dy
+    np.sqrt(slope, out=slope)
+    np.arctan(slope, out=slope)
+    return np.degrees(slope, out=slope)
+
+
+def aspect_degrees(dz_dx, dz_dy):
+    """
+    Downslope direction in degrees clockwise from north (GDAL convention)
+
+    Flat pixels have no aspect and are NaN.
+    """
+    # Downslope vector is -gradient: east = -dz_dx, north = +dz_dy (rows grow south)
+    aspect = np.arctan2(-dz_dx, dz_dy)
+    np.degrees(aspect, out=aspect)
+    np.add(aspect, 360.0, out=aspect, where=aspect < 0)
+    aspect[(dz_dx == 0) & (dz_dy == 0)] = np.nan
+    return aspect
+
+
+def hillshade(dz_dx, dz_dy, azimuth=315.0, altitude=45.0):
+    """
+    Lambertian hillshade, uint8 1..255 (0 = nodata)
+
+    Same illumination model as gdaldem hillshade and the notebooks'
+    LightSource(azdeg=315, altdeg=45), computed from the Horn gradient
+    instead of np.gradient on the whole DEM.
+    """
+    az, alt = np.radians(azimuth), np.radians(altitude)
+    # Surface normal (-dz/de, -dz/dn, 1) dotted with the sun vector; dz/dn = -dz_dy
+    shade = dz_dy * np.float32(np.cos(az) * np.cos(alt))
+    shade -= dz_dx * np.float32(np.sin(az) * np.cos(alt))
+    shade += np.float32(np.sin(alt))
+    norm = np.multiply(dz_dx, dz_dx)
+    norm += dz_dy * dz_dy
+    norm += 1
+    np.sqrt(norm, out=norm)
+    shade /= norm
+
+    # 1 + round(254 * clip(shade, 0, 1)); NaN gradients become 0
+    np.clip(shade, 0, 1, out=shade)
+    shade *= 254
+    shade += 1.5
+    shade[np.isnan(shade)] = 0
+    return shade.astype(np.uint8)
+
+
+def stability_classes(slope, thresholds=STABILITY_THRESHOLDS_DEG):
+    """
+    Slope-stability class codes: 1 Safe, 2 Moderate, 3 Critical, 0 nodata
+
+    STABILITY_CLASSES[code - 1] gives the label.
+    """
+    slope = np.asarray(slope)
+    codes = np.ones(slope.shape, dtype=np.uint8)
+    for threshold in thresholds:
+        codes += slope >= threshold
+    codes[np.isnan(slope)] = 0
+    return codes
+
+
+def terrain_block(padded, dx, dy, products=TERRAIN_PRODUCTS, z_factor=1.0,
+                  azimuth=315.0, altitude=45.0):
+    """
+    Requested products for the core of one padded DEM block
+
+    Returns:
+        Dict of product name -> array of the core shape
+    """
+    dz_dx, dz_dy = horn_gradient(padded, dx, dy, z_factor)
+    out = {}
+    if 'slope' in products or 'stability' in products:
+        slope = slope_degrees(dz_dx, dz_dy)
+        if 'slope' in products:
+            out['slope'] = slope
+        if 'stability' in products:
+            out['stability'] = stability_classes(slope)
+    if 'aspect' in products:
+        out['aspect'] = aspect_degrees(dz_dx, dz_dy)
+    if 'hillshade' in products:
+        out['hillshade'] = hillshade(dz_dx, dz_dy, azimuth, altitude)
+    return out
+
+
+def _edge_pad(block, core, padded_shape):
+    """Replicate edge pixels where the halo fell outside the raster"""
+    top = TERRAIN_HALO - core[0].start
+    left = TERRAIN_HALO - core[1].start
+    bottom = TERRAIN_HALO - (padded_shape[0] - core[0].stop)
+    right = TERRAIN_HALO - (padded_shape[1] - core[1].stop)
+    if top or left or bottom or right:
+        block = np.pad(block, ((top, bottom), (left, right)), mode='edge')
+    return block
+
+
+def _output_arrays(products, shape):
+    return {name: np.empty(shape, dtype=np.uint8 if name in ('hillshade', 'stability')
+                           else np.float32)
+            for name in products}
+
+
+def terrain_derivatives(dem_path, products=TERRAIN_PRODUCTS, z_factor=1.0, azimuth=315.0,
+                        altitude=45.0, block_shape=(512, 512), nodata=None):
+    """
+    Stream a DEM block by block and compute terrain products
+
+    Each block is read once with a TERRAIN_HALO margin (edge pixels are
+    replicated at the raster border), so the output equals processing the
+    whole AOI at once. Geographic DEMs use the ground pixel size of each row.
+
+    Args:
+        dem_path: DEM GeoTIFF
+        products: Subset of TERRAIN_PRODUCTS
+        z_factor: Multiplier from elevation units to metres
+        azimuth, altitude: Sun position for the hillshade, in degrees
+        block_shape: Target block size (aligned to the file's internal blocks)
+        nodata: Raw elevation values treated as nodata (default: the file's)
+
+    Returns:
+        (products, profile): dict of name -> array (slope and aspect in
+        float32 degrees, hillshade and stability as uint8) and the DEM profile
+    """
+    unknown = set(products) - set(TERRAIN_PRODUCTS)
+    if unknown:
+        raise ValueError(f"Unknown terrain products {sorted(unknown)}, expected {TERRAIN_PRODUCTS}")
+
+    with BandReader({'dem': dem_path}, nodata=nodata) as reader:
+        out = _output_arrays(products, reader.shape)
+        for window in reader.block_windows(block_shape):
+            padded, core = pad_window(window, TERRAIN_HALO, reader.height, reader.width)
+            block = _edge_pad(reader.read(padded)['dem'], core,
+                              (int(padded.height), int(padded.width)))
+            row0, rows = int(window.row_off), int(window.height)
+            dx, dy = pixel_sizes_m(reader.transform, reader.crs, rows, row_off=row0)
+            target = (slice(row0, row0 + rows),
+                      slice(int(window.col_off), int(window.col_off + window.width)))
+            for name, values in terrain_block(block, dx, dy, products, z_factor,
+                                              azimuth, altitude).items():
+                out[name][target] = values
+        profile = reader.profile.copy()
+    return out, profile
+
+
+def terrain_from_array(dem, transform, crs, products=TERRAIN_PRODUCTS, z_factor=1.0,
+                       azimuth=315.0, altitude=45.0):
+    """
+    Terrain products of an in-memory DEM (e.g. an aligned or clipped array)
+
+    Returns:
+        Dict of product name -> array, as for terrain_derivatives
+    """
+    dem = np.asarray(dem, dtype=np.float32)
+    padded = np.pad(dem, TERRAIN_HALO, mode='edge')
+    dx, dy = pixel_sizes_m(transform, crs, dem.shape[0])
+    return terrain_block(padded, dx, dy, products, z_factor, azimuth, altitude)
+
+
+def write_terrain_products(products, profile, out_dir, prefix='dem'):
+    """
+    Write terrain products as tiled COGs named <prefix>_<product>.tif
+
+    Returns:
+        Dict of product name -> path
+    """
+    return write_products(products, profile, out_dir, prefix, kinds=PRODUCT_KINDS)
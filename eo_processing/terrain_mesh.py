@@ -0,0 +1,320 @@
+"""
+Simplified terrain meshes for the 3D views
+Right-triangulated irregular network (RTIN, the Martini scheme) built with
+whole-level NumPy passes instead of per-triangle recursion. Flat terrain
+collapses into large triangles while pit walls, and optionally the mined-mask
+boundary, keep full resolution. Meshes export to Plotly Mesh3d kwargs or to
+a compact binary buffer (float32 positions, uint32 indices) for the browser.
+
+Limitation: RTIN needs a square (2^k + 1) grid, so other rasters are padded
+up to the next one and the padding is treated as nodata. The raster's right
+and bottom edges then cut across the hierarchy at arbitrary offsets, and the
+forced splits along them keep those edges at full resolution. Smooth
+non-square or non-power-of-two scenes therefore reduce about half as well as
+a 2^k + 1 square of the same terrain (and rasters just past a power of two
+pay up to 4x the error-map memory). Crop or mesh 2^k + 1 tiles when that
+matters.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .grid import mean_pixel_size_m
+
+
+def _grid_size(height, width):
+    """Smallest 2^k + 1 grid that covers the raster"""
+    size = 2
+    while size + 1 < max(height, width):
+        size *= 2
+    return size + 1
+
+
+def _gather(values, rows, cols, fill=0):
+    """values[rows, cols] on an open grid, with fill outside the array"""
+    n = values.shape[0]
+    row_ok = (rows >= 0) & (rows < n)
+    col_ok = (cols >= 0) & (cols < n)
+    out = values[np.clip(rows, 0, n - 1)[:, None], np.clip(cols, 0, n - 1)[None, :]]
+    return np.where(row_ok[:, None] & col_ok[None, :], out, fill)
+
+
+def _edge_error(heights, classes, rows, cols, a, b):
+    """Interpolation error at midpoints rows x cols of hypotenuses a-b"""
+    r, c = rows[:, None], cols[None, :]
+    ar, ac = r + a[0], c + a[1]
+    br, bc = r + b[0], c + b[1]
+    error = np.abs(heights[r, c] - 0.5 * (heights[ar, ac] + heights[br, bc]))
+    # Never interpolate across a class change (valid/nodata, mined/unmined)
+    mid = classes[r, c]
+    broken = (classes[ar, ac] != mid) | (classes[br, bc] != mid)
+    error[broken] = np.inf
+    return error
+
+
+def rtin_errors(heights, classes):
+    """
+    Martini error map of a (2^k + 1) square grid
+
+    errors[v] is the largest vertical error (or inf across a class change)
+    of every triangle whose hypotenuse midpoint is v, propagated up from the
+    finer levels so that refining any triangle also refines its neighbours
+    and the mesh stays crack-free.
+
+    Levels alternate between edge midpoints of S-squares (hypotenuse along
+    a square side, children are S/2-square centres) and S-square centres
+    (hypotenuse along a diagonal, children are the square's edge midpoints).
+    """
+    n = heights.shape[0]
+    size = n - 1
+    errors = np.zeros((n, n), dtype=np.float32)
+
+    step = 2
+    while step <= size:
+        half = step // 2
+        quarter = half // 2
+
+        # Edge midpoints: horizontal edges, then vertical edges
+        for rows, cols, a, b in (
+                (np.arange(0, n, step), np.arange(half, n, step), (0, -half), (0, half)),
+                (np.arange(half, n, step), np.arange(0, n, step), (-half, 0), (half, 0))):
+            error = _edge_error(heights, classes, rows, cols, a, b)
+            if quarter:
+                for dr in (-quarter, quarter):
+                    for dc in (-quarter, quarter):
+                        np.maximum(error, _gather(errors, rows + dr, cols + dc), out=error)
+            errors[rows[:, None], cols[None, :]] = error
+
+        # Square centres; the diagonal alternates with the square's parity
+        rows = np.arange(half, n, step)
+        cols = np.arange(half, n, step)
+        main = _edge_error(heights, classes, rows, cols, (-half, -half), (half, half))
+        anti = _edge_error(heights, classes, rows, cols, (-half, half), (half, -half))
+        parity = (np.arange(rows.size)[:, None] + np.arange(cols.size)[None, :]) % 2
+        error = np.where(parity == 0, main, anti)
+        for dr, dc in ((-half, 0), (half, 0), (0, -half), (0, half)):
+            np.maximum(error, _gather(errors, rows + dr, cols + dc), out=error)
+        errors[rows[:, None], cols[None, :]] = error
+
+        step *= 2
+    return errors
+
+
+def rtin_triangles(errors, max_error):
+    """
+    Triangles of the RTIN mesh for an error threshold
+
+    Descends the hierarchy one level per pass over all live triangles.
+
+    Returns:
+        (T, 3, 2) int32 array of (row, col) triangle corners
+    """
+    size = errors.shape[0] - 1
+    # Each triangle is (a, b, c): hypotenuse a-b, right angle at c
+    live = np.array([
+        [[0, 0], [size, size], [size, 0]],
+        [[size, size], [0, 0], [0, size]],
+    ], dtype=np.int32)
+    done = []
+
+    while live.size:
+        a, b, c = live[:, 0], live[:, 1], live[:, 2]
+        doubled = a + b
+        splittable = (doubled % 2 == 0).all(axis=1)
+        mid = doubled // 2
+        split = splittable & (errors[mid[:, 0], mid[:, 1]] > max_error)
+
+        done.append(live[~split])
+        a, b, c, mid = a[split], b[split], c[split], mid[split]
+        live = np.concatenate([np.stack([c, a, mid], axis=1),
+                               np.stack([b, c, mid], axis=1)])
+    return np.concatenate(done)
+
+
+class TerrainMesh:
+    """
+    Simplified terrain mesh with per-vertex mined flags
+
+    Attributes:
+        vertices: (V, 3) float32 positions in scene-local metres (x east,
+                  y north, z elevation) relative to the raster's top-left
+        triangles: (T, 3) uint32 vertex indices, counter-clockwise seen from
+                   above
+        mined: (V,) uint8, 1 where the mined mask is set
+        rows, cols: (V,) int32 raster indices of each vertex
+        transform, crs: Georeferencing of the source raster
+        max_error: Split threshold used (metres); see build_terrain_mesh
+    """
+
+    def __init__(self, vertices, triangles, mined, rows, cols, transform, crs, max_error,
+                 grid_vertices):
+        self.vertices = vertices
+        self.triangles = triangles
+        self.mined = mined
+        self.rows = rows
+        self.cols = cols
+        self.transform = transform
+        self.crs = crs
+        self.max_error = max_error
+        self.grid_vertices = grid_vertices
+
+    @property
+    def reduction(self):
+        """Full-grid vertex count divided by the mesh vertex count"""
+        return self.grid_vertices / max(len(self.vertices), 1)
+
+    def map_coordinates(self):
+        """(x, y) of each vertex in the raster CRS"""
+        x = self.transform.c + self.transform.a * self.cols
+        y = self.transform.f + self.transform.e * self.rows
+        return x, y
+
+    def mesh3d_kwargs(self, map_coordinates=True, **kwargs):
+        """
+        Keyword arguments for plotly.graph_objects.Mesh3d
+
+        Example:
+            fig = go.Figure(go.Mesh3d(**mesh.mesh3d_kwargs(colorscale='earth')))
+        """
+        if map_coordinates:
+            x, y = self.map_coordinates()
+        else:
+            x, y = self.vertices[:, 0], self.vertices[:, 1]
+        z = self.vertices[:, 2]
+        params = {
+            'x': x, 'y': y, 'z': z,
+            'i': self.triangles[:, 0], 'j': self.triangles[:, 1], 'k': self.triangles[:, 2],
+            'intensity': z,
+        }
+        params.update(kwargs)
+        return params
+
+    def mined_mesh3d_kwargs(self, **kwargs):
+        """Mesh3d kwargs for the triangles whose vertices are all mined"""
+        keep = self.mined[self.triangles].all(axis=1)
+        params = self.mesh3d_kwargs(**kwargs)
+        triangles = self.triangles[keep]
+        params.update(i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2])
+        params.pop('intensity', None)
+        return params
+
+    def write(self, path):
+        """
+        Write <path>.json (header) and <path>.bin (buffers)
+
+        The .bin holds little-endian positions (float32 x, y, z per vertex),
+        indices (uint32) and mined flags (uint8) at the byte offsets given in
+        the header, ready for new Float32Array(buffer, offset, count) in the
+        browser. split_threshold_m records max_error, which is a split
+        threshold rather than a bound on the surface error.
+        """
+        buffers = [
+            ('positions', self.vertices.astype('<f4', copy=False)),
+            ('indices', self.triangles.astype('<u4', copy=False)),
+            ('mined', self.mined.astype('u1', copy=False)),
+        ]
+        header = {
+            'vertex_count': int(len(self.vertices)),
+            'triangle_count': int(len(self.triangles)),
+            'split_threshold_m': float(self.max_error),
+            'transform': list(self.transform)[:6],
+            'crs': self.crs.to_string() if self.crs else None,
+            'bounds_local_m': {
+                'min': self.vertices.min(axis=0).tolist() if len(self.vertices) else None,
+                'max': self.vertices.max(axis=0).tolist() if len(self.vertices) else None,
+            },
+            'buffers': {},
+        }
+
+        offset = 0
+        with open(f'{path}.bin', 'wb') as f:
+            for name, array in buffers:
+                data = np.ascontiguousarray(array).tobytes()
+                header['buffers'][name] = {
+                    'offset': offset,
+                    'count': int(array.size),
+                    'dtype': {'f': 'float32', 'u': 'uint32' if array.itemsize == 4 else 'uint8'}[array.dtype.kind],
+                }
+                f.write(data)
+                offset += len(data)
+                padding = -offset % 4
+                f.write(b'\0' * padding)
+                offset += padding
+
+        header['binary'] = os.path.basename(f'{path}.bin')
+        with open(f'{path}.json', 'w', encoding='utf-8') as f:
+            json.dump(header, f, indent=2)
+        return f'{path}.json'
+
+
+def build_terrain_mesh(dem, transform, crs=None, max_error=1.0, mined_mask=None, nodata=None):
+    """
+    Simplified triangle mesh of a DEM
+
+    Args:
+        dem: 2D elevation array (NaN or nodata = hole in the mesh)
+        transform: Affine transform of the DEM
+        crs: DEM CRS (geographic DEMs are converted to local metres)
+        max_error: Split threshold in metres: a triangle is refined while
+                   the error at its hypotenuse midpoint (or at a finer
+                   triangle's, as propagated by rtin_errors) exceeds it.
+                   Martini only measures those midpoints, so this is not a
+                   hard bound: other cells of a triangle can deviate from
+                   the mesh surface by more than max_error.
+                   0 keeps every vertex that is not exactly interpolated
+        mined_mask: Optional mask on the DEM grid; triangles never span its
+                    boundary, so pit outlines stay pixel-sharp
+        nodata: Optional DEM nodata value
+
+    Returns:
+        TerrainMesh
+    """
+    dem = np.asarray(dem, dtype=np.float32)
+    height, width = dem.shape
+    n = _grid_size(height, width)
+
+    valid = np.isfinite(dem)
+    if nodata is not None:
+        valid &= dem != nodata
+
+    # Class per grid vertex: 0 = outside the raster or nodata, 1 = valid,
+    # 2 = valid and mined. Splits are forced wherever the class changes.
+    classes = np.zeros((n, n), dtype=np.uint8)
+    classes[:height, :width] = valid
+    if mined_mask is not None:
+        classes[:height, :width][valid & (np.asarray(mined_mask) > 0)] = 2
+
+    heights = np.zeros((n, n), dtype=np.float32)
+    heights[:height, :width] = np.where(valid, dem, 0)
+
+    errors = rtin_errors(heights, classes)
+    corners = rtin_triangles(errors, max_error)
+
+    # Drop triangles touching a hole or the padding
+    corner_classes = classes[corners[..., 0], corners[..., 1]]
+    corners = corners[(corner_classes > 0).all(axis=1)]
+
+    ids = corners[..., 0] * n + corners[..., 1]
+    unique, inverse = np.unique(ids, return_inverse=True)
+    triangles = inverse.reshape(-1, 3).astype(np.uint32)
+    rows, cols = np.divmod(unique, n)
+    rows, cols = rows.astype(np.int32), cols.astype(np.int32)
+
+    dy, dx = mean_pixel_size_m(transform, crs, height)
+    vertices = np.empty((unique.size, 3), dtype=np.float32)
+    vertices[:, 0] = cols * dx
+    vertices[:, 1] = -rows * dy
+    vertices[:, 2] = heights[rows, cols]
+
+    # Counter-clockwise winding in (x east, y north)
+    p = vertices[triangles.astype(np.intp), :2].astype(np.float64)
+    signed = ((p[:, 1, 0] - p[:, 0, 0]) * (p[:, 2, 1] - p[:, 0, 1])
+              - (p[:, 1, 1] - p[:, 0, 1]) * (p[:, 2, 0] - p[:, 0, 0]))
+    flip = signed < 0
+    triangles[flip, 1], triangles[flip, 2] = triangles[flip, 2], triangles[flip, 1].copy()
+
+    mined = (classes[rows, cols] == 2).astype(np.uint8)
+    return TerrainMesh(vertices, triangles, mined, rows, cols, transform, crs,
+                       max_error, grid_vertices=int(valid.sum()))
@@ -0,0 +1,235 @@
+"""
+z/x/y terrain tile pyramid for the browser 3D view
+DEM and mined mask are cut into Web Mercator heightmap PNG tiles so the
+viewer streams only the visible tiles at the right zoom instead of one
+scene-sized surface.
+
+Tile encoding (RGBA PNG):
+    R, G   16-bit height: height_m = height_offset + (R * 256 + G) * height_scale
+    B      255 = mined, 0 = not mined
+    A      255 = valid, 0 = nodata
+"""
+
+import contextlib
+import json
+import math
+import os
+
+import numpy as np
+import rasterio
+from PIL import Image
+from rasterio.crs import CRS
+from rasterio.enums import Resampling
+from rasterio.transform import from_bounds
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import transform_bounds
+
+WEB_MERCATOR = CRS.from_epsg(3857)
+ORIGIN_SHIFT = 20037508.342789244
+DEFAULT_TILE_SIZE = 256
+MANIFEST = 'tiles.json'
+
+
+def tile_bounds(z, x, y):
+    """(left, bottom, right, top) of an XYZ tile in EPSG:3857 metres"""
+    size = 2 * ORIGIN_SHIFT / 2 ** z
+    left = -ORIGIN_SHIFT + x * size
+    top = ORIGIN_SHIFT - y * size
+    return left, top - size, left + size, top
+
+
+def tiles_covering(bounds, z):
+    """(x, y) of every tile at zoom z intersecting EPSG:3857 bounds"""
+    left, bottom, right, top = bounds
+    size = 2 * ORIGIN_SHIFT / 2 ** z
+    last = 2 ** z - 1
+
+    def index(value):
+        return min(max(int(value // size), 0), last)
+
+    x0, x1 = index(left + ORIGIN_SHIFT), index(right + ORIGIN_SHIFT)
+    y0, y1 = index(ORIGIN_SHIFT - top), index(ORIGIN_SHIFT - bottom)
+    return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+
+def zoom_range(bounds, shape, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Default (min_zoom, max_zoom) for a raster
+
+    max_zoom is the first zoom whose tile pixels are at least as fine as
+    the raster's; min_zoom is the last zoom at which one tile still spans
+    the whole AOI.
+    """
+    left, bottom, right, top = bounds
+    height, width = shape
+    pixel = min((right - left) / width, (top - bottom) / height)
+    world = 2 * ORIGIN_SHIFT
+    max_zoom = max(0, int(math.ceil(math.log2(world / (tile_size * pixel)) - 1e-9)))
+    extent = max(right - left, top - bottom)
+    min_zoom = min(max(0, int(math.floor(math.log2(world / extent)))), max_zoom)
+    return min_zoom, max_zoom
+
+
+def height_encoding(dem, height_scale=None):
+    """(offset, scale) that fit the DEM's range into 16 bits"""
+    valid = np.asarray(dem)[~np.isnan(dem)]
+    if valid.size == 0:
+        raise ValueError("DEM has no valid pixels; cannot derive a height encoding")
+    low, high = float(valid.min()), float(valid.max())
+    offset = math.floor(low)
+    if height_scale is None:
+        # Centimetres where the range allows, coarser for very tall AOIs
+        height_scale = max(0.01, math.ceil((high - offset) / 65535 * 100) / 100)
+    return offset, height_scale
+
+
+def _height_range(src):
+    """(min, max) DEM height, streamed over the internal blocks (NaN if none valid)"""
+    low, high = np.inf, -np.inf
+    for _, window in src.block_windows(1):
+        block = src.read(1, window=window, masked=True).astype(np.float32).filled(np.nan)
+        if not np.isnan(block).all():
+            low = min(low, float(np.nanmin(block)))
+            high = max(high, float(np.nanmax(block)))
+    return (low, high) if low <= high else (np.nan, np.nan)
+
+
+def encode_tile(height, mined, offset, scale):
+    """Pack a tile's height (NaN = nodata) and mined flags into RGBA uint8"""
+    valid = ~np.isnan(height)
+    code = np.clip(np.round((np.where(valid, height, offset) - offset) / scale), 0, 65535)
+    code = code.astype(np.uint16)
+    rgba = np.empty(height.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = code >> 8
+    rgba[..., 1] = code & 0xFF
+    rgba[..., 2] = np.where(mined & valid, 255, 0)
+    rgba[..., 3] = np.where(valid, 255, 0)
+    return rgba
+
+
+def decode_tile(rgba, offset, scale):
+    """Inverse of encode_tile: (height with NaN nodata, mined bool)"""
+    rgba = np.asarray(rgba)
+    code = rgba[..., 0].astype(np.float32) * 256 + rgba[..., 1]
+    height = np.where(rgba[..., 3] > 0, offset + code * scale, np.nan).astype(np.float32)
+    return height, rgba[..., 2] > 0
+
+
+def _downsample(children, tile_size):
+    """Parent tile from up to four (height, mined) children"""
+    height = np.full((2 * tile_size, 2 * tile_size), np.nan, dtype=np.float32)
+    mined = np.zeros((2 * tile_size, 2 * tile_size), dtype=bool)
+    for (dx, dy), (child_height, child_mined) in children.items():
+        rows = slice(dy * tile_size, (dy + 1) * tile_size)
+        cols = slice(dx * tile_size, (dx + 1) * tile_size)
+        height[rows, cols] = child_height
+        mined[rows, cols] = child_mined
+
+    blocks = height.reshape(tile_size, 2, tile_size, 2)
+    valid = ~np.isnan(blocks)
+    counts = valid.sum(axis=(1, 3))
+    sums = np.where(valid, blocks, 0).sum(axis=(1, 3))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        parent_height = (sums / counts).astype(np.float32)
+    # Any mined child pixel marks the parent, so small pits stay visible
+    parent_mined = mined.reshape(tile_size, 2, tile_size, 2).any(axis=(1, 3))
+    return parent_height, parent_mined
+
+
+def build_terrain_tiles(dem_path, out_dir, mask_path=None, min_zoom=None, max_zoom=None,
+                        tile_size=DEFAULT_TILE_SIZE, height_scale=None):
+    """
+    Write a heightmap PNG pyramid and its manifest
+
+    The finest zoom is warped straight from the sources one tile at a time
+    (bilinear DEM, nearest mask), so only the source blocks under each tile
+    are read; every coarser zoom is averaged from its four children. Tiles
+    are built depth-first, so memory holds one quadtree branch rather than
+    a whole zoom level.
+
+    Args:
+        dem_path: DEM GeoTIFF (any CRS)
+        out_dir: Output directory; tiles go to out_dir/z/x/y.png
+        mask_path: Optional mined-mask GeoTIFF (any grid covering the DEM)
+        min_zoom, max_zoom: Zoom range (default: zoom_range())
+        tile_size: Tile edge in pixels
+        height_scale: Metres per height code (default: height_encoding())
+
+    Returns:
+        Manifest dict (also written to out_dir/tiles.json)
+    """
+    with contextlib.ExitStack() as stack:
+        dem_src = stack.enter_context(rasterio.open(dem_path))
+        mask_src = stack.enter_context(rasterio.open(mask_path)) if mask_path else None
+        bounds = transform_bounds(dem_src.crs, WEB_MERCATOR, *dem_src.bounds)
+        lonlat = transform_bounds(dem_src.crs, 'EPSG:4326', *dem_src.bounds)
+
+        default_min, default_max = zoom_range(bounds, dem_src.shape, tile_size)
+        min_zoom = default_min if min_zoom is None else min_zoom
+        max_zoom = default_max if max_zoom is None else max_zoom
+        offset, height_scale = height_encoding(np.array(_height_range(dem_src)), height_scale)
+
+        covering = {z: set(tiles_covering(bounds, z)) for z in range(min_zoom, max_zoom + 1)}
+        available = {str(z): [] for z in range(max_zoom, min_zoom - 1, -1)}
+
+        def read_tile(x, y):
+            transform = from_bounds(*tile_bounds(max_zoom, x, y), tile_size, tile_size)
+            grid = dict(crs=WEB_MERCATOR, transform=transform, width=tile_size,
+                        height=tile_size, dtype='float32')
+            with WarpedVRT(dem_src, resampling=Resampling.bilinear, src_nodata=dem_src.nodata,
+                           nodata=np.nan, **grid) as vrt:
+                height = vrt.read(1)
+            if dem_src.nodata is not None:
+                height[height == dem_src.nodata] = np.nan
+            if np.isnan(height).all():
+                return None
+
+            mined = np.zeros((tile_size, tile_size), dtype=bool)
+            if mask_src is not None:
+                with WarpedVRT(mask_src, resampling=Resampling.nearest, nodata=0, **grid) as vrt:
+                    mined = vrt.read(1) > 0
+            return height, mined
+
+        def build(z, x, y):
+            # Depth-first, so only one branch of the quadtree is ever in memory
+            if z == max_zoom:
+                tile = read_tile(x, y)
+            else:
+                children = {}
+                for dy in (0, 1):
+                    for dx in (0, 1):
+                        if (2 * x + dx, 2 * y + dy) in covering[z + 1]:
+                            child = build(z + 1, 2 * x + dx, 2 * y + dy)
+                            if child is not None:
+                                children[(dx, dy)] = child
+                tile = _downsample(children, tile_size) if children else None
+            if tile is None:
+                return None
+
+            directory = os.path.join(out_dir, str(z), str(x))
+            os.makedirs(directory, exist_ok=True)
+            Image.fromarray(encode_tile(*tile, offset, height_scale), 'RGBA').save(
+                os.path.join(directory, f'{y}.png'), optimize=False, compress_level=6)
+            available[str(z)].append([x, y])
+            return tile
+
+        for x, y in sorted(covering[min_zoom]):
+            build(min_zoom, x, y)
+    available = {z: sorted(tiles) for z, tiles in available.items()}
+
+    manifest = {
+        'format': 'png',
+        'encoding': 'rg16-height,b-mined,a-valid',
+        'tiles': '{z}/{x}/{y}.png',
+        'tile_size': tile_size,
+        'minzoom': min_zoom,
+        'maxzoom': max_zoom,
+        'bounds': list(lonlat),
+        'height_offset': offset,
+        'height_scale': height_scale,
+        'available': available,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,316 @@
+"""
+Content-addressed tile cache and incremental change detection
+Intermediate products (scaled bands, indices, diffs, raw and cleaned masks)
+are stored per tile under a key derived from the input file contents, the
+window and the parameters that produced them. A rerun after a new date
+arrives or a threshold changes only recomputes the tiles whose key changed.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .band_reader import L2A_SCALE, BandReader, iter_windows, pad_window
+from .indices import IndexEngine
+from .morphology import DEFAULT_STRUCTURE, DEFAULT_TILE_SHAPE, _clean_tile, morphology_halo
+
+DIGEST_INDEX = 'file_digests.json'
+
+
+class TileCache:
+    """
+    Tile products keyed by content hash
+
+    Arrays live in an in-memory LRU and as .npy files under
+    cache_dir/<kind>/, which later runs memory-map instead of recomputing.
+    Hits and misses are counted per product kind.
+
+    Example:
+        cache = TileCache('cache/tiles')
+        key = cache.key('index', band_key, 'NDVI')
+        ndvi = cache.fetch('index', key, lambda: compute_ndvi(...))
+        print(cache.report())
+    """
+
+    def __init__(self, cache_dir=None, max_items=256):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._digests = {}
+        self.hits = {}
+        self.misses = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            index_path = os.path.join(cache_dir, DIGEST_INDEX)
+            if os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self._digests = json.load(f)
+
+    @staticmethod
+    def key(*parts):
+        """Digest of the repr of every part (windows, params, upstream keys)"""
+        return hashlib.sha1('|'.join(repr(part) for part in parts).encode()).hexdigest()
+
+    def file_digest(self, path):
+        """
+        SHA-1 of a file's contents
+
+        Memoized by (size, mtime) so unchanged inputs are hashed only once,
+        across runs when cache_dir is set.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self._digests.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['digest']
+
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self._digests[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                               'digest': digest.hexdigest()}
+        if self.cache_dir:
+            tmp = os.path.join(self.cache_dir, DIGEST_INDEX + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._digests, f)
+            os.replace(tmp, os.path.join(self.cache_dir, DIGEST_INDEX))
+        return self._digests[path]['digest']
+
+    def _disk_path(self, kind, key):
+        return os.path.join(self.cache_dir, kind, key[:2], f'{key}.npy')
+
+    def get(self, kind, key):
+        """Cached array or None; does not touch the hit counters"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self.cache_dir and os.path.exists(self._disk_path(kind, key)):
+            array = np.load(self._disk_path(kind, key), mmap_mode='r')
+            self._remember(key, array)
+            return array
+        return None
+
+    def put(self, kind, key, array):
+        array = np.asarray(array)
+        if self.cache_dir:
+            path = self._disk_path(kind, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp, path)
+        self._remember(key, array)
+        return array
+
+    def _remember(self, key, array):
+        self._memory[key] = array
+        if len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def fetch(self, kind, key, compute):
+        """Cached array for key, calling compute() and storing it on a miss"""
+        array = self.get(kind, key)
+        if array is not None:
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+            return array
+        self.misses[kind] = self.misses.get(kind, 0) + 1
+        return self.put(kind, key, compute())
+
+    def reset_stats(self):
+        self.hits, self.misses = {}, {}
+
+    @property
+    def hit_ratio(self):
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def report(self):
+        """Hits, misses and hit ratio per product kind and overall"""
+        report = {}
+        for kind in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits.get(kind, 0), self.misses.get(kind, 0)
+            report[kind] = {'hits': hits, 'misses': misses,
+                            'hit_ratio': hits / (hits + misses)}
+        report['total'] = {'hits': sum(self.hits.values()),
+                           'misses': sum(self.misses.values()),
+                           'hit_ratio': self.hit_ratio}
+        return report
+
+
+class IncrementalChangeDetector:
+    """
+    compute_change_mask over two dates, backed by a TileCache
+
+    Key chain per tile:
+        band   <- file digest, window, scale
+        index  <- band keys, index name
+        diff   <- before/after keys
+        mask   <- diff keys, ndvi_thresh, swir_thresh
+        clean  <- mask keys of every tile under the halo, structure,
+                  min_area_pixels, connectivity
+    Upstream data is only read when a downstream key misses, so changing
+    min_area_pixels re-runs just the morphology, and a new after-date
+    never re-reads the before-date bands.
+
+    Example:
+        detector = IncrementalChangeDetector(jan10_paths, jan30_paths,
+                                             TileCache('cache/tiles'))
+        mask, report = detector.run(ndvi_thresh=0.2, swir_thresh=0.05)
+    """
+
+    def __init__(self, before_paths, after_paths, cache, tile_shape=DEFAULT_TILE_SHAPE,
+                 scale=L2A_SCALE):
+        """
+        Args:
+            before_paths, after_paths: Mappings with at least 'B04', 'B08'
+                                       and 'B11' GeoTIFF paths
+            cache: TileCache
+            tile_shape: Tile (rows, cols); keep it fixed between runs or
+                        every key changes
+            scale: Divisor for the raw digital numbers
+        """
+        self.paths = {'before': dict(before_paths), 'after': dict(after_paths)}
+        self.cache = cache
+        self.tile_shape = tuple(tile_shape)
+        self.scale = scale
+        self.engine = IndexEngine(['NDVI'])
+        self._readers = {}
+        self._digests = {}
+
+        with BandReader(self.paths['before'], scale=scale) as reader:
+            self.profile = reader.profile.copy()
+            self.height, self.width = reader.shape
+
+    def _reader(self, date):
+        if date not in self._readers:
+            self._readers[date] = BandReader(self.paths[date], scale=self.scale)
+        return self._readers[date]
+
+    def close(self):
+        for reader in self._readers.values():
+            reader.close()
+        self._readers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _band_key(self, date, band, window):
+        path = self.paths[date][band]
+        if path not in self._digests:
+            self._digests[path] = self.cache.file_digest(path)
+        return self.cache.key('band', self._digests[path], _window_tuple(window), self.scale)
+
+    def _band(self, date, band, window):
+        return self.cache.fetch('band', self._band_key(date, band, window),
+                                lambda: self._reader(date).read(window, bands=[band])[band])
+
+    def _ndvi_key(self, date, window):
+        return self.cache.key('index', self._band_key(date, 'B08', window),
+                              self._band_key(date, 'B04', window), 'NDVI')
+
+    def _ndvi(self, date, window):
+        def compute():
+            bands = {band: self._band(date, band, window) for band in self.engine.bands}
+            return self.engine.compute(bands)['NDVI']
+        return self.cache.fetch('index', self._ndvi_key(date, window), compute)
+
+    def _diff_keys(self, window):
+        ndvi_drop = self.cache.key('diff', self._ndvi_key('before', window),
+                                   self._ndvi_key('after', window), 'ndvi_drop')
+        swir_rise = self.cache.key('diff', self._band_key('before', 'B11', window),
+                                   self._band_key('after', 'B11', window), 'swir_rise')
+        return ndvi_drop, swir_rise
+
+    def _raw_mask(self, window, ndvi_thresh, swir_thresh):
+        ndvi_key, swir_key = self._diff_keys(window)
+        key = self.cache.key('mask', ndvi_key, swir_key, ndvi_thresh, swir_thresh)
+
+        def compute():
+            ndvi_drop = self.cache.fetch(
+                'diff', ndvi_key,
+                lambda: self._ndvi('before', window) - self._ndvi('after', window))
+            swir_rise = self.cache.fetch(
+                'diff', swir_key,
+                lambda: self._band('after', 'B11', window) - self._band('before', 'B11', window))
+            return (ndvi_drop > ndvi_thresh) | (swir_rise > swir_thresh)
+
+        return key, self.cache.fetch('mask', key, compute)
+
+    def run(self, ndvi_thresh=0.2, swir_thresh=0.05, min_area_pixels=100,
+            structure=DEFAULT_STRUCTURE, connectivity=1, workers=1):
+        """
+        Mined-area change mask, recomputing only invalidated tiles
+
+        Returns:
+            (uint8 mask, cache report for this run)
+        """
+        self.cache.reset_stats()
+        structure = np.asarray(structure, dtype=bool)
+        morph_halo, object_halo = morphology_halo(structure, min_area_pixels)
+        halo = morph_halo + object_halo
+        tile_rows, tile_cols = self.tile_shape
+
+        # Raw masks are per-pixel, so every tile is resolved (mostly from the
+        # cache) before cleaning reads across tile borders
+        windows = list(iter_windows(self.height, self.width, self.tile_shape))
+        raw = np.zeros((self.height, self.width), dtype=bool)
+        raw_keys = {}
+        for window in windows:
+            key, tile = self._raw_mask(window, ndvi_thresh, swir_thresh)
+            raw_keys[_tile_index(window, self.tile_shape)] = key
+            raw[window.toslices()] = tile
+
+        out = np.zeros((self.height, self.width), dtype=bool)
+        jobs, pending = [], []
+        for window in windows:
+            padded, core = pad_window(window, halo, self.height, self.width)
+            row0, col0 = int(padded.row_off), int(padded.col_off)
+            row1, col1 = row0 + int(padded.height), col0 + int(padded.width)
+            neighbours = [raw_keys[(i, j)]
+                          for i in range(row0 // tile_rows, (row1 - 1) // tile_rows + 1)
+                          for j in range(col0 // tile_cols, (col1 - 1) // tile_cols + 1)]
+            key = self.cache.key('clean', neighbours, _window_tuple(window),
+                                 structure.tobytes(), structure.shape, min_area_pixels,
+                                 connectivity)
+
+            cached = self.cache.get('clean', key)
+            if cached is not None:
+                self.cache.hits['clean'] = self.cache.hits.get('clean', 0) + 1
+                out[window.toslices()] = cached
+                continue
+
+            self.cache.misses['clean'] = self.cache.misses.get('clean', 0) + 1
+            interior_sides = (row0 > 0, row1 < self.height, col0 > 0, col1 < self.width)
+            jobs.append((raw[row0:row1, col0:col1].copy(), interior_sides, structure,
+                         min_area_pixels, connectivity, morph_halo, core))
+            pending.append((window, key))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(jobs))
+        if workers <= 1:
+            results = map(_clean_tile, jobs)
+            for (window, key), result in zip(pending, results):
+                out[window.toslices()] = self.cache.put('clean', key, result)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for (window, key), result in zip(pending, executor.map(_clean_tile, jobs)):
+                    out[window.toslices()] = self.cache.put('clean', key, result)
+
+        return out.astype(np.uint8), self.cache.report()
+
+
+def _window_tuple(window):
+    return (int(window.col_off), int(window.row_off), int(window.width), int(window.height))
+
+
+def _tile_index(window, tile_shape):
+    return int(window.row_off) // tile_shape[0], int(window.col_off) // tile_shape[1]
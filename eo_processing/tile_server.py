@@ -0,0 +1,368 @@
+"""
+On-demand XYZ raster tiles for the web map
+Serves NDVI / BSI / mined-mask COG products as 256px PNG or WebP tiles.
+Each tile is warped from the overview level that matches its zoom, so no
+request reads a whole raster; rendered tiles are kept in an in-memory LRU
+and on disk, and ETags let browsers revalidate without a re-render.
+
+Usage:
+    python -m eo_processing.tile_server \\
+        --layer mined=outputs/mined_mask_jan10_to_jan30.tif:mask \\
+        --layer ndvi=outputs/ndvi_jan30.tif:RdYlGn:-1:1 \\
+        --cache-dir cache/xyz --port 8000
+
+    Tiles: GET /tiles/{layer}/{z}/{x}/{y}.png (or .webp)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import rasterio
+from fastapi import FastAPI, HTTPException, Request, Response
+from PIL import Image
+from rasterio.enums import Resampling
+from rasterio.transform import from_bounds
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import transform_bounds
+
+from .stretch import approximate_percentiles
+from .terrain_tiles import ORIGIN_SHIFT, WEB_MERCATOR, tile_bounds
+
+DEFAULT_TILE_SIZE = 256
+
+# ColorBrewer anchors, the same lists matplotlib's RdYlGn / YlOrBr are built from
+COLORMAP_ANCHORS = {
+    'RdYlGn': ['a50026', 'd73027', 'f46d43', 'fdae61', 'fee08b', 'ffffbf',
+               'd9ef8b', 'a6d96a', '66bd63', '1a9850', '006837'],
+    'YlOrBr': ['ffffe5', 'fff7bc', 'fee391', 'fec44f', 'fe9929', 'ec7014',
+               'cc4c02', '993404', '662506'],
+}
+
+# Mined pixels in the notebooks' red overlay; everything else transparent
+MASK_RGBA = (255, 0, 0, 170)
+
+MEDIA_TYPES = {'png': 'image/png', 'webp': 'image/webp'}
+
+
+def colormap_lut(name):
+    """(256, 4) uint8 RGBA lookup table interpolated from the anchors"""
+    if name.endswith('_r'):
+        return colormap_lut(name[:-2])[::-1].copy()
+    if name not in COLORMAP_ANCHORS:
+        raise ValueError(f"Unknown colormap '{name}', expected one of {sorted(COLORMAP_ANCHORS)}")
+    anchors = np.array([[int(c[i:i + 2], 16) for i in (0, 2, 4)]
+                        for c in COLORMAP_ANCHORS[name]], dtype=np.float64)
+    position = np.linspace(0, 1, len(anchors))
+    ramp = np.linspace(0, 1, 256)
+    lut = np.empty((256, 4), dtype=np.uint8)
+    for channel in range(3):
+        lut[:, channel] = np.round(np.interp(ramp, position, anchors[:, channel]))
+    lut[:, 3] = 255
+    return lut
+
+
+class TileLayer:
+    """
+    One COG product served as XYZ tiles
+
+    Args:
+        name: URL name of the layer
+        path: GeoTIFF path (ideally a COG from eo_processing.cog)
+        colormap: 'RdYlGn', 'YlOrBr' (append '_r' to reverse) or 'mask'
+        vmin, vmax: Colour range; defaults to the 2/98 percentiles of the
+                    coarsest overview
+        band: Band to render
+    """
+
+    def __init__(self, name, path, colormap='RdYlGn', vmin=None, vmax=None, band=1):
+        self.name = name
+        self.path = path
+        self.colormap = colormap
+        self.band = band
+
+        with rasterio.open(path) as src:
+            self.factors = src.overviews(band)
+            self.nodata = src.nodata
+            self.bounds = transform_bounds(src.crs, WEB_MERCATOR, *src.bounds)
+            # Source pixel size expressed in Web Mercator metres
+            self.mercator_res = min((self.bounds[2] - self.bounds[0]) / src.width,
+                                    (self.bounds[3] - self.bounds[1]) / src.height)
+        stat = os.stat(path)
+        self.version = f'{stat.st_size}-{stat.st_mtime_ns}'
+
+        if colormap != 'mask' and (vmin is None or vmax is None):
+            level = len(self.factors) - 1 if self.factors else None
+            kwargs = {} if level is None else {'overview_level': level}
+            with rasterio.open(path, **kwargs) as src:
+                preview = src.read(band, masked=True).astype(np.float32).filled(np.nan)
+            low, high = approximate_percentiles(preview, (2, 98))
+            vmin = low if vmin is None else vmin
+            vmax = high if vmax is None else vmax
+        self.vmin, self.vmax = vmin, vmax
+        self.lut = None if colormap == 'mask' else colormap_lut(colormap)
+
+    @property
+    def style(self):
+        return f'{self.colormap}:{self.vmin}:{self.vmax}:{self.band}'
+
+    def overview_level(self, z, tile_size):
+        """Coarsest overview still at least as fine as the tile pixels"""
+        tile_res = 2 * ORIGIN_SHIFT / 2 ** z / tile_size
+        level = None
+        for index, factor in enumerate(self.factors):
+            if self.mercator_res * factor > tile_res:
+                break
+            level = index
+        return level
+
+    def intersects(self, z, x, y):
+        left, bottom, right, top = tile_bounds(z, x, y)
+        return not (right <= self.bounds[0] or left >= self.bounds[2]
+                    or top <= self.bounds[1] or bottom >= self.bounds[3])
+
+    def colorize(self, values):
+        """RGBA uint8 tile from warped values (NaN = transparent)"""
+        rgba = np.zeros(values.shape + (4,), dtype=np.uint8)
+        valid = ~np.isnan(values)
+        if self.colormap == 'mask':
+            rgba[valid & (values > 0)] = MASK_RGBA
+            return rgba
+        span = (self.vmax - self.vmin) or 1.0
+        index = np.clip((np.where(valid, values, self.vmin) - self.vmin) * (255.0 / span), 0, 255)
+        rgba[...] = self.lut[index.astype(np.uint8)]
+        rgba[~valid, 3] = 0
+        return rgba
+
+
+class TileRenderer:
+    """
+    Thread-safe tile rendering with per-thread dataset handles
+
+    rasterio datasets must not be shared between threads, so each worker
+    thread keeps its own handle per (path, overview level).
+    """
+
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE):
+        self.tile_size = tile_size
+        self._local = threading.local()
+
+    def _dataset(self, path, level):
+        handles = getattr(self._local, 'handles', None)
+        if handles is None:
+            handles = self._local.handles = {}
+        key = (path, level)
+        if key not in handles:
+            kwargs = {} if level is None else {'overview_level': level}
+            handles[key] = rasterio.open(path, **kwargs)
+        return handles[key]
+
+    def render(self, layer, z, x, y, fmt='png'):
+        """Encoded image bytes of one tile"""
+        size = self.tile_size
+        src = self._dataset(layer.path, layer.overview_level(z, size))
+        transform = from_bounds(*tile_bounds(z, x, y), size, size)
+        resampling = Resampling.nearest if layer.colormap == 'mask' else Resampling.bilinear
+        with WarpedVRT(src, crs=WEB_MERCATOR, transform=transform, width=size, height=size,
+                       resampling=resampling, src_nodata=layer.nodata, nodata=np.nan,
+                       dtype='float32') as vrt:
+            values = vrt.read(layer.band)
+        if layer.nodata is not None:
+            values[values == layer.nodata] = np.nan
+        return encode_image(layer.colorize(values), fmt)
+
+
+def encode_image(rgba, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        Image.fromarray(rgba, 'RGBA').save(buffer, 'WEBP', lossless=True)
+    else:
+        Image.fromarray(rgba, 'RGBA').save(buffer, 'PNG', compress_level=6)
+    return buffer.getvalue()
+
+
+class TileCacheStore:
+    """
+    In-memory LRU of encoded tiles backed by an optional disk cache
+
+    The memory side is lock-protected; get_disk and put touch the disk and
+    belong on a worker thread, not the event loop.
+    """
+
+    def __init__(self, cache_dir=None, max_tiles=2048):
+        self.cache_dir = cache_dir
+        self.max_tiles = max_tiles
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, etag):
+        return os.path.join(self.cache_dir, etag[:2], etag)
+
+    def get(self, etag):
+        data = self.get_memory(etag)
+        return self.get_disk(etag) if data is None else data
+
+    def get_memory(self, etag):
+        """Tile from the LRU, or None (never blocks on I/O)"""
+        with self._lock:
+            if etag not in self._memory:
+                return None
+            self._memory.move_to_end(etag)
+            self.hits += 1
+            return self._memory[etag]
+
+    def get_disk(self, etag):
+        """Tile from the disk cache, or None (counted as a miss)"""
+        data = None
+        if self.cache_dir and os.path.exists(self._disk_path(etag)):
+            with open(self._disk_path(etag), 'rb') as f:
+                data = f.read()
+            self._remember(etag, data)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, etag, data):
+        if self.cache_dir:
+            path = self._disk_path(etag)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._remember(etag, data)
+
+    def _remember(self, etag, data):
+        with self._lock:
+            self._memory[etag] = data
+            if len(self._memory) > self.max_tiles:
+                self._memory.popitem(last=False)
+
+
+def tile_etag(layer, z, x, y, fmt, tile_size):
+    """ETag from the source file version and style, known before rendering"""
+    parts = [layer.name, layer.version, layer.style, z, x, y, fmt, tile_size]
+    return hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()
+
+
+def create_app(layers, cache_dir=None, max_tiles=2048, workers=None,
+               tile_size=DEFAULT_TILE_SIZE):
+    """
+    FastAPI app serving /tiles/{layer}/{z}/{x}/{y}.{png|webp}
+
+    Args:
+        layers: Iterable of TileLayer
+        cache_dir: Optional directory for rendered tiles
+        max_tiles: Tiles kept in memory
+        workers: Rendering threads (default: 2 x cores)
+        tile_size: Tile edge in pixels
+
+    Concurrent requests for the same tile share one render. Only the
+    in-memory LRU is consulted on the event loop; disk cache reads, renders
+    and cache writes run on the rendering threads.
+    """
+    layers = {layer.name: layer for layer in layers}
+    renderer = TileRenderer(tile_size=tile_size)
+    store = TileCacheStore(cache_dir=cache_dir, max_tiles=max_tiles)
+    executor = ThreadPoolExecutor(max_workers=workers or 2 * (os.cpu_count() or 1))
+    in_flight = {}
+    blank = {fmt: encode_image(np.zeros((tile_size, tile_size, 4), dtype=np.uint8), fmt)
+             for fmt in MEDIA_TYPES}
+
+    def fetch(layer, z, x, y, fmt, etag):
+        # Disk cache, then render: both block, so this runs on the executor
+        data = store.get_disk(etag)
+        if data is None:
+            data = renderer.render(layer, z, x, y, fmt)
+            store.put(etag, data)
+        return data
+
+    app = FastAPI(title='OreNexus raster tiles')
+    app.state.layers, app.state.store, app.state.executor = layers, store, executor
+
+    @app.get('/layers')
+    async def list_layers():
+        return [{'name': layer.name, 'colormap': layer.colormap, 'vmin': layer.vmin,
+                 'vmax': layer.vmax, 'url': f'/tiles/{layer.name}/{{z}}/{{x}}/{{y}}.png'}
+                for layer in layers.values()]
+
+    @app.get('/stats')
+    async def stats():
+        total = store.hits + store.misses
+        return {'hits': store.hits, 'misses': store.misses,
+                'hit_ratio': store.hits / total if total else 0.0}
+
+    @app.get('/tiles/{name}/{z}/{x}/{y}.{fmt}')
+    async def tile(name: str, z: int, x: int, y: int, fmt: str, request: Request):
+        layer = layers.get(name)
+        if layer is None or fmt not in MEDIA_TYPES:
+            raise HTTPException(status_code=404, detail='Unknown layer or format')
+        if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise HTTPException(status_code=404, detail='Tile outside the world')
+
+        etag = tile_etag(layer, z, x, y, fmt, tile_size)
+        headers = {'ETag': f'"{etag}"', 'Cache-Control': 'public, max-age=3600'}
+        if request.headers.get('if-none-match', '').strip('"') == etag:
+            return Response(status_code=304, headers=headers)
+        if not layer.intersects(z, x, y):
+            return Response(blank[fmt], media_type=MEDIA_TYPES[fmt], headers=headers)
+
+        data = store.get_memory(etag)
+        if data is None:
+            future = in_flight.get(etag)
+            if future is None:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(executor, fetch, layer, z, x, y, fmt, etag)
+                in_flight[etag] = future
+                try:
+                    data = await future
+                finally:
+                    in_flight.pop(etag, None)
+            else:
+                data = await future
+        return Response(data, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+    return app
+
+
+def _parse_layer(spec):
+    """NAME=PATH[:COLORMAP[:VMIN:VMAX]]"""
+    name, rest = spec.split('=', 1)
+    parts = rest.split(':')
+    path, colormap = parts[0], parts[1] if len(parts) > 1 else 'RdYlGn'
+    vmin = float(parts[2]) if len(parts) > 2 else None
+    vmax = float(parts[3]) if len(parts) > 3 else None
+    return TileLayer(name, path, colormap=colormap, vmin=vmin, vmax=vmax)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve COG products as XYZ tiles')
+    parser.add_argument('--layer', action='append', required=True,
+                        help='NAME=PATH[:COLORMAP[:VMIN:VMAX]], colormap RdYlGn, YlOrBr or mask')
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--max-tiles', type=int, default=2048)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app([_parse_layer(spec) for spec in args.layer], cache_dir=args.cache_dir,
+                     max_tiles=args.max_tiles, workers=args.workers)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
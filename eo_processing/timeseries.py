@@ -0,0 +1,244 @@
+"""
+Multi-date raster cube and streaming time-series change detection
+Acquisitions of one band or index are stored as an on-disk cube with one
+.npy chunk per (tile, date). Trend, first-change date and cumulative increase
+are computed tile by tile in a single streaming pass over time, so neither
+the full cube nor a full time series ever has to fit in memory.
+
+Layout:
+    cube_dir/cube.json                   grid, tiling and the list of dates
+    cube_dir/<YYYY-MM-DD>/r<i>_c<j>.npy  one tile of one acquisition
+"""
+
+import json
+import os
+
+import numpy as np
+import rasterio
+
+from .band_reader import L2A_SCALE, BandReader, iter_windows
+from .indices import IndexEngine
+
+MANIFEST = 'cube.json'
+DEFAULT_TILE_SHAPE = (512, 512)
+
+
+def _as_date(value):
+    return np.datetime64(str(value)[:10], 'D')
+
+
+class RasterCube:
+    """
+    Chunked on-disk stack of co-registered acquisitions
+
+    Example:
+        cube = RasterCube.create('cubes/korba_bsi', shape, transform, crs)
+        cube.add_index_acquisition('2023-01-10', jan10_paths, 'BSI')
+        cube.add_index_acquisition('2023-01-30', jan30_paths, 'BSI')
+        stats = cube.change_statistics(threshold=0.2)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.shape = tuple(manifest['shape'])
+        self.tile_shape = tuple(manifest['tile_shape'])
+        self.dtype = np.dtype(manifest['dtype'])
+        self.transform = rasterio.Affine(*manifest['transform'])
+        self.crs = rasterio.crs.CRS.from_wkt(manifest['crs']) if manifest['crs'] else None
+        self._dates = list(manifest['dates'])
+
+    @classmethod
+    def create(cls, path, shape, transform, crs, tile_shape=DEFAULT_TILE_SHAPE, dtype='float32'):
+        """Create an empty cube directory for a given grid"""
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            raise FileExistsError(f"A cube already exists at {path}")
+        manifest = {
+            'shape': list(shape),
+            'tile_shape': list(tile_shape),
+            'dtype': np.dtype(dtype).name,
+            'transform': list(transform)[:6],
+            'crs': crs.to_wkt() if crs else None,
+            'dates': [],
+        }
+        cls._write_manifest(path, manifest)
+        return cls(path)
+
+    @classmethod
+    def open(cls, path):
+        return cls(path)
+
+    @staticmethod
+    def _write_manifest(path, manifest):
+        tmp = os.path.join(path, MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(path, MANIFEST))
+
+    def _save_manifest(self):
+        self._write_manifest(self.path, {
+            'shape': list(self.shape),
+            'tile_shape': list(self.tile_shape),
+            'dtype': self.dtype.name,
+            'transform': list(self.transform)[:6],
+            'crs': self.crs.to_wkt() if self.crs else None,
+            'dates': self._dates,
+        })
+
+    @property
+    def dates(self):
+        """Acquisition dates in chronological order"""
+        return sorted(self._dates)
+
+    def windows(self):
+        """Yield ((tile_row, tile_col), window) for every tile"""
+        tile_rows, tile_cols = self.tile_shape
+        for window in iter_windows(self.shape[0], self.shape[1], self.tile_shape):
+            yield (int(window.row_off) // tile_rows, int(window.col_off) // tile_cols), window
+
+    def _chunk_path(self, date, tile):
+        return os.path.join(self.path, str(date), f'r{tile[0]}_c{tile[1]}.npy')
+
+    def add_acquisition(self, date, read_window, overwrite=False):
+        """
+        Write one acquisition, tile by tile
+
+        Only the new date's directory and the manifest's date list are
+        touched; existing chunks are never rewritten.
+
+        Args:
+            date: Acquisition date ('YYYY-MM-DD' or anything datetime64 parses)
+            read_window: Callable window -> 2D array, or a full 2D array on
+                         the cube grid
+            overwrite: Replace an existing acquisition for the same date
+        """
+        date = str(_as_date(date))
+        if date in self._dates and not overwrite:
+            raise ValueError(f"Acquisition {date} is already in the cube")
+
+        if isinstance(read_window, np.ndarray):
+            array = read_window
+            if array.shape != self.shape:
+                raise ValueError(f"Array shape {array.shape} does not match cube {self.shape}")
+            read_window = lambda window: array[window.toslices()]
+
+        os.makedirs(os.path.join(self.path, date), exist_ok=True)
+        for tile, window in self.windows():
+            data = np.asarray(read_window(window), dtype=self.dtype)
+            np.save(self._chunk_path(date, tile), data)
+
+        if date not in self._dates:
+            self._dates.append(date)
+            self._save_manifest()
+
+    def add_index_acquisition(self, date, band_paths, index, scale=L2A_SCALE, overwrite=False):
+        """Compute a spectral index from raw bands straight into the cube"""
+        engine = IndexEngine([index])
+        with BandReader(band_paths, scale=scale) as reader:
+            if reader.shape != self.shape:
+                raise ValueError(f"Bands have shape {reader.shape}, cube expects {self.shape}")
+            name = engine.names[0]
+
+            def read_window(window):
+                return engine.compute(reader.read(window, bands=engine.bands))[name]
+
+            self.add_acquisition(date, read_window, overwrite=overwrite)
+
+    def read_chunk(self, date, tile):
+        """Memory-mapped view of one tile of one acquisition"""
+        return np.load(self._chunk_path(str(_as_date(date)), tile), mmap_mode='r')
+
+    def read_series(self, tile, dates=None):
+        """(T, rows, cols) stack of one tile, in chronological order"""
+        dates = self.dates if dates is None else dates
+        return np.stack([self.read_chunk(date, tile) for date in dates])
+
+    def change_statistics(self, threshold=0.2, dates=None, out=None):
+        """
+        Per-pixel trend, first-change date and cumulative increase
+
+        One pass over time per tile, accumulating running sums:
+          - trend_per_year: least-squares slope of value vs. time
+          - first_change_days: days from the first acquisition to the first
+            one whose value exceeds that baseline by more than threshold
+            (-1 = never)
+          - cumulative_increase: sum of positive date-to-date increases
+            (e.g. cumulative BSI gain)
+        NaNs are skipped in every statistic.
+
+        Args:
+            threshold: Increase over the baseline that counts as change
+            dates: Optional subset of dates
+            out: Optional mapping of output name -> preallocated array of
+                 the cube shape (e.g. np.memmap) for scene-scale cubes
+
+        Returns:
+            Dict with 'trend_per_year', 'first_change_days',
+            'cumulative_increase' and 'valid_count'
+        """
+        dates = self.dates if dates is None else sorted(str(_as_date(d)) for d in dates)
+        if not dates:
+            raise ValueError("The cube has no acquisitions")
+        days = (np.array([_as_date(d) for d in dates]) - _as_date(dates[0])).astype(np.float64)
+
+        out = {} if out is None else dict(out)
+        defaults = {
+            'trend_per_year': (np.float32, np.nan),
+            'first_change_days': (np.int32, -1),
+            'cumulative_increase': (np.float32, 0.0),
+            'valid_count': (np.int16, 0),
+        }
+        for name, (dtype, fill) in defaults.items():
+            if name not in out:
+                out[name] = np.empty(self.shape, dtype=dtype)
+            out[name][...] = fill
+
+        for tile, window in self.windows():
+            rows, cols = window.toslices()
+            tile_shape = (int(window.height), int(window.width))
+            n = np.zeros(tile_shape)
+            s_t = np.zeros(tile_shape)
+            s_tt = np.zeros(tile_shape)
+            s_y = np.zeros(tile_shape)
+            s_ty = np.zeros(tile_shape)
+            baseline = np.full(tile_shape, np.nan)
+            previous = np.full(tile_shape, np.nan)
+            first_change = np.full(tile_shape, -1, dtype=np.int32)
+            cumulative = np.zeros(tile_shape)
+
+            for t, date in zip(days, dates):
+                y = np.asarray(self.read_chunk(date, tile), dtype=np.float64)
+                valid = ~np.isnan(y)
+                y0 = np.where(valid, y, 0.0)
+
+                n += valid
+                s_t += valid * t
+                s_tt += valid * t * t
+                s_y += y0
+                s_ty += y0 * t
+
+                baseline = np.where(np.isnan(baseline) & valid, y, baseline)
+                changed = valid & (first_change < 0) & (y - baseline > threshold)
+                first_change[changed] = int(t)
+
+                step = y - previous
+                cumulative += np.where(step > 0, step, 0.0)
+                previous = np.where(valid, y, previous)
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                slope = (n * s_ty - s_t * s_y) / (n * s_tt - s_t * s_t)
+            slope[n < 2] = np.nan
+
+            out['trend_per_year'][rows, cols] = slope * 365.25
+            out['first_change_days'][rows, cols] = first_change
+            out['cumulative_increase'][rows, cols] = cumulative
+            out['valid_count'][rows, cols] = n
+        return out
+
+    def first_change_dates(self, first_change_days):
+        """Convert first_change_days into datetime64[D] (NaT = no change)"""
+        start = _as_date(self.dates[0])
+        dates = start + first_change_days.astype('timedelta64[D]')
+        return np.where(first_change_days >= 0, dates, np.datetime64('NaT'))
@@ -0,0 +1,313 @@
+"""
+DEM volume engine for mined pits
+Per-pit cut volume (composite Simpson's 1/3 rule along rows and columns, and
+the simple prism sum), mean and max depth, computed by streaming pre- and
+post-mining DEM windows against the labeled mined mask.
+
+Run this module directly for a benchmark against a per-pixel Python loop:
+    python -m eo_processing.volume
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import ndimage
+
+from .band_reader import BandReader, iter_windows, pad_window
+from .grid import pixel_sizes_m
+
+VOLUME_COLUMNS = [
+    'pit_id', 'pixel_count', 'volume_simpson_m3', 'volume_prism_m3',
+    'mean_depth_m', 'max_depth_m',
+]
+
+DEFAULT_BLOCK_SHAPE = (512, 512)
+
+
+def simpson_coefficients(k, n):
+    """
+    Composite Simpson's 1/3 coefficients for sample k of n equally spaced samples
+
+    Odd n uses the pure 1-4-2-...-4-1 pattern; even n applies Simpson to the
+    first n-1 samples and the trapezoid rule to the last interval. Works
+    element-wise on integer arrays so every pixel gets the coefficient of its
+    position inside its own pit's integration grid.
+    """
+    k = np.asarray(k)
+    n = np.asarray(n)
+    even = n % 2 == 0
+    simpson_points = n - even
+    coeff = np.where(k % 2 == 1, 4.0, 2.0)
+    coeff = np.where((k == 0) | (k == simpson_points - 1), 1.0, coeff) / 3.0
+    coeff = np.where((k >= simpson_points) | (simpson_points == 1), 0.0, coeff)
+    coeff = coeff + np.where(even & (k >= n - 2), 0.5, 0.0)
+    return np.where(n == 1, 1.0, coeff)
+
+
+class _ArraySource:
+    """Window reader over an in-memory (or memory-mapped) array"""
+
+    def __init__(self, array):
+        self.array = array
+        self.shape = array.shape
+
+    def read(self, window):
+        rows, cols = window.toslices()
+        return np.asarray(self.array[rows, cols], dtype=np.float64)
+
+    def close(self):
+        pass
+
+
+class _RasterSource:
+    def __init__(self, path, nodata):
+        self.reader = BandReader({'dem': path}, nodata=nodata, dtype=np.float64)
+        self.shape = self.reader.shape
+
+    def read(self, window):
+        return self.reader.read(window)['dem']
+
+    def close(self):
+        self.reader.close()
+
+
+def _open_source(source, nodata):
+    if isinstance(source, np.ndarray):
+        return _ArraySource(source)
+    return _RasterSource(source, nodata)
+
+
+def fit_reference_planes(labels, n_pits, dem, rim_width=2, block_shape=DEFAULT_BLOCK_SHAPE,
+                         nodata=None):
+    """
+    Fit one plane z = a + b*row + c*col per pit to the undisturbed rim around it
+
+    Used as the pre-mining surface when no pre-mining DEM exists. The rim is
+    the ring of non-pit pixels within rim_width of the pit; the least-squares
+    normal equations are accumulated with bincount per window, then solved
+    for all pits at once.
+
+    Args:
+        labels: Label image on the DEM grid
+        n_pits: Number of labels
+        dem: Post-mining DEM (array or GeoTIFF path)
+        rim_width: Ring width in pixels
+        block_shape: Streaming window shape
+        nodata: DEM nodata values (paths only)
+
+    Returns:
+        (n_pits + 1, 3) coefficient array indexed by pit id; pits whose rim
+        has fewer than 3 valid pixels get NaN
+    """
+    source = _open_source(dem, nodata)
+    height, width = labels.shape
+    # Sums of 1, r, c, rr, rc, cc, z, rz, cz
+    sums = np.zeros((9, n_pits + 1))
+    size = 2 * rim_width + 1
+    try:
+        for window in iter_windows(height, width, block_shape):
+            padded, core = pad_window(window, rim_width, height, width)
+            rows, cols = padded.toslices()
+            lab = ndimage.grey_dilation(labels[rows, cols], size=(size, size))[core]
+            rim = (labels[window.toslices()] == 0) & (lab > 0)
+            z = source.read(window)
+            rim &= ~np.isnan(z)
+            if not rim.any():
+                continue
+
+            rr, cc = np.nonzero(rim)
+            r = rr + int(window.row_off)
+            c = cc + int(window.col_off)
+            zv = z[rr, cc]
+            pit = lab[rr, cc]
+            for i, term in enumerate((np.ones_like(zv), r, c, r * r, r * c, c * c,
+                                      zv, r * zv, c * zv)):
+                sums[i] += np.bincount(pit, weights=term, minlength=n_pits + 1)
+    finally:
+        source.close()
+
+    n, sr, sc, srr, src_, scc, sz, srz, scz = sums
+    normal = np.stack([np.stack([n, sr, sc], -1),
+                       np.stack([sr, srr, src_], -1),
+                       np.stack([sc, src_, scc], -1)], -2)
+    rhs = np.stack([sz, srz, scz], -1)
+    coeffs = np.full((n_pits + 1, 3), np.nan)
+    solvable = (n >= 3) & (np.abs(np.linalg.det(normal)) > 1e-9)
+    if solvable.any():
+        coeffs[solvable] = np.linalg.solve(normal[solvable], rhs[solvable][..., None])[..., 0]
+    return coeffs
+
+
+def pit_volumes(labels, n_pits, transform, crs, post_dem, pre_dem=None, reference_planes=None,
+                block_shape=DEFAULT_BLOCK_SHAPE, nodata=None, pit_bounds=None):
+    """
+    Cut volume, mean and max depth for every pit
+
+    Depth is (pre-mining surface - post-mining DEM), clipped at zero. The
+    pre-mining surface is pre_dem if given, otherwise per-pit reference planes
+    (see fit_reference_planes, fitted automatically when omitted).
+
+    Simpson volumes integrate each pit on its own grid: the pit's bounding box
+    grown by one (zero-depth) pixel, with Simpson coefficients along rows and
+    columns scaled by the ground pixel size of each row.
+
+    Args:
+        labels: int label image on the DEM grid (np.memmap is fine)
+        n_pits: Number of labels
+        transform, crs: Grid georeferencing, used for pixel sizes in metres
+        post_dem: Current DEM (array or GeoTIFF path)
+        pre_dem: Optional pre-mining DEM on the same grid
+        reference_planes: Optional (n_pits + 1, 3) plane coefficients
+        block_shape: Streaming window shape
+        nodata: DEM nodata values (paths only), e.g. (0, 65535)
+        pit_bounds: Optional DataFrame with row_min/row_max/col_min/col_max
+                    per pit (as from pit_statistics); computed when omitted
+
+    Returns:
+        DataFrame with VOLUME_COLUMNS, one row per pit
+    """
+    height, width = labels.shape
+    if pre_dem is None and reference_planes is None:
+        reference_planes = fit_reference_planes(labels, n_pits, post_dem,
+                                                block_shape=block_shape, nodata=nodata)
+
+    if pit_bounds is None:
+        slices = ndimage.find_objects(labels, max_label=n_pits)
+        bounds = np.array([(s[0].start, s[0].stop - 1, s[1].start, s[1].stop - 1)
+                           if s is not None else (0, 0, 0, 0) for s in slices]).reshape(-1, 4)
+    else:
+        bounds = pit_bounds[['row_min', 'row_max', 'col_min', 'col_max']].to_numpy()
+    # Index 0 is background; pad the table so it can be indexed by label
+    bounds = np.vstack([np.zeros((1, 4), dtype=bounds.dtype), bounds]).astype(np.int64)
+    row_min, row_max, col_min, col_max = bounds.T
+    n_rows = row_max - row_min + 3
+    n_cols = col_max - col_min + 3
+
+    dx_all, dy_all = pixel_sizes_m(transform, crs, height)
+
+    count = np.zeros(n_pits + 1)
+    depth_sum = np.zeros(n_pits + 1)
+    prism = np.zeros(n_pits + 1)
+    simpson = np.zeros(n_pits + 1)
+    max_depth = np.zeros(n_pits + 1)
+
+    post = _open_source(post_dem, nodata)
+    pre = _open_source(pre_dem, nodata) if pre_dem is not None else None
+    try:
+        for window in iter_windows(height, width, block_shape):
+            lab = np.asarray(labels[window.toslices()])
+            if not lab.any():
+                continue
+            rr, cc = np.nonzero(lab)
+            pit = lab[rr, cc]
+            r = rr + int(window.row_off)
+            c = cc + int(window.col_off)
+
+            current = post.read(window)[rr, cc]
+            if pre is not None:
+                surface = pre.read(window)[rr, cc]
+            else:
+                a, b, d = reference_planes[pit].T
+                surface = a + b * r + d * c
+
+            depth = surface - current
+            valid = ~np.isnan(depth)
+            pit, r, c, depth = pit[valid], r[valid], c[valid], np.clip(depth[valid], 0.0, None)
+
+            cell = dx_all[r] * dy_all[r]
+            coeff = (simpson_coefficients(r - row_min[pit] + 1, n_rows[pit])
+                     * simpson_coefficients(c - col_min[pit] + 1, n_cols[pit]))
+
+            count += np.bincount(pit, minlength=n_pits + 1)
+            depth_sum += np.bincount(pit, weights=depth, minlength=n_pits + 1)
+            prism += np.bincount(pit, weights=depth * cell, minlength=n_pits + 1)
+            simpson += np.bincount(pit, weights=depth * coeff * cell, minlength=n_pits + 1)
+            np.maximum.at(max_depth, pit, depth)
+    finally:
+        post.close()
+        if pre is not None:
+            pre.close()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_depth = depth_sum / count
+    return pd.DataFrame({
+        'pit_id': np.arange(1, n_pits + 1, dtype=np.int32),
+        'pixel_count': count[1:].astype(np.int64),
+        'volume_simpson_m3': simpson[1:],
+        'volume_prism_m3': prism[1:],
+        'mean_depth_m': mean_depth[1:],
+        'max_depth_m': max_depth[1:],
+    })
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+def _naive_pit_volumes(labels, n_pits, pre_dem, post_dem, dx, dy):
+    """Reference implementation: one Python iteration per pixel"""
+    bounds = {}
+    height, width = labels.shape
+    for i in range(height):
+        for j in range(width):
+            pit = labels[i, j]
+            if pit:
+                r0, r1, c0, c1 = bounds.get(pit, (i, i, j, j))
+                bounds[pit] = (min(r0, i), max(r1, i), min(c0, j), max(c1, j))
+
+    volumes = {pit: [0.0, 0.0] for pit in range(1, n_pits + 1)}
+    for i in range(height):
+        for j in range(width):
+            pit = labels[i, j]
+            if not pit:
+                continue
+            depth = max(pre_dem[i, j] - post_dem[i, j], 0.0)
+            r0, r1, c0, c1 = bounds[pit]
+            coeff = (simpson_coefficients(i - r0 + 1, r1 - r0 + 3)
+                     * simpson_coefficients(j - c0 + 1, c1 - c0 + 3))
+            volumes[pit][0] += depth * dx * dy * float(coeff)
+            volumes[pit][1] += depth * dx * dy
+    return volumes
+
+
+def benchmark(size=400, seed=0):
+    """Time pit_volumes against the per-pixel loop on a synthetic scene"""
+    from affine import Affine
+
+    from .labeling import label_pits
+
+    rng = np.random.default_rng(seed)
+    pre = 700 + ndimage.gaussian_filter(rng.normal(0, 5, (size, size)), 8)
+    pits = ndimage.gaussian_filter(rng.random((size, size)), 6) > 0.52
+    post = pre - pits * ndimage.gaussian_filter(rng.random((size, size)) * 60, 3)
+    labels, n_pits = label_pits(pits)
+    transform = Affine(10.0, 0, 0, 0, -10.0, 0)
+
+    start = time.perf_counter()
+    fast = pit_volumes(labels, n_pits, transform, None, post, pre_dem=pre)
+    fast_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slow = _naive_pit_volumes(labels, n_pits, pre, post, 10.0, 10.0)
+    slow_time = time.perf_counter() - start
+
+    slow_simpson = np.array([slow[pit][0] for pit in range(1, n_pits + 1)])
+    max_err = np.max(np.abs(fast['volume_simpson_m3'].to_numpy() - slow_simpson)
+                     / np.maximum(slow_simpson, 1.0))
+
+    print("=" * 70)
+    print("DEM VOLUME ENGINE BENCHMARK")
+    print("=" * 70)
+    print(f"Grid: {size} x {size}, pits: {n_pits}, mined pixels: {int(pits.sum())}")
+    print(f"Vectorized:       {fast_time * 1000:10.1f} ms")
+    print(f"Per-pixel loop:   {slow_time * 1000:10.1f} ms")
+    print(f"Speed-up:         {slow_time / fast_time:10.1f}x")
+    print(f"Max rel. error:   {max_err:10.2e}")
+    print(f"Total volume:     {fast['volume_simpson_m3'].sum():,.0f} m³ (Simpson), "
+          f"{fast['volume_prism_m3'].sum():,.0f} m³ (prism)")
+    return fast_time, slow_time
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,275 +1,325 @@
 """
 Markdown to PDF Converter for Mining Site Inspection Report
 Uses markdown2 and weasyprint for high-quality PDF generation
+
+Single report:  python main.py
+Batch:          python main.py reports/ "exports/**/*.md" --output-dir pdf --workers 4
+
+Batch conversions run on a pool of long-lived worker processes. Each worker
+imports WeasyPrint and parses the stylesheet once, then converts many files,
+and the run writes a per-file manifest (timing, pages, size, errors).
 """
 
+import argparse
+import csv
+import glob
 import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
 from pathlib import Path
 
+MARKDOWN_EXTRAS = [
+    'tables',           # Enable table support
+    'fenced-code-blocks',  # Code blocks with ```
+    'strike',           # Strikethrough text
+    'task_list',        # Checkbox lists
+    'header-ids',       # Generate IDs for headers
+    'toc',              # Table of contents
+]
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Mining Site Inspection Report</title>
+</head>
+<body>
+    {body}
+</body>
+</html>
+"""
+
+MANIFEST_FIELDS = ['source', 'output', 'status', 'seconds', 'pages', 'size_kb', 'error']
+
+# Custom CSS for professional styling
+DEFAULT_CSS = """
+@page {
+    size: A4;
+    margin: 2cm;
+    @top-right {
+        content: "Page " counter(page) " of " counter(pages);
+        font-size: 9pt;
+        color: #666;
+    }
+}
+
+body {
+    font-family: 'Helvetica', 'Arial', sans-serif;
+    font-size: 11pt;
+    line-height: 1.6;
+    color: #333;
+}
+
+h1 {
+    color: #2c3e50;
+    font-size: 24pt;
+    font-weight: bold;
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 10px;
+    margin-top: 20px;
+    page-break-before: always;
+}
+
+h1:first-of-type {
+    page-break-before: avoid;
+}
+
+h2 {
+    color: #34495e;
+    font-size: 18pt;
+    font-weight: bold;
+    margin-top: 20px;
+    border-bottom: 2px solid #95a5a6;
+    padding-bottom: 5px;
+}
+
+h3 {
+    color: #2c3e50;
+    font-size: 14pt;
+    font-weight: bold;
+    margin-top: 15px;
+}
+
+h4 {
+    color: #555;
+    font-size: 12pt;
+    font-weight: bold;
+    margin-top: 10px;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 15px 0;
+    font-size: 10pt;
+}
+
+th {
+    background-color: #3498db;
+    color: white;
+    padding: 10px;
+    text-align: left;
+    font-weight: bold;
+}
+
+td {
+    padding: 8px;
+    border: 1px solid #ddd;
+}
+
+tr:nth-child(even) {
+    background-color: #f2f2f2;
+}
+
+tr:hover {
+    background-color: #e8f4f8;
+}
+
+img {
+    max-width: 100%;
+    height: auto;
+    display: block;
+    margin: 20px auto;
+    border: 1px solid #ddd;
+    padding: 5px;
+    background: white;
+}
+
+em {
+    display: block;
+    text-align: center;
+    font-size: 9pt;
+    color: #666;
+    margin-top: -15px;
+    margin-bottom: 20px;
+    font-style: italic;
+}
+
+code {
+    background-color: #f4f4f4;
+    padding: 2px 5px;
+    border-radius: 3px;
+    font-family: 'Courier New', monospace;
+    font-size: 9pt;
+}
+
+pre {
+    background-color: #f4f4f4;
+    padding: 15px;
+    border-radius: 5px;
+    overflow-x: auto;
+    font-size: 9pt;
+}
+
+ul, ol {
+    margin: 10px 0;
+    padding-left: 30px;
+}
+
+li {
+    margin: 5px 0;
+}
+
+blockquote {
+    border-left: 4px solid #3498db;
+    padding-left: 15px;
+    margin: 15px 0;
+    color: #555;
+    font-style: italic;
+}
+
+hr {
+    border: none;
+    border-top: 2px solid #3498db;
+    margin: 30px 0;
+}
+
+strong {
+    color: #2c3e50;
+    font-weight: bold;
+}
+
+a {
+    color: #3498db;
+    text-decoration: none;
+}
+
+a:hover {
+    text-decoration: underline;
+}
+
+/* Prevent page breaks inside elements */
+table, figure, img {
+    page-break-inside: avoid;
+}
+
+h1, h2, h3, h4 {
+    page-break-after: avoid;
+}
+
+/* Custom classes for status indicators */
+.status-good { color: #27ae60; font-weight: bold; }
+.status-warning { color: #f39c12; font-weight: bold; }
+.status-critical { color: #e74c3c; font-weight: bold; }
+"""
+
+
+def check_dependencies():
+    """Import markdown2 and WeasyPrint, printing install hints when they are missing"""
+    try:
+        import markdown2  # noqa: F401
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        # WeasyPrint raises OSError when its system libraries (pango) are missing
+        print("ERROR: Required libraries not installed!")
+        print("\nPlease install required packages:")
+        print("  pip install markdown2 weasyprint")
+        print("\nNote: WeasyPrint also requires system dependencies:")
+        print("  macOS: brew install python3 cairo pango gdk-pixbuf libffi")
+        print("  Ubuntu: sudo apt-get install python3-pip python3-cffi python3-brotli libpango-1.0-0 libpangoft2-1.0-0")
+        return False
+    return True
+
+
+def markdown_to_html(md_content):
+    """Render Markdown into the full HTML document the stylesheet expects"""
+    import markdown2
+    return HTML_TEMPLATE.format(body=markdown2.markdown(md_content, extras=MARKDOWN_EXTRAS))
+
+
+@lru_cache(maxsize=8)
+def _parse_stylesheet(css_file, mtime):
+    from weasyprint import CSS
+    if css_file is None:
+        return [CSS(string=DEFAULT_CSS)]
+    with open(css_file, 'r', encoding='utf-8') as f:
+        return [CSS(string=f.read())]
+
+
+def load_stylesheets(css_file=None):
+    """
+    Parsed stylesheets for css_file (or the default styling)
+
+    Parsing is cached per process; a custom file is re-parsed only when its
+    modification time changes.
+    """
+    if css_file and Path(css_file).exists():
+        return _parse_stylesheet(str(css_file), os.path.getmtime(css_file))
+    return _parse_stylesheet(None, None)
+
+
 def convert_md_to_pdf(md_file, output_pdf=None, css_file=None):
     """
     Convert markdown file to PDF with custom styling
-    
+
     Args:
         md_file: Path to markdown file
         output_pdf: Output PDF path (optional, defaults to same name as md)
         css_file: Path to custom CSS file (optional)
     """
-    try:
-        import markdown2
-        from weasyprint import HTML, CSS
-    except ImportError:
-        print("ERROR: Required libraries not installed!")
-        print("\nPlease install required packages:")
-        print("  pip install markdown2 weasyprint")
-        print("\nNote: WeasyPrint also requires system dependencies:")
-        print("  macOS: brew install python3 cairo pango gdk-pixbuf libffi")
-        print("  Ubuntu: sudo apt-get install python3-pip python3-cffi python3-brotli libpango-1.0-0 libpangoft2-1.0-0")
+    if not check_dependencies():
         return False
-    
+    from weasyprint import HTML
+
     # Set up file paths
     md_path = Path(md_file)
     if not md_path.exists():
         print(f"ERROR: Markdown file not found: {md_file}")
         return False
-    
+
     if output_pdf is None:
         output_pdf = md_path.with_suffix('.pdf')
-    
+
     print("=" * 70)
     print("MARKDOWN TO PDF CONVERTER")
     print("=" * 70)
     print(f"Input:  {md_path}")
     print(f"Output: {output_pdf}")
     print()
-    
+
     # Read markdown content
     print("📄 Reading markdown file...")
     with open(md_path, 'r', encoding='utf-8') as f:
         md_content = f.read()
-    
+
     # Convert markdown to HTML
     print("🔄 Converting markdown to HTML...")
-    html_content = markdown2.markdown(
-        md_content,
-        extras=[
-            'tables',           # Enable table support
-            'fenced-code-blocks',  # Code blocks with ```
-            'strike',           # Strikethrough text
-            'task_list',        # Checkbox lists
-            'header-ids',       # Generate IDs for headers
-            'toc',              # Table of contents
-        ]
-    )
-    
-    # Create custom CSS for professional styling
-    default_css = """
-        @page {
-            size: A4;
-            margin: 2cm;
-            @top-right {
-                content: "Page " counter(page) " of " counter(pages);
-                font-size: 9pt;
-                color: #666;
-            }
-        }
-        
-        body {
-            font-family: 'Helvetica', 'Arial', sans-serif;
-            font-size: 11pt;
-            line-height: 1.6;
-            color: #333;
-        }
-        
-        h1 {
-            color: #2c3e50;
-            font-size: 24pt;
-            font-weight: bold;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-            margin-top: 20px;
-            page-break-before: always;
-        }
-        
-        h1:first-of-type {
-            page-break-before: avoid;
-        }
-        
-        h2 {
-            color: #34495e;
-            font-size: 18pt;
-            font-weight: bold;
-            margin-top: 20px;
-            border-bottom: 2px solid #95a5a6;
-            padding-bottom: 5px;
-        }
-        
-        h3 {
-            color: #2c3e50;
-            font-size: 14pt;
-            font-weight: bold;
-            margin-top: 15px;
-        }
-        
-        h4 {
-            color: #555;
-            font-size: 12pt;
-            font-weight: bold;
-            margin-top: 10px;
-        }
-        
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 15px 0;
-            font-size: 10pt;
-        }
-        
-        th {
-            background-color: #3498db;
-            color: white;
-            padding: 10px;
-            text-align: left;
-            font-weight: bold;
-        }
-        
-        td {
-            padding: 8px;
-            border: 1px solid #ddd;
-        }
-        
-        tr:nth-child(even) {
-            background-color: #f2f2f2;
-        }
-        
-        tr:hover {
-            background-color: #e8f4f8;
-        }
-        
-        img {
-            max-width: 100%;
-            height: auto;
-            display: block;
-            margin: 20px auto;
-            border: 1px solid #ddd;
-            padding: 5px;
-            background: white;
-        }
-        
-        em {
-            display: block;
-            text-align: center;
-            font-size: 9pt;
-            color: #666;
-            margin-top: -15px;
-            margin-bottom: 20px;
-            font-style: italic;
-        }
-        
-        code {
-            background-color: #f4f4f4;
-            padding: 2px 5px;
-            border-radius: 3px;
-            font-family: 'Courier New', monospace;
-            font-size: 9pt;
-        }
-        
-        pre {
-            background-color: #f4f4f4;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-            font-size: 9pt;
-        }
-        
-        ul, ol {
-            margin: 10px 0;
-            padding-left: 30px;
-        }
-        
-        li {
-            margin: 5px 0;
-        }
-        
-        blockquote {
-            border-left: 4px solid #3498db;
-            padding-left: 15px;
-            margin: 15px 0;
-            color: #555;
-            font-style: italic;
-        }
-        
-        hr {
-            border: none;
-            border-top: 2px solid #3498db;
-            margin: 30px 0;
-        }
-        
-        strong {
-            color: #2c3e50;
-            font-weight: bold;
-        }
-        
-        a {
-            color: #3498db;
-            text-decoration: none;
-        }
-        
-        a:hover {
-            text-decoration: underline;
-        }
-        
-        /* Prevent page breaks inside elements */
-        table, figure, img {
-            page-break-inside: avoid;
-        }
-        
-        h1, h2, h3, h4 {
-            page-break-after: avoid;
-        }
-        
-        /* Custom classes for status indicators */
-        .status-good { color: #27ae60; font-weight: bold; }
-        .status-warning { color: #f39c12; font-weight: bold; }
-        .status-critical { color: #e74c3c; font-weight: bold; }
-    """
-    
-    # Wrap HTML content
-    html_full = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>Mining Site Inspection Report</title>
-    </head>
-    <body>
-        {html_content}
-    </body>
-    </html>
-    """
-    
+    html_full = markdown_to_html(md_content)
+
     # Convert to PDF
     print("📊 Generating PDF...")
     try:
         # Use custom CSS if provided, otherwise use default
+        stylesheets = load_stylesheets(css_file)
         if css_file and Path(css_file).exists():
-            with open(css_file, 'r', encoding='utf-8') as f:
-                css_content = f.read()
-            stylesheets = [CSS(string=css_content)]
             print(f"   Using custom CSS: {css_file}")
         else:
-            stylesheets = [CSS(string=default_css)]
             print("   Using default styling")
-        
+
         # Generate PDF
         HTML(string=html_full, base_url=str(md_path.parent)).write_pdf(
             output_pdf,
             stylesheets=stylesheets
         )
-        
+
         # Get file size
         file_size = os.path.getsize(output_pdf) / 1024  # KB
-        
+
         print()
         print("=" * 70)
         print("✅ SUCCESS! PDF generated successfully")
@@ -278,34 +328,195 @@ def convert_md_to_pdf(md_file, output_pdf=None, css_file=None):
         print(f"📦 File size: {file_size:.1f} KB")
         print(f"📄 Location: {Path(output_pdf).absolute()}")
         print("=" * 70)
-        
+
         return True
-        
+
     except Exception as e:
         print(f"\n❌ ERROR during PDF generation: {str(e)}")
         return False
 
 
+# ============================================
+# BATCH CONVERSION
+# ============================================
+
+def collect_markdown(inputs):
+    """
+    Expand directories (their *.md files), glob patterns and plain paths
+
+    Returns:
+        Sorted, de-duplicated list of Markdown file paths
+    """
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = [inputs]
+    sources = []
+    for item in map(str, inputs):
+        if os.path.isdir(item):
+            sources.extend(glob.glob(os.path.join(item, '*.md')))
+        elif glob.has_magic(item):
+            sources.extend(glob.glob(item, recursive=True))
+        elif os.path.isfile(item):
+            sources.append(item)
+        else:
+            raise FileNotFoundError(f"Markdown file not found: {item}")
+    return sorted({os.path.abspath(path) for path in sources if os.path.isfile(path)})
+
+
+def conversion_jobs(sources, output_dir=None, css_file=None):
+    """
+    One job per source file
+
+    Without output_dir each PDF lands next to its Markdown file. With it,
+    the sources' layout below their common directory is mirrored, so files
+    with the same name in different folders do not collide.
+    """
+    root = os.path.commonpath([os.path.dirname(path) for path in sources])
+    jobs = []
+    for source in sources:
+        if output_dir is None:
+            output = os.path.splitext(source)[0] + '.pdf'
+        else:
+            relative = os.path.relpath(source, root)
+            output = os.path.join(output_dir, os.path.splitext(relative)[0] + '.pdf')
+        jobs.append({'source': source, 'output': output, 'css_file': css_file})
+    return jobs
+
+
+def _init_worker(css_file=None):
+    """Pool initializer: import WeasyPrint, parse the stylesheet and lay out a page once"""
+    from weasyprint import HTML
+    stylesheets = load_stylesheets(css_file)
+    # The first layout loads fonts; do it here rather than inside the first timed job
+    HTML(string=markdown_to_html('warm-up')).render(stylesheets=stylesheets)
+
+
+def _convert_job(job):
+    """Worker entry point: never raises, returns the file's manifest row"""
+    from weasyprint import HTML
+    start = time.perf_counter()
+    row = {'source': job['source'], 'output': job['output'], 'status': 'ok',
+           'seconds': 0.0, 'pages': 0, 'size_kb': 0.0, 'error': ''}
+    try:
+        with open(job['source'], 'r', encoding='utf-8') as f:
+            html_full = markdown_to_html(f.read())
+        document = HTML(string=html_full, base_url=os.path.dirname(job['source'])).render(
+            stylesheets=load_stylesheets(job['css_file']))
+        os.makedirs(os.path.dirname(os.path.abspath(job['output'])), exist_ok=True)
+        document.write_pdf(job['output'])
+        row['pages'] = len(document.pages)
+        row['size_kb'] = round(os.path.getsize(job['output']) / 1024, 1)
+    except Exception:
+        row['status'] = 'failed'
+        row['error'] = traceback.format_exc(limit=3)
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def write_manifest(rows, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def convert_batch(inputs, output_dir=None, css_file=None, workers=None, manifest_path=None):
+    """
+    Batch API: convert many Markdown reports on a pool of warm workers
+
+    Args:
+        inputs: Directory, glob pattern, file path, or a list of them
+        output_dir: Directory for the PDFs (default: next to each source)
+        css_file: Custom stylesheet (default styling when None)
+        workers: Process count; 1 converts in-process, None uses all cores
+        manifest_path: CSV manifest path (default: conversion_manifest.csv
+            in output_dir, or in the sources' common directory)
+
+    Returns:
+        List of manifest rows (source, output, status, seconds, pages,
+        size_kb, error), one per file, in source order
+    """
+    sources = collect_markdown(inputs)
+    if not sources:
+        raise FileNotFoundError(f"No Markdown files matched {inputs}")
+    if not check_dependencies():
+        raise ImportError("markdown2 and weasyprint are required for PDF conversion")
+
+    jobs = conversion_jobs(sources, output_dir, css_file)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    if workers == 1:
+        _init_worker(css_file)
+        rows = [_convert_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                 initializer=_init_worker, initargs=(css_file,)) as executor:
+            rows = list(executor.map(_convert_job, jobs))
+
+    if manifest_path is None:
+        base = output_dir or os.path.commonpath([os.path.dirname(path) for path in sources])
+        manifest_path = os.path.join(base, 'conversion_manifest.csv')
+    write_manifest(rows, manifest_path)
+    return rows
+
+
+def run_batch(args):
+    """CLI batch mode: convert, then print the manifest summary"""
+    start = time.perf_counter()
+    try:
+        rows = convert_batch(args.inputs, args.output_dir, args.css, args.workers, args.manifest)
+    except (FileNotFoundError, ImportError) as e:
+        print(f"❌ ERROR: {e}")
+        return False
+    elapsed = time.perf_counter() - start
+
+    failed = [row for row in rows if row['status'] != 'ok']
+    print("=" * 70)
+    print(f"✅ {len(rows) - len(failed)} of {len(rows)} PDFs generated in {elapsed:.1f}s")
+    print("=" * 70)
+    for row in rows:
+        print(f"{row['status']:>6}  {row['seconds']:7.2f}s  {row['pages']:3d} pages  "
+              f"{row['size_kb']:8.1f} KB  {os.path.relpath(row['output'])}")
+    for row in failed:
+        print(f"\n❌ {row['source']} failed:\n{row['error']}")
+    return not failed
+
+
 def main():
     """Main function to run the converter"""
-    
+    parser = argparse.ArgumentParser(description='Convert Markdown reports to PDF')
+    parser.add_argument('inputs', nargs='*',
+                        help='Markdown files, directories or glob patterns (batch mode)')
+    parser.add_argument('--output-dir', default=None,
+                        help='Batch output directory (default: next to each source)')
+    parser.add_argument('--css', default=None, help='Custom CSS file')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--manifest', default=None, help='Manifest CSV path')
+    args = parser.parse_args()
+
+    if args.inputs:
+        sys.exit(0 if run_batch(args) else 1)
+
     # Configuration
     markdown_file = "report.md"  # Change this to your markdown file
     output_file = "Mining_Site_Inspection_Report.pdf"   # Change this to desired output name
-    
+
     # Optional: Use custom CSS file
-    custom_css = None  # Set to "custom_style.css" if you have one
-    
+    custom_css = args.css  # e.g. --css custom_style.css
+
     # Check if markdown file exists
     if not os.path.exists(markdown_file):
         print(f"❌ ERROR: Markdown file '{markdown_file}' not found!")
         print(f"   Current directory: {os.getcwd()}")
         print(f"   Please update the 'markdown_file' variable in the script.")
         return
-    
+
     # Convert
     success = convert_md_to_pdf(markdown_file, output_file, custom_css)
-    
+
     if success:
         print("\n💡 TIP: Open the PDF to verify all images are displayed correctly.")
         print("   If images are missing, ensure the relative paths are correct.")
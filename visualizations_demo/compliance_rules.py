@@ -0,0 +1,212 @@
+"""
+Declarative compliance rules for mining entities
+Each rule is a column expression plus the flag metadata it raises. Rules are
+evaluated as boolean masks over the whole entity frame, so flagging a
+million mines is a handful of vectorized comparisons; ComplianceState keeps
+the masks and re-evaluates only the rows and rules touched by an update.
+"""
+
+import ast
+import string
+
+import numpy as np
+import pandas as pd
+
+FLAG_COLUMNS = ['mine_id', 'flag_type', 'severity', 'description',
+                'action_required', 'flagged_date', 'status']
+
+# Thresholds checked by DEFAULT_RULES (also used by the inspection reports)
+FOREST_BUFFER_KM = 1.0
+WATER_BUFFER_KM = 1.0
+SURVEY_INTERVAL_DAYS = 180
+
+
+class ComplianceRule:
+    """
+    One compliance check and the flag it raises
+
+    `condition` is a DataFrame.eval expression over entity columns (e.g.
+    "distance_forest_km < 1.0") or a callable(entities) -> boolean mask; a
+    callable should declare the columns it reads so incremental updates know
+    when to re-run it. `description` is a template whose {fields} are
+    entity columns, filled in with each column's string form.
+    """
+
+    def __init__(self, name, condition, flag_type, severity, description,
+                 action_required, flagged_date, status, columns=None):
+        self.name = name
+        self.condition = condition
+        self.flag_type = flag_type
+        self.severity = severity
+        self.description = description
+        self.action_required = action_required
+        self.flagged_date = flagged_date
+        self.status = status
+        self._template = [(literal, field) for literal, field, _, _
+                          in string.Formatter().parse(description)]
+
+        fields = {field for _, field in self._template if field}
+        if columns is not None:
+            self.columns = frozenset(columns) | fields
+        elif isinstance(condition, str):
+            names = {node.id for node in ast.walk(ast.parse(condition, mode='eval'))
+                     if isinstance(node, ast.Name)}
+            self.columns = frozenset(names) | fields
+        else:
+            self.columns = None  # unknown inputs: re-run on every update
+
+    def __repr__(self):
+        return f"ComplianceRule({self.name!r}, {self.condition!r})"
+
+    def reads(self, columns):
+        """True when the rule depends on any of `columns`"""
+        return self.columns is None or not self.columns.isdisjoint(columns)
+
+    def mask(self, entities):
+        """Boolean array, True where the rule flags the entity"""
+        if callable(self.condition):
+            result = self.condition(entities)
+        else:
+            result = entities.eval(self.condition)
+        return pd.Series(result, index=entities.index).fillna(False).to_numpy(dtype=bool)
+
+    def describe(self, entities):
+        """Description strings for every row of `entities` (already filtered)"""
+        text = pd.Series('', index=entities.index, dtype=object)
+        for literal, field in self._template:
+            if literal:
+                text = text + literal
+            if field:
+                text = text + entities[field].astype(str)
+        return text.to_numpy(dtype=object)
+
+
+DEFAULT_RULES = [
+    ComplianceRule(
+        'lease_violation', "inside_permitted_area == 'No'",
+        'Violation', 'High',
+        'Expansion beyond lease boundary: {expansion_beyond_lease_ha} ha',
+        'Immediate field inspection', '2025-09-20', 'Open'),
+    ComplianceRule(
+        'forest_proximity', f'distance_forest_km < {FOREST_BUFFER_KM}',
+        'Environmental Risk', 'High',
+        'Within {distance_forest_km} km of forest boundary',
+        'Environmental impact assessment required', '2025-09-18', 'Under Review'),
+    ComplianceRule(
+        'water_proximity', f'distance_water_body_km < {WATER_BUFFER_KM}',
+        'Water Contamination Risk', 'Medium',
+        'Only {distance_water_body_km} km from water body',
+        'Water quality monitoring', '2025-09-15', 'Monitoring'),
+    ComplianceRule(
+        'survey_overdue', f'days_since_last_survey > {SURVEY_INTERVAL_DAYS}',
+        'Survey Overdue', 'Low',
+        '{days_since_last_survey} days since last verified survey',
+        'Schedule ground verification', '2025-09-10', 'Scheduled'),
+]
+
+
+def _evaluate(rules, entities):
+    masks = np.zeros((len(rules), len(entities)), dtype=bool)
+    descriptions = np.full((len(rules), len(entities)), None, dtype=object)
+    for r, rule in enumerate(rules):
+        masks[r] = rule.mask(entities)
+        if masks[r].any():
+            descriptions[r, masks[r]] = rule.describe(entities[masks[r]])
+    return masks, descriptions
+
+
+def _flags_table(rules, mine_ids, masks, descriptions):
+    # nonzero over (entity, rule) keeps flags grouped per mine, in rule order
+    entity, rule = np.nonzero(masks.T)
+
+    def meta(attribute):
+        return np.array([getattr(r, attribute) for r in rules], dtype=object)[rule]
+
+    return pd.DataFrame({
+        'mine_id': np.asarray(mine_ids, dtype=object)[entity],
+        'flag_type': meta('flag_type'),
+        'severity': meta('severity'),
+        'description': descriptions[rule, entity],
+        'action_required': meta('action_required'),
+        'flagged_date': meta('flagged_date'),
+        'status': meta('status'),
+    }, columns=FLAG_COLUMNS)
+
+
+def evaluate_rules(entities, rules=None):
+    """
+    Flags table for an entity frame in one pass
+
+    Args:
+        entities: DataFrame shaped like mining_entities.csv
+        rules: ComplianceRule list (default: DEFAULT_RULES)
+
+    Returns:
+        DataFrame with FLAG_COLUMNS, grouped per mine in rule order
+    """
+    rules = DEFAULT_RULES if rules is None else list(rules)
+    entities = entities.reset_index(drop=True)
+    masks, descriptions = _evaluate(rules, entities)
+    return _flags_table(rules, entities['mine_id'], masks, descriptions)
+
+
+class ComplianceState:
+    """
+    Entity table plus its rule masks, for incremental re-evaluation
+
+    update() merges changed or new entities and re-runs only the rules that
+    read a changed column, and only on the changed rows; flags() rebuilds
+    the table from the stored masks without re-evaluating anything.
+    """
+
+    def __init__(self, entities, rules=None):
+        self.rules = DEFAULT_RULES if rules is None else list(rules)
+        self.entities = entities.reset_index(drop=True)
+        self._position = pd.Series(np.arange(len(self.entities)), index=self.entities['mine_id'])
+        self.masks, self.descriptions = _evaluate(self.rules, self.entities)
+        self.last_update = {'rows': len(self.entities), 'rules': len(self.rules)}
+
+    def update(self, changes):
+        """
+        Apply changed column values and/or new mines
+
+        Args:
+            changes: DataFrame with a mine_id column and any subset of entity
+                     columns; unknown mine_ids are appended as new entities
+
+        Returns:
+            self, so calls can be chained with flags()
+        """
+        changes = changes.drop_duplicates('mine_id', keep='last').reset_index(drop=True)
+        columns = [c for c in changes.columns if c != 'mine_id']
+        # get_indexer reuses the index's hash table; -1 marks new mines
+        found = self._position.index.get_indexer(changes['mine_id'])
+        known = found >= 0
+
+        rows = self._position.to_numpy()[found[known]]
+        for column in columns:
+            self.entities.loc[rows, column] = changes.loc[known, column].to_numpy()
+
+        added = changes.loc[~known]
+        if len(added):
+            start = len(self.entities)
+            self.entities = pd.concat([self.entities, added], ignore_index=True)
+            self._position = pd.concat([self._position, pd.Series(
+                np.arange(start, len(self.entities)), index=added['mine_id'])])
+            new_masks, new_descriptions = _evaluate(self.rules, self.entities.iloc[start:])
+            self.masks = np.concatenate([self.masks, new_masks], axis=1)
+            self.descriptions = np.concatenate([self.descriptions, new_descriptions], axis=1)
+
+        affected = [r for r, rule in enumerate(self.rules) if rule.reads(columns)]
+        if len(rows) and affected:
+            subset = self.entities.iloc[rows]
+            masks, descriptions = _evaluate([self.rules[r] for r in affected], subset)
+            self.masks[np.ix_(affected, rows)] = masks
+            self.descriptions[np.ix_(affected, rows)] = descriptions
+
+        self.last_update = {'rows': len(rows) + len(added), 'rules': len(affected)}
+        return self
+
+    def flags(self):
+        """Current flags table (same layout as evaluate_rules)"""
+        return _flags_table(self.rules, self.entities['mine_id'], self.masks, self.descriptions)
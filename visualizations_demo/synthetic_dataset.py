@@ -1,10 +1,28 @@
-import pandas as pd
+"""
+Synthetic mining monitoring dataset
+
+Builds the entity, temporal, elevation-profile, district and compliance
+tables used by the dashboards and reports. Every table is generated with
+NumPy broadcasting over (mines x months) and (mines x profile points)
+arrays from np.random.Generator streams, one stream per chunk of mines, so
+memory stays bounded by the chunk size however many mines are requested.
+
+    python synthetic_dataset.py                     # the 5 demo mines, CSV
+    python synthetic_dataset.py --mines 100000 --months 120 --format parquet --out-dir load_test
+
+Parquet output is partitioned per table and per chunk of mines
+(<out-dir>/<table>/part-00000.parquet, ...); pd.read_parquet(<out-dir>/<table>)
+reads a whole table back.
+"""
+
+import argparse
+import os
+import time
+
 import numpy as np
-from datetime import datetime, timedelta
-import json
+import pandas as pd
 
-# Set random seed for reproducibility
-np.random.seed(42)
+from compliance_rules import evaluate_rules
 
 # ============================================
 # 1. ENTITY MASTER DATA (Statistics Panel)
@@ -55,111 +73,6 @@ entity_data = {
 
 df_entities = pd.DataFrame(entity_data)
 
-# ============================================
-# 2. TEMPORAL MONITORING DATA
-# ============================================
-
-# Generate temporal data for each mine (monthly observations over 3 years)
-temporal_records = []
-start_date = datetime(2022, 10, 1)
-
-for mine_id in df_entities['mine_id']:
-    entity_info = df_entities[df_entities['mine_id'] == mine_id].iloc[0]
-    current_area = entity_info['mining_area_ha']
-    current_depth = entity_info['avg_depth_m']
-    current_volume = entity_info['estimated_volume_m3']
-    
-    # Generate 36 months of data
-    for month_offset in range(36):
-        obs_date = start_date + timedelta(days=30 * month_offset)
-        
-        # Simulate growth patterns
-        growth_factor = month_offset / 36.0
-        area = current_area * (0.6 + 0.4 * growth_factor) + np.random.normal(0, 0.5)
-        depth = current_depth * (0.5 + 0.5 * growth_factor) + np.random.normal(0, 1)
-        volume = current_volume * (0.4 + 0.6 * growth_factor) + np.random.normal(0, 10000)
-        
-        # Activity status (90% active for active mines)
-        is_active = 'Active' if (entity_info['status'] == 'Active' and np.random.random() > 0.1) else 'Inactive'
-        
-        # Vegetation loss and bare soil increase
-        veg_loss_pct = min(100, 20 + growth_factor * 60 + np.random.normal(0, 5))
-        bare_soil_pct = min(100, 15 + growth_factor * 55 + np.random.normal(0, 4))
-        
-        temporal_records.append({
-            'mine_id': mine_id,
-            'observation_date': obs_date.strftime('%Y-%m-%d'),
-            'mining_area_ha': round(max(0, area), 2),
-            'avg_depth_m': round(max(0, depth), 2),
-            'estimated_volume_m3': int(max(0, volume)),
-            'activity_status': is_active,
-            'vegetation_loss_pct': round(veg_loss_pct, 1),
-            'bare_soil_increase_pct': round(bare_soil_pct, 1),
-            'distance_from_lease_boundary_m': round(np.random.uniform(-50, 300), 1)
-        })
-
-df_temporal = pd.DataFrame(temporal_records)
-
-# ============================================
-# 3. ELEVATION PROFILE DATA
-# ============================================
-
-# Generate elevation profiles for cross-sections
-profile_records = []
-
-for mine_id in df_entities['mine_id']:
-    entity_info = df_entities[df_entities['mine_id'] == mine_id].iloc[0]
-    
-    # Create a profile line with 100 points
-    profile_length_m = 500
-    num_points = 100
-    
-    for i in range(num_points):
-        distance = (i / num_points) * profile_length_m
-        
-        # Baseline elevation (original terrain)
-        baseline_elev = entity_info['elevation_max_m'] - (i / num_points) * 20 + np.random.normal(0, 2)
-        
-        # Current elevation (after mining) - create a pit shape
-        if 0.2 < (i / num_points) < 0.8:  # Mining area
-            depth_factor = np.sin((i / num_points - 0.2) / 0.6 * np.pi)
-            current_elev = baseline_elev - entity_info['avg_depth_m'] * depth_factor
-        else:
-            current_elev = baseline_elev
-        
-        # Calculate slope
-        if i > 0:
-            prev_elev = profile_records[-1]['current_elevation_m']
-            slope_deg = np.degrees(np.arctan((current_elev - prev_elev) / (profile_length_m / num_points)))
-        else:
-            slope_deg = 0
-        
-        # Slope stability classification
-        if abs(slope_deg) < 15:
-            stability = 'Safe'
-        elif abs(slope_deg) < 30:
-            stability = 'Moderate'
-        else:
-            stability = 'Critical'
-        
-        # Water accumulation potential
-        water_potential = 'High' if current_elev < (entity_info['elevation_min_m'] + 5) else 'Low'
-        
-        profile_records.append({
-            'mine_id': mine_id,
-            'profile_id': f'{mine_id}_PROFILE_001',
-            'point_number': i,
-            'distance_from_start_m': round(distance, 1),
-            'baseline_elevation_m': round(baseline_elev, 2),
-            'current_elevation_m': round(current_elev, 2),
-            'elevation_difference_m': round(baseline_elev - current_elev, 2),
-            'slope_degree': round(slope_deg, 2),
-            'slope_stability': stability,
-            'water_accumulation_potential': water_potential
-        })
-
-df_profiles = pd.DataFrame(profile_records)
-
 # ============================================
 # 4. COMPARATIVE STATISTICS (District Level)
 # ============================================
@@ -173,104 +86,348 @@ district_stats = {
     'total_violations': [2, 5, 0, 3, 4]
 }
 
-df_district_stats = pd.DataFrame(district_stats)
+# Generated mines are scattered around these district centres
+DISTRICT_CENTRES = {
+    'Kolar': (13.14, 78.30),
+    'Bellary': (15.15, 76.92),
+    'Chitradurga': (14.22, 76.40),
+    'Salem': (11.66, 78.15),
+    'Dharmapuri': (12.14, 78.16),
+}
+STATE_CODES = {'Karnataka': 'KA', 'Tamil Nadu': 'TN'}
+MINERALS = ['Gold', 'Iron Ore', 'Limestone', 'Magnesite', 'Bauxite', 'Granite']
+OPERATORS = ['ABC Mining Ltd', 'Karnataka State Mining Corp', 'XYZ Quarries Pvt Ltd',
+             'Tamil Nadu Minerals Ltd', 'DEF Resources India']
+
+TABLES = ['mining_entities', 'mining_temporal_data', 'mining_elevation_profiles',
+          'compliance_flags']
+
+START_DATE = '2022-10-01'
+REFERENCE_DATE = np.datetime64('2025-09-30')
+PROFILE_LENGTH_M = 500
+
 
 # ============================================
-# 5. COMPLIANCE FLAGS & NOTES
+# TABLE BUILDERS
 # ============================================
 
-compliance_flags = []
+def _choice(rng, values, size, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p)]
 
-for _, entity in df_entities.iterrows():
-    flags = []
-    
-    if entity['inside_permitted_area'] == 'No':
-        flags.append({
-            'mine_id': entity['mine_id'],
-            'flag_type': 'Violation',
-            'severity': 'High',
-            'description': f"Expansion beyond lease boundary: {entity['expansion_beyond_lease_ha']} ha",
-            'action_required': 'Immediate field inspection',
-            'flagged_date': '2025-09-20',
-            'status': 'Open'
-        })
-    
-    if entity['distance_forest_km'] < 1.0:
-        flags.append({
-            'mine_id': entity['mine_id'],
-            'flag_type': 'Environmental Risk',
-            'severity': 'High',
-            'description': f"Within {entity['distance_forest_km']} km of forest boundary",
-            'action_required': 'Environmental impact assessment required',
-            'flagged_date': '2025-09-18',
-            'status': 'Under Review'
-        })
-    
-    if entity['distance_water_body_km'] < 1.0:
-        flags.append({
-            'mine_id': entity['mine_id'],
-            'flag_type': 'Water Contamination Risk',
-            'severity': 'Medium',
-            'description': f"Only {entity['distance_water_body_km']} km from water body",
-            'action_required': 'Water quality monitoring',
-            'flagged_date': '2025-09-15',
-            'status': 'Monitoring'
-        })
-    
-    if entity['days_since_last_survey'] > 180:
-        flags.append({
-            'mine_id': entity['mine_id'],
-            'flag_type': 'Survey Overdue',
-            'severity': 'Low',
-            'description': f"{entity['days_since_last_survey']} days since last verified survey",
-            'action_required': 'Schedule ground verification',
-            'flagged_date': '2025-09-10',
-            'status': 'Scheduled'
-        })
-    
-    compliance_flags.extend(flags)
 
-df_compliance_flags = pd.DataFrame(compliance_flags)
+def _dates(reference, days_before):
+    return np.datetime_as_string(reference - days_before.astype('timedelta64[D]'), unit='D')
+
+
+def synthetic_entities(first, count, rng):
+    """
+    Entity master rows for mines first .. first + count - 1
+
+    Mines are assigned to the five demo districts; sizes, depths and
+    distances are drawn so the derived columns stay consistent (volume
+    follows area x depth, permitted-area breaches drive the compliance
+    columns).
+    """
+    districts = pd.DataFrame(district_stats)
+    d = rng.integers(0, len(districts), count)
+    district = districts['district'].to_numpy()[d]
+    state = districts['state'].to_numpy()[d]
+    centres = np.array([DISTRICT_CENTRES[name] for name in districts['district']])[d]
+    number = pd.Series(np.arange(first + 1, first + count + 1)).astype(str).str.zfill(6)
+
+    area = np.round(rng.lognormal(np.log(60), 0.6, count), 1)
+    permitted = np.round(area * rng.uniform(0.9, 1.4, count), 1)
+    expansion = np.round(np.maximum(area - permitted, 0), 1)
+    avg_depth = np.round(rng.uniform(12, 50, count), 1)
+    elevation_min = rng.integers(300, 750, count)
+    survey_days = rng.integers(20, 300, count)
+    detection_days = rng.integers(0, 300, count)
+
+    return pd.DataFrame({
+        'mine_id': ('MN-' + pd.Series(state).map(STATE_CODES) + '-2023-' + number).to_numpy(),
+        'mine_name': (pd.Series(district) + ' ' + pd.Series(_choice(rng, MINERALS, count))
+                      + ' Mine ' + number).to_numpy(),
+        'latitude': np.round(centres[:, 0] + rng.normal(0, 0.15, count), 4),
+        'longitude': np.round(centres[:, 1] + rng.normal(0, 0.15, count), 4),
+        'district': district,
+        'state': state,
+        'country': 'India',
+        'ownership': _choice(rng, ['Private', 'Public'], count),
+        'operator': _choice(rng, OPERATORS, count),
+        'status': _choice(rng, ['Active', 'Inactive', 'Under Observation'], count, p=[0.6, 0.2, 0.2]),
+        'last_detection_date': _dates(REFERENCE_DATE, detection_days),
+
+        # Spatial Characteristics
+        'mining_area_ha': area,
+        'perimeter_length_m': np.round(4 * np.sqrt(area * 1e4) * rng.uniform(1.0, 1.3, count), -2).astype(int),
+        'elevation_min_m': elevation_min,
+        'elevation_max_m': elevation_min + rng.integers(40, 80, count),
+        'avg_depth_m': avg_depth,
+        'max_depth_m': np.round(avg_depth * rng.uniform(1.3, 1.6, count), 1),
+        'estimated_volume_m3': (area * 1e4 * avg_depth * rng.uniform(0.08, 0.12, count)).astype(np.int64),
+
+        # Compliance Indicators
+        'distance_water_body_km': np.round(rng.uniform(0.2, 5.0, count), 1),
+        'distance_forest_km': np.round(rng.uniform(0.1, 5.0, count), 1),
+        'distance_habitation_km': np.round(rng.uniform(0.5, 6.0, count), 1),
+        'inside_permitted_area': np.where(expansion > 0, 'No', 'Yes'),
+        'expansion_beyond_lease_ha': expansion,
+        'permitted_area_ha': permitted,
+        'detection_confidence': _choice(rng, ['High', 'Medium', 'Low'], count, p=[0.6, 0.3, 0.1]),
+        'days_since_last_survey': survey_days,
+
+        # Metadata
+        'imagery_source': _choice(rng, ['Sentinel-2', 'Landsat-8'], count, p=[0.8, 0.2]),
+        'imagery_date': _dates(REFERENCE_DATE, detection_days + rng.integers(0, 10, count)),
+        'dem_source': _choice(rng, ['Copernicus 30m', 'SRTM 30m'], count, p=[0.8, 0.2]),
+        'dem_resolution_m': 30,
+        'processing_date': _dates(REFERENCE_DATE, detection_days),
+        'model_version': _choice(rng, ['v2.3.1', 'v2.3.0', 'v2.1.0'], count, p=[0.7, 0.2, 0.1]),
+    })
+
+
+def temporal_table(entities, months, rng, start_date=START_DATE):
+    """
+    Monthly observations, one row per (mine, month), in mine-major order
+
+    Each mine grows linearly towards its current area / depth / volume over
+    the window, with noise; vegetation loss and bare soil follow the same
+    growth factor.
+    """
+    n = len(entities)
+    growth = np.arange(months) / months
+    shape = (n, months)
+
+    def trend(column, base):
+        return entities[column].to_numpy(dtype=float)[:, None] * (base + (1 - base) * growth)
+
+    area = trend('mining_area_ha', 0.6) + rng.normal(0, 0.5, shape)
+    depth = trend('avg_depth_m', 0.5) + rng.normal(0, 1, shape)
+    volume = trend('estimated_volume_m3', 0.4) + rng.normal(0, 10000, shape)
+
+    # Activity status (90% active for active mines)
+    active = (entities['status'].to_numpy() == 'Active')[:, None] & (rng.random(shape) > 0.1)
+
+    # Vegetation loss and bare soil increase
+    veg_loss = np.minimum(100, 20 + growth * 60 + rng.normal(0, 5, shape))
+    bare_soil = np.minimum(100, 15 + growth * 55 + rng.normal(0, 4, shape))
+
+    dates = np.datetime64(start_date) + 30 * np.arange(months).astype('timedelta64[D]')
+    return pd.DataFrame({
+        'mine_id': np.repeat(entities['mine_id'].to_numpy(), months),
+        'observation_date': np.tile(dates, n),
+        'mining_area_ha': np.round(np.maximum(0, area), 2).ravel(),
+        'avg_depth_m': np.round(np.maximum(0, depth), 2).ravel(),
+        'estimated_volume_m3': np.maximum(0, volume).astype(np.int64).ravel(),
+        'activity_status': np.where(active, 'Active', 'Inactive').ravel(),
+        'vegetation_loss_pct': np.round(veg_loss, 1).ravel(),
+        'bare_soil_increase_pct': np.round(bare_soil, 1).ravel(),
+        'distance_from_lease_boundary_m': np.round(rng.uniform(-50, 300, shape), 1).ravel(),
+    })
+
+
+def profile_table(entities, points, rng, profile_length_m=PROFILE_LENGTH_M):
+    """
+    One cross-section per mine: points samples with a pit between 20% and 80%
+
+    Slope is taken between consecutive current-elevation samples and
+    classified Safe (<15°), Moderate (<30°) or Critical.
+    """
+    n = len(entities)
+    fraction = np.arange(points) / points
+    spacing = profile_length_m / points
+
+    # Baseline elevation (original terrain)
+    baseline = (entities['elevation_max_m'].to_numpy(dtype=float)[:, None]
+                - fraction * 20 + rng.normal(0, 2, (n, points)))
+
+    # Current elevation (after mining) - a sine-shaped pit in the middle
+    in_pit = (fraction > 0.2) & (fraction < 0.8)
+    depth_factor = np.where(in_pit, np.sin((fraction - 0.2) / 0.6 * np.pi), 0.0)
+    current = baseline - entities['avg_depth_m'].to_numpy(dtype=float)[:, None] * depth_factor
+
+    slope = np.zeros((n, points))
+    slope[:, 1:] = np.degrees(np.arctan(np.diff(current, axis=1) / spacing))
+    stability = np.select([np.abs(slope) < 15, np.abs(slope) < 30],
+                          ['Safe', 'Moderate'], 'Critical')
+
+    # Water accumulation potential
+    low_ground = current < (entities['elevation_min_m'].to_numpy(dtype=float)[:, None] + 5)
+
+    mine_ids = np.repeat(entities['mine_id'].to_numpy(), points)
+    return pd.DataFrame({
+        'mine_id': mine_ids,
+        'profile_id': mine_ids + '_PROFILE_001',
+        'point_number': np.tile(np.arange(points), n),
+        'distance_from_start_m': np.tile(np.round(fraction * profile_length_m, 1), n),
+        'baseline_elevation_m': np.round(baseline, 2).ravel(),
+        'current_elevation_m': np.round(current, 2).ravel(),
+        'elevation_difference_m': np.round(baseline - current, 2).ravel(),
+        'slope_degree': np.round(slope, 2).ravel(),
+        'slope_stability': stability.ravel(),
+        'water_accumulation_potential': np.where(low_ground, 'High', 'Low').ravel(),
+    })
+
+
+def compliance_flags_table(entities, rules=None):
+    """Flags raised by the compliance rule engine (DEFAULT_RULES unless given)"""
+    return evaluate_rules(entities, rules)
+
+
+def district_table(district_totals=None):
+    """
+    District statistics; with totals from generated mines, counts, mean area
+    and violations are recomputed from them
+    """
+    df = pd.DataFrame(district_stats)
+    if district_totals is None:
+        return df
+    totals = district_totals.reindex(df['district']).fillna(0)
+    df['total_mines'] = totals['mines'].astype(int).to_numpy()
+    df['avg_mining_area_ha'] = np.round(
+        totals['area'].to_numpy() / np.maximum(totals['mines'].to_numpy(), 1), 1)
+    df['total_violations'] = totals['violations'].astype(int).to_numpy()
+    return df
+
 
 # ============================================
-# SAVE ALL DATASETS
+# WRITERS
 # ============================================
 
-print("=" * 60)
-print("MINING SITE MONITORING DUMMY DATASET")
-print("=" * 60)
-print(f"\n1. Entity Master Data: {len(df_entities)} mines")
-print(df_entities[['mine_id', 'mine_name', 'status', 'mining_area_ha', 'inside_permitted_area']].to_string(index=False))
-
-print(f"\n2. Temporal Monitoring Data: {len(df_temporal)} observations")
-print(df_temporal.head(10).to_string(index=False))
-
-print(f"\n3. Elevation Profile Data: {len(df_profiles)} profile points")
-print(df_profiles.head(10).to_string(index=False))
-
-print(f"\n4. District Statistics: {len(df_district_stats)} districts")
-print(df_district_stats.to_string(index=False))
-
-print(f"\n5. Compliance Flags: {len(df_compliance_flags)} flags")
-print(df_compliance_flags.to_string(index=False))
-
-# Export to CSV
-df_entities.to_csv('mining_entities.csv', index=False)
-df_temporal.to_csv('mining_temporal_data.csv', index=False)
-df_profiles.to_csv('mining_elevation_profiles.csv', index=False)
-df_district_stats.to_csv('district_statistics.csv', index=False)
-df_compliance_flags.to_csv('compliance_flags.csv', index=False)
-
-print("\n" + "=" * 60)
-print("All datasets exported to CSV files!")
-print("=" * 60)
-
-# Generate summary statistics
-print("\n\nSUMMARY STATISTICS")
-print("-" * 60)
-print(f"Total Mining Area Monitored: {df_entities['mining_area_ha'].sum():.1f} ha")
-print(f"Total Excavated Volume: {df_entities['estimated_volume_m3'].sum():,} m³")
-print(f"Active Mines: {len(df_entities[df_entities['status'] == 'Active'])}")
-print(f"Mines with Violations: {len(df_entities[df_entities['inside_permitted_area'] == 'No'])}")
-print(f"High Priority Flags: {len(df_compliance_flags[df_compliance_flags['severity'] == 'High'])}")
-print(f"Average Expansion Rate: {df_district_stats['avg_expansion_rate_pct_year'].mean():.1f}% per year")
\ No newline at end of file
+def write_table(df, out_dir, name, part, fmt):
+    """
+    Append one chunk of a table
+
+    csv: a single <name>.csv (header written with part 0).
+    parquet: <name>/part-NNNNN.parquet, one file per chunk of mines.
+    """
+    if fmt == 'csv':
+        path = os.path.join(out_dir, f'{name}.csv')
+        df.to_csv(path, mode='w' if part == 0 else 'a', header=part == 0, index=False)
+    elif fmt == 'parquet':
+        os.makedirs(os.path.join(out_dir, name), exist_ok=True)
+        path = os.path.join(out_dir, name, f'part-{part:05d}.parquet')
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected 'csv' or 'parquet'")
+    return path
+
+
+def generate_dataset(out_dir='.', mines=None, months=36, profile_points=100,
+                     fmt='csv', chunk_size=5000, seed=42, start_date=START_DATE):
+    """
+    Generate and write all tables chunk by chunk
+
+    Args:
+        out_dir: Output directory
+        mines: Number of generated mines; None writes the 5 demo mines
+        months: Monthly observations per mine
+        profile_points: Samples per elevation profile
+        fmt: 'csv' or 'parquet'
+        chunk_size: Mines per chunk (bounds peak memory)
+        seed: Root seed; chunk k draws from the k-th spawned stream, so a
+            run is reproducible for a given seed and chunk_size
+
+    Returns:
+        Dict of table name -> rows written, plus summary totals
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if mines is None:
+        total, chunk_size = len(entity_data['mine_id']), len(entity_data['mine_id'])
+    else:
+        total = mines
+    n_chunks = max(1, -(-total // chunk_size))
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    counts = dict.fromkeys(TABLES, 0)
+    summary = {'mining_area_ha': 0.0, 'estimated_volume_m3': 0, 'active_mines': 0,
+               'violations': 0, 'high_priority_flags': 0}
+    district_totals = []
+
+    for part, stream in enumerate(streams):
+        rng = np.random.default_rng(stream)
+        first = part * chunk_size
+        count = min(chunk_size, total - first)
+        if mines is None:
+            entities = pd.DataFrame(entity_data)
+        else:
+            entities = synthetic_entities(first, count, rng)
+
+        tables = {
+            'mining_entities': entities,
+            'mining_temporal_data': temporal_table(entities, months, rng, start_date),
+            'mining_elevation_profiles': profile_table(entities, profile_points, rng),
+            'compliance_flags': compliance_flags_table(entities),
+        }
+        for name, df in tables.items():
+            write_table(df, out_dir, name, part, fmt)
+            counts[name] += len(df)
+
+        violation = entities['inside_permitted_area'] == 'No'
+        summary['mining_area_ha'] += entities['mining_area_ha'].sum()
+        summary['estimated_volume_m3'] += int(entities['estimated_volume_m3'].sum())
+        summary['active_mines'] += int((entities['status'] == 'Active').sum())
+        summary['violations'] += int(violation.sum())
+        summary['high_priority_flags'] += int((tables['compliance_flags']['severity'] == 'High').sum())
+        district_totals.append(pd.DataFrame({
+            'district': entities['district'],
+            'mines': 1,
+            'area': entities['mining_area_ha'],
+            'violations': violation.astype(int),
+        }).groupby('district').sum())
+
+    if mines is None:
+        districts = district_table()
+    else:
+        districts = district_table(pd.concat(district_totals).groupby(level=0).sum())
+    write_table(districts, out_dir, 'district_statistics', 0, fmt)
+    counts['district_statistics'] = len(districts)
+    counts['summary'] = summary
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the synthetic mining monitoring dataset')
+    parser.add_argument('--mines', type=int, default=None,
+                        help='Number of generated mines (default: the 5 demo mines)')
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--profile-points', type=int, default=100)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--out-dir', default='.')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("MINING SITE MONITORING DUMMY DATASET")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    counts = generate_dataset(args.out_dir, args.mines, args.months, args.profile_points,
+                              args.format, args.chunk_size, args.seed)
+    elapsed = time.perf_counter() - start
+    summary = counts.pop('summary')
+
+    print(f"\n1. Entity Master Data: {counts['mining_entities']:,} mines")
+    print(f"2. Temporal Monitoring Data: {counts['mining_temporal_data']:,} observations")
+    print(f"3. Elevation Profile Data: {counts['mining_elevation_profiles']:,} profile points")
+    print(f"4. District Statistics: {counts['district_statistics']} districts")
+    print(f"5. Compliance Flags: {counts['compliance_flags']:,} flags")
+
+    print("\n" + "=" * 60)
+    print(f"All datasets exported as {args.format.upper()} to "
+          f"{os.path.abspath(args.out_dir)} in {elapsed:.1f}s")
+    print("=" * 60)
+
+    # Generate summary statistics
+    print("\n\nSUMMARY STATISTICS")
+    print("-" * 60)
+    print(f"Total Mining Area Monitored: {summary['mining_area_ha']:,.1f} ha")
+    print(f"Total Excavated Volume: {summary['estimated_volume_m3']:,} m³")
+    print(f"Active Mines: {summary['active_mines']:,}")
+    print(f"Mines with Violations: {summary['violations']:,}")
+    print(f"High Priority Flags: {summary['high_priority_flags']:,}")
+
+
+if __name__ == '__main__':
+    main()